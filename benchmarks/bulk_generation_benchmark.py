@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Bulk Generation Benchmark
+Times the vectorized generators in utils.scan_bulk against building the same number
+of findings one at a time with the per-finding generators of utils.scan_results,
+plus JSON serialization of the bulk results, at load test scales
+
+Run with: python benchmarks/bulk_generation_benchmark.py --scales 100000 1000000
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List
+
+file_root = os.path.dirname(os.path.abspath(__file__))
+path_list = [
+    file_root,
+    os.path.dirname(file_root)
+]
+for path in path_list:
+    if path not in sys.path:
+        sys.path.append(path)
+
+from utils import json_utils
+from utils.scan_bulk import BULK_GENERATORS, bulk_results_cache, get_bulk_scan_results
+from utils.scan_results import (generate_fortify_vulnerability, generate_nexus_component, generate_sonar_issue,
+                                scan_base_date)
+
+RESULTS_DIR = os.path.join(file_root, 'results')
+
+# Per-finding generators, timed on at most this many findings and extrapolated
+SCALAR_SAMPLE = 100000
+
+SCALAR_GENERATORS: Dict[str, Callable] = {
+    "sonar": generate_sonar_issue,
+    "fortify": generate_fortify_vulnerability,
+    "nexus": generate_nexus_component,
+}
+
+
+def _timed(func: Callable[[], Any]):
+    start = time.perf_counter()
+    value = func()
+    return value, time.perf_counter() - start
+
+
+def scalar_seconds(tool: str, scale: int) -> float:
+    """Seconds to build scale findings one random.choice at a time (extrapolated past SCALAR_SAMPLE)"""
+    sample = min(scale, SCALAR_SAMPLE)
+    rng = random.Random(0)
+    base_date = scan_base_date()
+    generator = SCALAR_GENERATORS[tool]
+    _, seconds = _timed(lambda: [generator(rng, base_date) for _ in range(sample)])
+    return seconds * scale / sample
+
+
+def run_benchmark(scale: int) -> Dict[str, Any]:
+    """
+    Time bulk generation, serialization and the per-finding baseline of every tool at one scale.
+
+    Returns:
+        dict: Seconds and body sizes per tool
+    """
+    tools = {}
+    for tool in BULK_GENERATORS:
+        print(f"  {tool}...", flush=True)
+        bulk_results_cache.clear()
+        results, generate = _timed(lambda: get_bulk_scan_results(tool, "benchmark", None, scale))
+        body, serialize = _timed(lambda: json_utils.dumps(results))
+        tools[tool] = {
+            'bulk_generate_seconds': round(generate, 4),
+            'scalar_generate_seconds': round(scalar_seconds(tool, scale), 4),
+            'serialize_seconds': round(serialize, 4),
+            'body_bytes': len(body),
+        }
+        del results, body
+    bulk_results_cache.clear()
+    return {'scale': scale, 'tools': tools}
+
+
+def format_report(results: List[Dict[str, Any]]) -> List[str]:
+    lines = [f"{'scale':>9} {'tool':<8} {'bulk s':>8} {'per-finding s':>14} {'speedup':>8} "
+             f"{'serialize s':>12} {'body MiB':>9}"]
+    for result in results:
+        for tool, stage in result['tools'].items():
+            speedup = stage['scalar_generate_seconds'] / stage['bulk_generate_seconds']
+            lines.append(f"{result['scale']:>9} {tool:<8} {stage['bulk_generate_seconds']:>8.2f} "
+                         f"{stage['scalar_generate_seconds']:>14.2f} {speedup:>7.1f}x "
+                         f"{stage['serialize_seconds']:>12.2f} {stage['body_bytes'] / 2 ** 20:>9.1f}")
+    lines.append(f"Per-finding times beyond {SCALAR_SAMPLE} findings are extrapolated")
+    return lines
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark vectorized bulk scan result generation")
+    parser.add_argument("--scales", type=int, nargs="+", default=[100000, 1000000],
+                        help="Findings (Sonar, Fortify) or components (Nexus) per tool")
+    parser.add_argument("--output", help="Result file (default: benchmarks/results/bulk_generation-<timestamp>.json)")
+    args = parser.parse_args()
+
+    results = []
+    for scale in args.scales:
+        print(f"Benchmarking scale {scale}...", flush=True)
+        results.append(run_benchmark(scale))
+
+    document = {
+        'benchmark': 'bulk_generation',
+        'created': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results,
+    }
+    output = args.output or os.path.join(RESULTS_DIR,
+                                         f"bulk_generation-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(document, f, indent=2)
+    print("\n".join(format_report(results)))
+    print(f"Results written to {output}")
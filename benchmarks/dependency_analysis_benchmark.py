@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Dependency Analysis Benchmark
+Times utils.dependency_analysis on a generated vulnerability database and a
+generated monorepo: importing OSV records, matching every dependency with the
+indexed join, the same lookups as per-dependency table scans (the database without
+its range index, timed on a sample and extrapolated), and the full offline analysis
+
+Run with: python benchmarks/dependency_analysis_benchmark.py --dependencies 5000 --vulnerabilities 100000
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Any, Dict, List
+
+file_root = os.path.dirname(os.path.abspath(__file__))
+path_list = [
+    file_root,
+    os.path.dirname(file_root)
+]
+for path in path_list:
+    if path not in sys.path:
+        sys.path.append(path)
+
+from utils.dependency_analysis import (VulnerabilityDatabase, analyze_dependencies, collect_dependencies,
+                                       find_manifests, normalize_package_name, version_key)
+
+RESULTS_DIR = os.path.join(file_root, 'results')
+
+# Packages per ecosystem in the generated database; dependencies are drawn from them
+PACKAGES_PER_ECOSYSTEM = 20000
+ECOSYSTEMS = {"PyPI": "pypi", "npm": "npm", "Maven": "maven"}
+
+# Dependencies per generated manifest file
+DEPENDENCIES_PER_MANIFEST = 100
+
+
+def _package(ecosystem: str, index: int) -> str:
+    if ecosystem == "Maven":
+        return f"org.example.group{index % 50}:artifact-{index}"
+    return f"package-{index}"
+
+
+def _version(rng: random.Random) -> str:
+    return f"{rng.randint(0, 5)}.{rng.randint(0, 20)}.{rng.randint(0, 10)}"
+
+
+def osv_records(count: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """OSV records, each affecting one to three version ranges of one package."""
+    rng = random.Random(seed)
+    records = []
+    for index in range(count):
+        ecosystem = rng.choice(list(ECOSYSTEMS))
+        events = []
+        for _ in range(rng.randint(1, 3)):
+            major, minor = rng.randint(0, 5), rng.randint(0, 20)
+            events += [{"introduced": f"{major}.{minor}.0"}, {"fixed": f"{major}.{minor + rng.randint(1, 8)}.0"}]
+        records.append({
+            "id": f"GHSA-{index:08d}",
+            "aliases": [f"CVE-{rng.randint(2015, 2024)}-{index:06d}"],
+            "summary": "Generated vulnerability",
+            "severity": [{"type": "CVSS_V3",
+                          "score": f"CVSS:3.1/AV:N/AC:{rng.choice('LH')}/PR:N/UI:N/S:U/C:H/I:{rng.choice('HLN')}/A:N"}],
+            "affected": [{"package": {"ecosystem": ecosystem,
+                                      "name": _package(ecosystem, rng.randrange(PACKAGES_PER_ECOSYSTEM))},
+                          "ranges": [{"type": "ECOSYSTEM", "events": events}]}],
+        })
+    return records
+
+
+def build_monorepo(path: str, dependencies: int, seed: int = 1):
+    """Write requirements.txt, package-lock.json and pom.xml manifests across service directories."""
+    rng = random.Random(seed)
+    for manifest in range(max(1, dependencies // DEPENDENCIES_PER_MANIFEST)):
+        directory = os.path.join(path, f"service-{manifest}")
+        os.makedirs(directory, exist_ok=True)
+        ecosystem = list(ECOSYSTEMS)[manifest % len(ECOSYSTEMS)]
+        packages = [(_package(ecosystem, rng.randrange(PACKAGES_PER_ECOSYSTEM)), _version(rng))
+                    for _ in range(DEPENDENCIES_PER_MANIFEST)]
+        if ecosystem == "PyPI":
+            with open(os.path.join(directory, "requirements.txt"), "w") as f:
+                f.write("".join(f"{name}=={version}\n" for name, version in packages))
+        elif ecosystem == "npm":
+            lock = {"lockfileVersion": 3, "packages": {
+                "": {"dependencies": {name: f"^{version}" for name, version in packages[:20]}},
+                **{f"node_modules/{name}": {"version": version, "license": "MIT"} for name, version in packages}}}
+            with open(os.path.join(directory, "package-lock.json"), "w") as f:
+                json.dump(lock, f)
+        else:
+            entries = "".join(f"<dependency><groupId>{name.split(':')[0]}</groupId>"
+                              f"<artifactId>{name.split(':')[1]}</artifactId><version>{version}</version></dependency>"
+                              for name, version in packages)
+            with open(os.path.join(directory, "pom.xml"), "w") as f:
+                f.write(f'<project xmlns="http://maven.apache.org/POM/4.0.0"><dependencies>{entries}'
+                        f'</dependencies></project>')
+
+
+def table_scan_lookup(connection: sqlite3.Connection, dependency) -> int:
+    """One dependency looked up without the range index: a scan of every affected range"""
+    key = version_key(dependency.version)
+    return connection.execute(
+        "SELECT COUNT(DISTINCT vuln_id) FROM affected NOT INDEXED WHERE ecosystem = ? AND package = ? "
+        "AND introduced <= ? AND (fixed IS NULL OR ? < fixed) AND (last_affected IS NULL OR ? <= last_affected)",
+        (dependency.type, normalize_package_name(dependency.type, dependency.name), key, key, key)).fetchone()[0]
+
+
+def run_benchmark(dependencies: int, vulnerabilities: int, sample: int) -> Dict[str, Any]:
+    """
+    Build the database and monorepo, then time each stage.
+
+    Returns:
+        dict: Seconds per stage, row counts and match counts
+    """
+    scratch = tempfile.mkdtemp(prefix="dependency-analysis-bench-")
+    try:
+        records = osv_records(vulnerabilities)
+        database = VulnerabilityDatabase(os.path.join(scratch, "vulnerabilities.sqlite3"))
+        start = time.perf_counter()
+        database.import_osv(records)
+        import_seconds = time.perf_counter() - start
+        ranges = database.connection.execute("SELECT COUNT(*) FROM affected").fetchone()[0]
+
+        repo_path = os.path.join(scratch, "monorepo")
+        build_monorepo(repo_path, dependencies)
+        found, _ = collect_dependencies(repo_path, find_manifests(repo_path))
+
+        start = time.perf_counter()
+        matches = database.match(found)
+        indexed_seconds = time.perf_counter() - start
+
+        rng = random.Random(2)
+        sampled = rng.sample(found, min(sample, len(found)))
+        start = time.perf_counter()
+        for dependency in sampled:
+            table_scan_lookup(database.connection, dependency)
+        scan_seconds = (time.perf_counter() - start) / len(sampled) * len(found)
+
+        start = time.perf_counter()
+        results = analyze_dependencies(repo_path, database=database)
+        analysis_seconds = time.perf_counter() - start
+
+        return {
+            'dependencies': len(found),
+            'vulnerabilities': vulnerabilities,
+            'affected_ranges': ranges,
+            'vulnerable_dependencies': len(matches),
+            'total_vulnerabilities': results['summary']['total_vulnerabilities'],
+            'table_scan_sample': len(sampled),
+            'stages': {
+                'import_seconds': round(import_seconds, 4),
+                'match_indexed_seconds': round(indexed_seconds, 4),
+                'match_table_scan_seconds_estimated': round(scan_seconds, 4),
+                'analysis_seconds': round(analysis_seconds, 4),
+            },
+        }
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+
+def format_report(result: Dict[str, Any]) -> List[str]:
+    stages = result['stages']
+    return [
+        f"{result['dependencies']} dependencies against {result['vulnerabilities']} vulnerabilities "
+        f"({result['affected_ranges']} affected ranges)",
+        f"  import: {stages['import_seconds']:.3f}s",
+        f"  match: indexed join {stages['match_indexed_seconds']:.3f}s, "
+        f"table scans ~{stages['match_table_scan_seconds_estimated']:.1f}s "
+        f"(from {result['table_scan_sample']} sampled lookups)",
+        f"  full analysis: {stages['analysis_seconds']:.3f}s "
+        f"({result['vulnerable_dependencies']} vulnerable dependencies, "
+        f"{result['total_vulnerabilities']} vulnerabilities)",
+    ]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark offline dependency vulnerability matching")
+    parser.add_argument("--dependencies", type=int, default=5000, help="Dependencies in the generated monorepo")
+    parser.add_argument("--vulnerabilities", type=int, default=100000, help="Vulnerabilities in the database")
+    parser.add_argument("--sample", type=int, default=50, help="Dependencies timed with table scans")
+    parser.add_argument("--output", help="Result file (default: benchmarks/results/dependency_analysis-<timestamp>.json)")
+    args = parser.parse_args()
+
+    print(f"Benchmarking {args.dependencies} dependencies...", flush=True)
+    result = run_benchmark(args.dependencies, args.vulnerabilities, args.sample)
+    document = {
+        'benchmark': 'dependency_analysis',
+        'created': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'sqlite': sqlite3.sqlite_version,
+        'result': result,
+    }
+    output = args.output or os.path.join(RESULTS_DIR,
+                                         f"dependency_analysis-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(document, f, indent=2)
+    print("\n".join(format_report(result)))
+    print(f"Results written to {output}")
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+GitUtils Benchmark Suite
+Times and memory-profiles every public GitUtils method against synthetic
+repositories and stores the results as JSON for offline comparison between runs
+
+Run with: python benchmarks/git_utils_benchmark.py --preset small medium
+Compare:  python benchmarks/git_utils_benchmark.py --preset small --compare previous.json
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict
+from datetime import datetime
+from typing import Dict, Any, Callable, List, Optional
+
+file_root = os.path.dirname(os.path.abspath(__file__))
+path_list = [
+    file_root,
+    os.path.dirname(file_root)
+]
+for path in path_list:
+    if path not in sys.path:
+        sys.path.append(path)
+
+from benchmarks.repo_generator import PRESETS, RepoSpec, generate_repository
+from utils.git_utils import GitUtils
+
+RESULTS_DIR = os.path.join(file_root, 'results')
+
+
+def _cases(git_utils: GitUtils, repo_path: str, scratch_dir: str) -> Dict[str, Optional[Callable[[], Any]]]:
+    """
+    Map each public GitUtils method to a zero-argument callable that exercises it.
+    A value of None marks a method that cannot run offline.
+    """
+    # clone_repository clones the generated repository over a file:// URL, which
+    # validate_git_url rejects, so a separate instance accepts exactly that URL
+    repo_url = f"file://{repo_path}"
+    local_git_utils = GitUtils()
+    local_git_utils.validate_git_url = lambda git_url: git_url == repo_url
+
+    def clone_local():
+        # Includes removing the clone, so repeated runs do not fill the temp directory
+        shutil.rmtree(local_git_utils.clone_repository(repo_url), ignore_errors=True)
+
+    def cleanup_copy():
+        target = tempfile.mkdtemp(dir=scratch_dir)
+        shutil.rmtree(target)
+        shutil.copytree(repo_path, target, symlinks=True)
+        return git_utils.cleanup_repository(target)
+
+    return {
+        'validate_git_url': lambda: git_utils.validate_git_url('https://github.com/example/repository.git'),
+        'clone_repository': clone_local,
+        'get_file_list_helper': lambda: git_utils.get_file_list_helper(repo_path),
+        'get_git_stats': lambda: git_utils.get_git_stats(repo_path),
+        'get_commit_history': lambda: git_utils.get_commit_history(repo_path, limit=20),
+        'identify_programming_languages': lambda: git_utils.identify_programming_languages(repo_path),
+        'get_repository_structure': lambda: git_utils.get_repository_structure(repo_path, max_depth=3),
+        'get_contributor_stats': lambda: git_utils.get_contributor_stats(repo_path),
+        'search_commits': lambda: git_utils.search_commits(repo_path, 'fix', limit=10),
+        'export_datasets': lambda: git_utils.export_datasets(repo_path, output_dir=tempfile.mkdtemp(dir=scratch_dir)),
+        'cleanup_repository': cleanup_copy,
+    }
+
+
+def _public_methods() -> List[str]:
+    return sorted(name for name in dir(GitUtils)
+                  if not name.startswith('_') and callable(getattr(GitUtils, name)))
+
+
+def measure(func: Callable[[], Any], repeat: int) -> Dict[str, Any]:
+    """
+    Time a callable over several runs, then measure its peak Python heap use in one
+    separate traced run so that tracing overhead does not skew the timings.
+
+    Args:
+        func: Callable to measure
+        repeat: Number of timed runs
+
+    Returns:
+        dict: Timing statistics in seconds and peak traced memory in bytes
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'runs': repeat,
+        'min_seconds': round(min(timings), 6),
+        'median_seconds': round(statistics.median(timings), 6),
+        'max_seconds': round(max(timings), 6),
+        'peak_memory_bytes': peak,
+    }
+
+
+def run_benchmarks(spec_name: str, spec: RepoSpec, repeat: int, methods: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Generate a repository for the spec and benchmark GitUtils methods against it.
+
+    Args:
+        spec_name: Name recorded for the spec in the results
+        spec: Repository size and shape
+        repeat: Number of timed runs per method
+        methods: Methods to benchmark (default: every public method)
+
+    Returns:
+        dict: Spec, generation time and per-method results
+    """
+    git_utils = GitUtils()
+    scratch_dir = tempfile.mkdtemp(prefix='git-utils-bench-')
+    try:
+        repo_path = os.path.join(scratch_dir, 'repository')
+        start = time.perf_counter()
+        generate_repository(repo_path, spec)
+        generation_seconds = time.perf_counter() - start
+
+        cases = _cases(git_utils, repo_path, scratch_dir)
+        results = {}
+        for name in methods or _public_methods():
+            case = cases.get(name)
+            if case is None:
+                reason = "requires network access" if name in cases else "no benchmark case defined"
+                results[name] = {'skipped': reason}
+                continue
+            print(f"  [{spec_name}] {name}...", flush=True)
+            try:
+                results[name] = measure(case, repeat)
+            except Exception as e:
+                results[name] = {'error': str(e)}
+
+        return {
+            'spec': asdict(spec),
+            'generation_seconds': round(generation_seconds, 3),
+            'methods': results,
+        }
+    finally:
+        shutil.rmtree(scratch_dir, ignore_errors=True)
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any]) -> List[str]:
+    """
+    Compare median times and peak memory of two result documents.
+
+    Returns:
+        list: Formatted report lines, one per spec and method present in both
+    """
+    lines = [f"{'spec':<8} {'method':<32} {'time':>10} {'memory':>10}"]
+    for spec_name, spec_results in current['specs'].items():
+        baseline_spec = baseline.get('specs', {}).get(spec_name)
+        if not baseline_spec:
+            continue
+        for method, result in spec_results['methods'].items():
+            previous = baseline_spec['methods'].get(method, {})
+            if 'median_seconds' not in result or 'median_seconds' not in previous:
+                continue
+            time_ratio = result['median_seconds'] / previous['median_seconds'] if previous['median_seconds'] else 0
+            memory_ratio = (result['peak_memory_bytes'] / previous['peak_memory_bytes']
+                            if previous['peak_memory_bytes'] else 0)
+            lines.append(f"{spec_name:<8} {method:<32} {time_ratio:>9.2f}x {memory_ratio:>9.2f}x")
+    return lines
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark GitUtils against synthetic repositories")
+    parser.add_argument("--preset", nargs="+", choices=sorted(PRESETS), default=["small"],
+                        help="Repository size presets to benchmark")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per method")
+    parser.add_argument("--method", nargs="+", help="Only benchmark these methods")
+    parser.add_argument("--output", help="Result file (default: benchmarks/results/git_utils-<timestamp>.json)")
+    parser.add_argument("--compare", help="Previous result file to compare against")
+    args = parser.parse_args()
+
+    document = {
+        'benchmark': 'git_utils',
+        'created': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'specs': {},
+    }
+    for preset in args.preset:
+        print(f"Benchmarking preset '{preset}'...")
+        document['specs'][preset] = run_benchmarks(preset, PRESETS[preset], args.repeat, args.method)
+
+    output = args.output or os.path.join(RESULTS_DIR, f"git_utils-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(document, f, indent=2)
+    print(f"Results written to {output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            print('\n'.join(compare(document, json.load(f))))
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+JSON Serialization Benchmark
+Compares the standard-library JSON path (Flask's default provider, response.json()
+in the MCP client, then FastMCP's default tool serializer) with the fast path
+(FastJSONProvider, loads_document and raw-bytes passthrough in serialize_result)
+on Nexus results with large component lists
+
+Run with: python benchmarks/json_serialization_benchmark.py --components 1000 10000
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List
+
+file_root = os.path.dirname(os.path.abspath(__file__))
+path_list = [
+    file_root,
+    os.path.dirname(file_root)
+]
+for path in path_list:
+    if path not in sys.path:
+        sys.path.append(path)
+
+from fastmcp.tools.tool import default_serializer
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from scan_server.json_provider import FastJSONProvider
+from utils import json_utils
+from utils.scan_results import generate_nexus_scan_results
+
+RESULTS_DIR = os.path.join(file_root, 'results')
+
+
+def build_payload(components: int) -> Dict[str, Any]:
+    """Nexus results whose component list is padded out to the requested size."""
+    payload = generate_nexus_scan_results("benchmark-repo")
+    pool = []
+    repository = 0
+    while len(pool) < components:
+        pool.extend(generate_nexus_scan_results(f"benchmark-repo-{repository}")["components"])
+        repository += 1
+    payload["components"] = [component.to_dict() for component in pool[:components]]
+    return payload
+
+
+def _median_ms(func: Callable[[], Any], repeat: int) -> float:
+    # Like timeit, time with the garbage collector off so collections do not add noise
+    timings = []
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+    finally:
+        gc.enable()
+    return round(statistics.median(timings) * 1000, 3)
+
+
+def run_benchmark(components: int, repeat: int) -> Dict[str, Any]:
+    """
+    Time each stage of both paths for one payload size.
+
+    Returns:
+        dict: Per-stage and total median milliseconds for each path, plus body sizes
+    """
+    app = Flask(__name__)
+    standard = DefaultJSONProvider(app)
+    fast = FastJSONProvider(app)
+    payload = build_payload(components)
+
+    with app.app_context():
+        # Flask's jsonify uses compact separators outside debug mode
+        standard_body = standard.dumps(payload, separators=(",", ":")).encode("utf-8")
+        fast_body = fast.dumps_bytes(payload)
+        standard_decoded = json.loads(standard_body)
+        fast_decoded = json_utils.loads_document(fast_body)
+
+        stages = {
+            'standard': {
+                'server_encode': _median_ms(
+                    lambda: standard.dumps(payload, separators=(",", ":")).encode("utf-8"), repeat),
+                'client_decode': _median_ms(lambda: json.loads(standard_body), repeat),
+                'tool_serialize': _median_ms(lambda: default_serializer(standard_decoded), repeat),
+            },
+            'fast': {
+                'server_encode': _median_ms(lambda: fast.dumps_bytes(payload), repeat),
+                'client_decode': _median_ms(lambda: json_utils.loads_document(fast_body), repeat),
+                'tool_serialize': _median_ms(lambda: json_utils.serialize_result(fast_decoded), repeat),
+            },
+        }
+
+    for path in stages.values():
+        path['total'] = round(sum(path.values()), 3)
+    return {
+        'components': components,
+        'body_bytes': len(fast_body),
+        'tool_output_chars': {
+            'standard': len(default_serializer(standard_decoded)),
+            'fast': len(json_utils.serialize_result(fast_decoded)),
+        },
+        'stages_ms': stages,
+        'speedup': round(stages['standard']['total'] / stages['fast']['total'], 2) if stages['fast']['total'] else None,
+    }
+
+
+def format_report(results: List[Dict[str, Any]]) -> List[str]:
+    lines = [f"{'components':>10} {'path':<9} {'encode':>9} {'decode':>9} {'tool':>9} {'total ms':>9}"]
+    for result in results:
+        for name, stages in result['stages_ms'].items():
+            lines.append(f"{result['components']:>10} {name:<9} {stages['server_encode']:>9.2f} "
+                         f"{stages['client_decode']:>9.2f} {stages['tool_serialize']:>9.2f} {stages['total']:>9.2f}")
+        lines.append(f"{'':>10} speedup {result['speedup']}x")
+    return lines
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark JSON serialization of scan responses")
+    parser.add_argument("--components", type=int, nargs="+", default=[1000, 10000],
+                        help="Nexus component list sizes to benchmark")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per stage")
+    parser.add_argument("--output", help="Result file (default: benchmarks/results/json-<timestamp>.json)")
+    args = parser.parse_args()
+
+    if json_utils.orjson is None:
+        print("orjson is not installed; the fast path falls back to the standard library")
+
+    results = []
+    for components in args.components:
+        print(f"Benchmarking {components} components...", flush=True)
+        results.append(run_benchmark(components, args.repeat))
+
+    document = {
+        'benchmark': 'json_serialization',
+        'created': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'orjson': getattr(json_utils.orjson, '__version__', None),
+        'results': results,
+    }
+    output = args.output or os.path.join(RESULTS_DIR, f"json-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(document, f, indent=2)
+    print("\n".join(format_report(results)))
+    print(f"Results written to {output}")
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Name Lookup Benchmark
+Times the name lookup server's API fetches against a local stub of the Namey API with
+a simulated network latency: the pooled, batched fetches of mcp_servers.name_lookup_server
+against the previous approach of a new session per call and one sequential single-name
+request per name with a fixed delay between requests, and names served from the
+prefetched reservoir (filled before timing, refilled in the background while timed)
+
+Run with: python benchmarks/name_lookup_benchmark.py --counts 1 5 10 25 --latency-ms 50
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import sys
+import time
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List
+
+import aiohttp
+from aiohttp import web
+
+file_root = os.path.dirname(os.path.abspath(__file__))
+path_list = [
+    file_root,
+    os.path.dirname(file_root)
+]
+for path in path_list:
+    if path not in sys.path:
+        sys.path.append(path)
+
+from mcp_servers import name_lookup_server
+
+RESULTS_DIR = os.path.join(file_root, 'results')
+
+STUB_FIRST_NAMES = ["James", "Mary", "Robert", "Patricia", "John", "Jennifer", "Michael", "Linda"]
+STUB_SURNAMES = ["Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis"]
+
+# Delay between single-name requests of the previous implementation
+LEGACY_DELAY_SECONDS = 0.1
+
+
+class StubNameyApi:
+    """Namey-compatible name.json endpoint answering after a fixed latency, counting connections"""
+
+    def __init__(self, latency_ms: float):
+        self.latency = latency_ms / 1000
+        self.requests = 0
+        self.connections = set()
+        self.runner = None
+        self.url = None
+
+    async def handle(self, request: web.Request) -> web.Response:
+        self.requests += 1
+        self.connections.add(request.transport.get_extra_info('peername'))
+        await asyncio.sleep(self.latency)
+        count = int(request.query.get('count', 1))
+        with_surname = request.query.get('with_surname') == 'true'
+        names = [f"{random.choice(STUB_FIRST_NAMES)} {random.choice(STUB_SURNAMES)}" if with_surname
+                 else random.choice(STUB_FIRST_NAMES) for _ in range(count)]
+        return web.json_response(names)
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get('/name.json', self.handle)
+        self.runner = web.AppRunner(app, access_log=None)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, '127.0.0.1', 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f"http://127.0.0.1:{port}/name.json"
+
+    async def stop(self):
+        await self.runner.cleanup()
+
+    def reset(self):
+        self.requests = 0
+        self.connections = set()
+
+
+async def legacy_fetch(count: int) -> List[str]:
+    """The previous fetch: a new session per call, one name per request, a fixed delay in between"""
+    names = []
+    async with aiohttp.ClientSession() as session:
+        for _ in range(count):
+            async with session.get(f"{name_lookup_server.NAMEY_API_BASE}?frequency=common&count=1") as response:
+                if response.status == 200:
+                    data = await response.json()
+                    if data:
+                        names.append(data[0])
+                await asyncio.sleep(LEGACY_DELAY_SECONDS)
+    return names
+
+
+async def pooled_fetch(count: int) -> List[str]:
+    return await name_lookup_server.fetch_random_names_from_api(count)
+
+
+async def reservoir_fetch(count: int) -> List[str]:
+    return await name_lookup_server.reservoir.get("full", count)
+
+
+FETCHERS: Dict[str, Callable[[int], Awaitable[List[str]]]] = {
+    "legacy": legacy_fetch,
+    "pooled": pooled_fetch,
+    "reservoir": reservoir_fetch,
+}
+
+
+async def time_fetcher(stub: StubNameyApi, fetch: Callable[[int], Awaitable[List[str]]], count: int,
+                       calls: int, parallel: int) -> Dict[str, Any]:
+    """
+    Time `calls` fetches of `count` names, `parallel` of them at a time.
+
+    Returns:
+        dict: Mean and p50 latency per call, names received and requests and connections served
+    """
+    if fetch is reservoir_fetch:
+        reservoir = name_lookup_server.reservoir
+        reservoir.start()
+        await reservoir.refill("full")
+    stub.reset()
+    latencies: List[float] = []
+    received = 0
+
+    async def one():
+        nonlocal received
+        started = time.perf_counter()
+        names = await fetch(count)
+        latencies.append((time.perf_counter() - started) * 1000)
+        received += len(names)
+
+    started = time.perf_counter()
+    for start in range(0, calls, parallel):
+        await asyncio.gather(*(one() for _ in range(min(parallel, calls - start))))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        'mean_ms': round(sum(latencies) / len(latencies), 2),
+        'p50_ms': round(latencies[len(latencies) // 2], 2),
+        'seconds': round(elapsed, 3),
+        'names': received,
+        'requests': stub.requests,
+        'connections': len(stub.connections),
+    }
+
+
+async def run_benchmark(counts: List[int], latency_ms: float, calls: int, parallel: int) -> List[Dict[str, Any]]:
+    stub = StubNameyApi(latency_ms)
+    await stub.start()
+    name_lookup_server.NAMEY_API_BASE = stub.url
+    try:
+        results = []
+        for count in counts:
+            print(f"Benchmarking {count} names per call...", flush=True)
+            results.append({
+                'count': count,
+                'fetchers': {name: await time_fetcher(stub, fetch, count, calls, parallel)
+                             for name, fetch in FETCHERS.items()},
+            })
+        return results
+    finally:
+        await name_lookup_server.reservoir.stop()
+        await name_lookup_server.close_session()
+        await stub.stop()
+
+
+def format_report(results: List[Dict[str, Any]]) -> List[str]:
+    lines = [f"{'names':>6} {'fetch':<10} {'mean ms':>9} {'p50 ms':>9} {'requests':>9} {'connections':>12} "
+             f"{'speedup':>8}"]
+    for result in results:
+        legacy = result['fetchers']['legacy']['mean_ms']
+        for name, stage in result['fetchers'].items():
+            speedup = legacy / max(stage['mean_ms'], 0.01)
+            lines.append(f"{result['count']:>6} {name:<10} {stage['mean_ms']:>9.2f} {stage['p50_ms']:>9.2f} "
+                         f"{stage['requests']:>9} {stage['connections']:>12} {speedup:>7.0f}x")
+    return lines
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark name lookup API fetches against a local stub API")
+    parser.add_argument("--counts", type=int, nargs="+", default=[1, 5, 10, 25], help="Names per call")
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="Simulated latency of each API request")
+    parser.add_argument("--calls", type=int, default=20, help="Calls per count and fetch method")
+    parser.add_argument("--parallel", type=int, default=4, help="Calls in flight at once")
+    parser.add_argument("--output", help="Result file (default: benchmarks/results/name_lookup-<timestamp>.json)")
+    args = parser.parse_args()
+
+    results = asyncio.run(run_benchmark(args.counts, args.latency_ms, args.calls, args.parallel))
+
+    document = {
+        'benchmark': 'name_lookup',
+        'created': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'latency_ms': args.latency_ms,
+        'calls': args.calls,
+        'parallel': args.parallel,
+        'results': results,
+    }
+    output = args.output or os.path.join(RESULTS_DIR, f"name_lookup-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(document, f, indent=2)
+    print("\n".join(format_report(results)))
+    print(f"Results written to {output}")
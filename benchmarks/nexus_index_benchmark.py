@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Nexus Index Benchmark
+Compares lookups over Nexus results by walking every component and vulnerability
+with the inverted indexes behind query_nexus_findings (CVE, license, severity and
+CVSS-ordered indexes) on results padded out to portfolio-sized component lists
+
+Run with: python benchmarks/nexus_index_benchmark.py --components 10000 50000
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List
+
+file_root = os.path.dirname(os.path.abspath(__file__))
+path_list = [
+    file_root,
+    os.path.dirname(file_root)
+]
+for path in path_list:
+    if path not in sys.path:
+        sys.path.append(path)
+
+from utils.scan_query import NexusIndex, query_nexus_findings
+from utils.scan_results import generate_nexus_scan_results
+
+RESULTS_DIR = os.path.join(file_root, 'results')
+
+
+def build_results(components: int) -> Dict[str, Any]:
+    """Nexus results whose component list is padded out to the requested size."""
+    results = generate_nexus_scan_results("benchmark-repo")
+    pool = []
+    repository = 0
+    while len(pool) < components:
+        pool.extend(generate_nexus_scan_results(f"benchmark-repo-{repository}")["components"])
+        repository += 1
+    results["components"] = pool[:components]
+    return results
+
+
+def linear_lookup(results: Dict[str, Any], cve=None, license=None, severity=None, min_cvss=None) -> int:
+    """The lookup without indexes: visit every component and vulnerability, return matches"""
+    matched = 0
+    for component in results["components"]:
+        if license is not None and component.license != license:
+            continue
+        for vulnerability in component.vulnerabilities:
+            if cve is not None and vulnerability.cve_id != cve:
+                continue
+            if severity is not None and vulnerability.severity != severity:
+                continue
+            if min_cvss is not None and vulnerability.cvss_score < min_cvss:
+                continue
+            matched += 1
+    return matched
+
+
+def _median_ms(func: Callable[[], Any], repeat: int) -> float:
+    timings = []
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+    finally:
+        gc.enable()
+    return round(statistics.median(timings) * 1000, 4)
+
+
+def run_benchmark(components: int, repeat: int) -> Dict[str, Any]:
+    """
+    Time index construction and each lookup both ways for one result size.
+
+    Returns:
+        dict: Build time plus per-lookup median milliseconds and match counts
+    """
+    results = build_results(components)
+    vulnerabilities = [vulnerability for component in results["components"]
+                       for vulnerability in component.vulnerabilities]
+    lookups = {
+        'cve': {'cve': vulnerabilities[len(vulnerabilities) // 2].cve_id},
+        'license': {'license': 'GPL-3.0'},
+        'severity_critical': {'severity': 'Critical'},
+        'cvss_9_plus': {'min_cvss': 9.0},
+        'gpl_cvss_9_plus': {'license': 'GPL-3.0', 'min_cvss': 9.0},
+    }
+
+    build_ms = _median_ms(lambda: NexusIndex(results["components"]), repeat)
+    # Prime the per-result index cache, as the first query against a scan would
+    query_nexus_findings(results)
+
+    timings = {}
+    for name, lookup in lookups.items():
+        linear_matches = linear_lookup(results, **lookup)
+        page = query_nexus_findings(results, limit=1, **lookup)
+        timings[name] = {
+            'matches': linear_matches,
+            'indexed_matches': page['total_vulnerabilities'],
+            'linear_ms': _median_ms(lambda: linear_lookup(results, **lookup), repeat),
+            'indexed_ms': _median_ms(lambda: query_nexus_findings(results, limit=1, **lookup), repeat),
+        }
+        timings[name]['speedup'] = round(timings[name]['linear_ms'] / timings[name]['indexed_ms'], 1) \
+            if timings[name]['indexed_ms'] else None
+    return {
+        'components': components,
+        'vulnerabilities': len(vulnerabilities),
+        'index_build_ms': build_ms,
+        'lookups': timings,
+    }
+
+
+def format_report(results: List[Dict[str, Any]]) -> List[str]:
+    lines = [f"{'components':>10} {'lookup':<18} {'matches':>8} {'linear ms':>10} {'indexed ms':>11} {'speedup':>8}"]
+    for result in results:
+        for name, lookup in result['lookups'].items():
+            lines.append(f"{result['components']:>10} {name:<18} {lookup['matches']:>8} {lookup['linear_ms']:>10.3f} "
+                         f"{lookup['indexed_ms']:>11.3f} {lookup['speedup']:>7}x")
+        lines.append(f"{'':>10} index built once per scan in {result['index_build_ms']:.1f}ms "
+                     f"({result['vulnerabilities']} vulnerabilities)")
+    return lines
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark indexed Nexus lookups against linear scans")
+    parser.add_argument("--components", type=int, nargs="+", default=[10000, 50000],
+                        help="Nexus component list sizes to benchmark")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per lookup")
+    parser.add_argument("--output", help="Result file (default: benchmarks/results/nexus_index-<timestamp>.json)")
+    args = parser.parse_args()
+
+    results = []
+    for components in args.components:
+        print(f"Benchmarking {components} components...", flush=True)
+        results.append(run_benchmark(components, args.repeat))
+
+    document = {
+        'benchmark': 'nexus_index',
+        'created': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results,
+    }
+    output = args.output or os.path.join(RESULTS_DIR, f"nexus_index-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(document, f, indent=2)
+    print("\n".join(format_report(results)))
+    print(f"Results written to {output}")
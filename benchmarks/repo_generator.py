@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Synthetic Git Repository Generator
+Builds deterministic repositories of configurable size with `git fast-import`,
+for benchmarking GitUtils without network access
+"""
+import argparse
+import os
+import random
+import subprocess
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional
+
+# Commit timestamps start here and advance by one hour per commit
+BASE_TIMESTAMP = 1_600_000_000
+
+# File extensions used for generated source files
+SOURCE_EXTENSIONS = ['.py', '.js', '.ts', '.java', '.go', '.rs', '.c', '.cpp', '.rb', '.sh', '.yaml', '.html']
+
+WORDS = ['alpha', 'bravo', 'charlie', 'delta', 'echo', 'foxtrot', 'golf', 'hotel',
+         'india', 'juliet', 'kilo', 'lima', 'mike', 'november', 'oscar', 'papa']
+
+COMMIT_VERBS = ['Fix', 'Add', 'Refactor', 'Update', 'Remove', 'Improve', 'Document', 'Optimize']
+
+
+@dataclass
+class RepoSpec:
+    """Size and shape of a synthetic repository"""
+    commits: int = 200
+    authors: int = 5
+    files: int = 100
+    branches: int = 3
+    tags: int = 5
+    merge_ratio: float = 0.1
+    binary_files: int = 5
+    files_per_commit: int = 3
+    seed: int = 0
+
+
+# Named presets used by the benchmark suite
+PRESETS: Dict[str, RepoSpec] = {
+    'small': RepoSpec(commits=200, authors=5, files=100, branches=3, tags=5, binary_files=5),
+    'medium': RepoSpec(commits=2000, authors=25, files=1000, branches=10, tags=20, binary_files=20),
+    'large': RepoSpec(commits=10000, authors=100, files=5000, branches=30, tags=100, binary_files=50),
+}
+
+
+class _FastImportStream:
+    """Writes git fast-import commands to a pipe"""
+
+    def __init__(self, pipe):
+        self.pipe = pipe
+
+    def write(self, text: str):
+        self.pipe.write(text.encode('utf-8'))
+
+    def data(self, payload: bytes):
+        self.pipe.write(f'data {len(payload)}\n'.encode('utf-8'))
+        self.pipe.write(payload)
+        self.pipe.write(b'\n')
+
+
+class SyntheticRepoGenerator:
+    """
+    Generates a repository from a RepoSpec. The same spec and seed always
+    produce the same commits, hashes included.
+    """
+
+    def __init__(self, spec: RepoSpec):
+        if spec.commits < 1:
+            raise ValueError("A synthetic repository needs at least one commit")
+        self.spec = spec
+        self.rng = random.Random(spec.seed)
+        self.paths = self._make_paths()
+        self.binary_paths = [f'assets/blob_{index:04d}.bin' for index in range(spec.binary_files)]
+        self.authors = [(f'Author {index:03d}', f'author{index:03d}@example.com') for index in range(spec.authors)]
+
+    def _make_paths(self) -> List[str]:
+        paths = []
+        for index in range(self.spec.files):
+            package = WORDS[index % len(WORDS)]
+            module = WORDS[(index // len(WORDS)) % len(WORDS)]
+            extension = SOURCE_EXTENSIONS[index % len(SOURCE_EXTENSIONS)]
+            paths.append(f'src/{package}/{module}_{index:05d}{extension}')
+        return paths
+
+    def _text_blob(self) -> bytes:
+        lines = [' '.join(self.rng.choices(WORDS, k=self.rng.randint(3, 10)))
+                 for _ in range(self.rng.randint(10, 60))]
+        return ('\n'.join(lines) + '\n').encode('utf-8')
+
+    def _binary_blob(self) -> bytes:
+        return self.rng.randbytes(self.rng.randint(512, 4096))
+
+    def _commit(self, stream: _FastImportStream, ref: str, mark: int, timestamp: int, message: str,
+                parents: List[int], changes: List[str]):
+        name, email = self.rng.choice(self.authors)
+        stream.write(f'commit {ref}\nmark :{mark}\n')
+        stream.write(f'author {name} <{email}> {timestamp} +0000\n')
+        stream.write(f'committer {name} <{email}> {timestamp} +0000\n')
+        stream.data(message.encode('utf-8'))
+        if parents:
+            stream.write(f'from :{parents[0]}\n')
+        for parent in parents[1:]:
+            stream.write(f'merge :{parent}\n')
+        for path in changes:
+            stream.write(f'M 100644 inline {path}\n')
+            stream.data(self._binary_blob() if path in self.binary_paths else self._text_blob())
+
+    def _message(self) -> str:
+        subject = f"{self.rng.choice(COMMIT_VERBS)} {self.rng.choice(WORDS)} {self.rng.choice(WORDS)}"
+        if self.rng.random() < 0.3:
+            subject += '\n\n' + ' '.join(self.rng.choices(WORDS, k=20))
+        return subject
+
+    def write_stream(self, pipe):
+        """Write the complete fast-import stream for the spec to a binary pipe."""
+        spec = self.spec
+        stream = _FastImportStream(pipe)
+        mark = 0
+        mainline: List[int] = []
+
+        # Initial commit adds every file
+        mark += 1
+        self._commit(stream, 'refs/heads/main', mark, BASE_TIMESTAMP, 'Initial commit', [],
+                     self.paths + self.binary_paths)
+        mainline.append(mark)
+
+        changeable = self.paths + self.binary_paths
+        for index in range(1, spec.commits):
+            timestamp = BASE_TIMESTAMP + index * 3600
+            changes = self.rng.sample(changeable, min(len(changeable), self.rng.randint(1, spec.files_per_commit)))
+            parents = [mainline[-1]]
+
+            if self.rng.random() < spec.merge_ratio:
+                # Side commit on a topic branch, merged back by the mainline commit
+                mark += 1
+                self._commit(stream, 'refs/heads/topic', mark, timestamp - 1800, self._message(),
+                             [mainline[-1]], changes)
+                parents.append(mark)
+                changes = self.rng.sample(changeable, min(len(changeable), 1))
+                message = f"Merge topic into main\n\n{self._message()}"
+            else:
+                message = self._message()
+
+            mark += 1
+            self._commit(stream, 'refs/heads/main', mark, timestamp, message, parents, changes)
+            mainline.append(mark)
+
+        for index in range(spec.branches):
+            target = mainline[(index * len(mainline)) // max(spec.branches, 1)]
+            stream.write(f'reset refs/heads/feature-{index:03d}\nfrom :{target}\n\n')
+
+        for index in range(spec.tags):
+            target = mainline[min(len(mainline) - 1, ((index + 1) * len(mainline)) // max(spec.tags, 1) - 1)]
+            stream.write(f'reset refs/tags/v{index // 10}.{index % 10}.0\nfrom :{target}\n\n')
+
+        stream.write('reset refs/heads/topic\nfrom 0000000000000000000000000000000000000000\n\n')
+        stream.write('done\n')
+
+    def generate(self, path: str) -> str:
+        """
+        Create the repository at path and check out main.
+
+        Args:
+            path: Directory for the new repository; must not exist or be empty
+
+        Returns:
+            str: Path to the generated repository
+        """
+        os.makedirs(path, exist_ok=True)
+        if os.listdir(path):
+            raise ValueError(f"Target directory {path} is not empty")
+
+        subprocess.run(['git', 'init', '-q', path], check=True)
+        process = subprocess.Popen(['git', 'fast-import', '--quiet', '--done'], cwd=path, stdin=subprocess.PIPE)
+        try:
+            self.write_stream(process.stdin)
+        finally:
+            process.stdin.close()
+        if process.wait() != 0:
+            raise RuntimeError("git fast-import failed")
+
+        subprocess.run(['git', 'symbolic-ref', 'HEAD', 'refs/heads/main'], cwd=path, check=True)
+        subprocess.run(['git', 'checkout', '-q', '-f', 'main'], cwd=path, check=True)
+        return path
+
+
+def generate_repository(path: str, spec: Optional[RepoSpec] = None) -> str:
+    """
+    Generate a deterministic synthetic repository.
+
+    Args:
+        path: Directory for the new repository
+        spec: Repository size and shape (default: the 'small' preset)
+
+    Returns:
+        str: Path to the generated repository
+    """
+    return SyntheticRepoGenerator(spec or PRESETS['small']).generate(path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a deterministic synthetic git repository")
+    parser.add_argument("path", help="Directory for the new repository")
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="small")
+    for field_name, default in asdict(RepoSpec()).items():
+        parser.add_argument(f"--{field_name.replace('_', '-')}", type=type(default), default=None)
+    args = parser.parse_args()
+
+    overrides = {name: value for name, value in vars(args).items()
+                 if name in asdict(RepoSpec()) and value is not None}
+    repo_spec = RepoSpec(**{**asdict(PRESETS[args.preset]), **overrides})
+    print(f"Generating repository at {generate_repository(args.path, repo_spec)} with {repo_spec}")
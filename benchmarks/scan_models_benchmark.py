@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Scan Models Benchmark
+Compares dict-based findings with the slot-based models in utils.scan_models on
+large generated results: generation time and retained memory, aggregation time
+(per-severity list comprehensions versus one counting pass) and JSON serialization
+
+Run with: python benchmarks/scan_models_benchmark.py --findings 100000
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from collections import Counter
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Tuple
+
+file_root = os.path.dirname(os.path.abspath(__file__))
+path_list = [
+    file_root,
+    os.path.dirname(file_root)
+]
+for path in path_list:
+    if path not in sys.path:
+        sys.path.append(path)
+
+from utils import json_utils
+from utils.scan_models import severity_counts
+from utils.scan_results import (FORTIFY_CATEGORIES, generate_fortify_vulnerability, generate_random_date,
+                                generate_random_id, generate_random_severity, scan_base_date)
+
+RESULTS_DIR = os.path.join(file_root, 'results')
+
+
+def dict_fortify_vulnerability(rng, base_date: datetime) -> Dict[str, Any]:
+    """A Fortify vulnerability built as a dict, the way results were generated before the models"""
+    return {
+        "instance_id": f"fortify-{generate_random_id(rng)[:8]}",
+        "category": rng.choice(FORTIFY_CATEGORIES),
+        "severity": generate_random_severity(rng),
+        "confidence": rng.choice(["High", "Medium", "Low"]),
+        "impact": round(rng.uniform(1, 5), 1),
+        "likelihood": round(rng.uniform(1, 5), 1),
+        "file_path": f"src/main/java/com/example/{rng.choice(['web', 'service', 'dao', 'util'])}/{rng.choice(['UserController', 'AuthService', 'DatabaseDAO', 'ValidationUtil'])}.java",
+        "line_number": rng.randint(1, 500),
+        "function_name": rng.choice(
+            ["authenticate", "processInput", "executeQuery", "validateUser", "encryptData"]),
+        "description": rng.choice([
+            "User input is not properly validated before being used in SQL query",
+            "Data from user input is not encoded before output to web page",
+            "File path constructed from user input without proper validation",
+            "Cryptographic hash function is weak and vulnerable to attacks",
+            "Random number generator is not cryptographically secure"
+        ]),
+        "recommendation": "Implement proper input validation and output encoding",
+        "cwe_id": rng.choice([79, 89, 22, 78, 90, 91, 120, 134, 311, 330]),
+        "owasp_category": rng.choice(["A03:2021", "A02:2021", "A01:2021", "A04:2021", "A06:2021"]),
+        "first_detected": generate_random_date(30, rng, base_date),
+        "last_seen": generate_random_date(3, rng, base_date)
+    }
+
+
+def dict_aggregate(vulnerabilities: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Aggregation as it was done over dict findings: one list comprehension per count"""
+    return {
+        "vulnerability_counts": {
+            "total": len(vulnerabilities),
+            "critical": len([v for v in vulnerabilities if v["severity"] == "Critical"]),
+            "high": len([v for v in vulnerabilities if v["severity"] == "High"]),
+            "medium": len([v for v in vulnerabilities if v["severity"] == "Medium"]),
+            "low": len([v for v in vulnerabilities if v["severity"] == "Low"]),
+            "info": len([v for v in vulnerabilities if v["severity"] == "Info"])
+        },
+        "category_breakdown": {
+            category: len([v for v in vulnerabilities if v["category"] == category])
+            for category in set(v["category"] for v in vulnerabilities)
+        },
+    }
+
+
+def model_aggregate(vulnerabilities: List[Any]) -> Dict[str, Any]:
+    """Aggregation over models in a single counting pass"""
+    severities = Counter()
+    categories = Counter()
+    for vulnerability in vulnerabilities:
+        severities[vulnerability.severity] += 1
+        categories[vulnerability.category] += 1
+    return {"vulnerability_counts": severity_counts(severities), "category_breakdown": dict(categories)}
+
+
+def _generate(factory: Callable, count: int) -> Tuple[List[Any], float, int]:
+    """
+    Generate findings, returning them with the elapsed seconds and retained heap bytes.
+    Memory is measured in a separate traced run so tracing does not skew the timing.
+    """
+    base_date = scan_base_date()
+    rng = random.Random(42)
+    gc.collect()
+    tracemalloc.start()
+    traced = [factory(rng, base_date) for _ in range(count)]
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del traced
+
+    rng = random.Random(42)
+    gc.collect()
+    start = time.perf_counter()
+    findings = [factory(rng, base_date) for _ in range(count)]
+    return findings, time.perf_counter() - start, retained
+
+
+def _timed(func: Callable[[], Any]) -> Tuple[Any, float]:
+    gc.collect()
+    start = time.perf_counter()
+    value = func()
+    return value, time.perf_counter() - start
+
+
+def run_benchmark(count: int) -> Dict[str, Any]:
+    """
+    Benchmark dict findings against model findings for one result size.
+
+    Returns:
+        dict: Seconds and bytes per stage for both representations
+    """
+    results = {}
+    for name, factory, aggregate in (("dict", dict_fortify_vulnerability, dict_aggregate),
+                                     ("model", generate_fortify_vulnerability, model_aggregate)):
+        print(f"  {name} findings...", flush=True)
+        findings, generate_seconds, retained = _generate(factory, count)
+        _, aggregate_seconds = _timed(lambda: aggregate(findings))
+        body, serialize_seconds = _timed(lambda: json_utils.dumps({"vulnerabilities": findings}))
+        results[name] = {
+            'generate_seconds': round(generate_seconds, 4),
+            'retained_bytes': retained,
+            'aggregate_seconds': round(aggregate_seconds, 4),
+            'serialize_seconds': round(serialize_seconds, 4),
+            'body_bytes': len(body),
+        }
+        if name == "dict":
+            # The standard library encoder, as used before orjson, for reference
+            _, stdlib_seconds = _timed(lambda: json.dumps({"vulnerabilities": findings}, separators=(",", ":")))
+            results[name]['serialize_stdlib_seconds'] = round(stdlib_seconds, 4)
+        del findings, body
+
+    baseline, models = results['dict'], results['model']
+    results['ratios'] = {
+        key: round(models[key] / baseline[key], 3)
+        for key in ('generate_seconds', 'retained_bytes', 'aggregate_seconds', 'serialize_seconds')
+        if baseline[key]
+    }
+    return {'findings': count, **results}
+
+
+def format_report(results: List[Dict[str, Any]]) -> List[str]:
+    lines = [f"{'findings':>9} {'repr':<6} {'generate s':>11} {'memory MiB':>11} {'aggregate s':>12} {'serialize s':>12}"]
+    for result in results:
+        for name in ('dict', 'model'):
+            stage = result[name]
+            lines.append(f"{result['findings']:>9} {name:<6} {stage['generate_seconds']:>11.3f} "
+                         f"{stage['retained_bytes'] / 2 ** 20:>11.1f} {stage['aggregate_seconds']:>12.4f} "
+                         f"{stage['serialize_seconds']:>12.4f}")
+        lines.append(f"{'':>9} dict with the standard library encoder: "
+                     f"serialize {result['dict']['serialize_stdlib_seconds']:.4f}s")
+        ratios = result['ratios']
+        lines.append(f"{'':>9} model/dict: generate {ratios.get('generate_seconds')}x, "
+                     f"memory {ratios.get('retained_bytes')}x, aggregate {ratios.get('aggregate_seconds')}x, "
+                     f"serialize {ratios.get('serialize_seconds')}x")
+    return lines
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark dict findings against slot-based scan models")
+    parser.add_argument("--findings", type=int, nargs="+", default=[100000],
+                        help="Number of Fortify findings to generate per run")
+    parser.add_argument("--output", help="Result file (default: benchmarks/results/scan_models-<timestamp>.json)")
+    args = parser.parse_args()
+
+    results = []
+    for count in args.findings:
+        print(f"Benchmarking {count} findings...", flush=True)
+        results.append(run_benchmark(count))
+
+    document = {
+        'benchmark': 'scan_models',
+        'created': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'orjson': getattr(json_utils.orjson, '__version__', None),
+        'results': results,
+    }
+    output = args.output or os.path.join(RESULTS_DIR, f"scan_models-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(document, f, indent=2)
+    print("\n".join(format_report(results)))
+    print(f"Results written to {output}")
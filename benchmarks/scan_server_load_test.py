@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Scan Server Load Test
+Drives the Flask scan server at several concurrency levels and reports
+requests/second and latency percentiles, either against a server it starts
+itself (gunicorn via scan_server/serve.py, or the development server) or
+against an already running one
+
+Run with: python benchmarks/scan_server_load_test.py --server gunicorn --concurrency 1 8 32 64
+Compare:  python benchmarks/scan_server_load_test.py --server dev --concurrency 1 8 32 64
+External: python benchmarks/scan_server_load_test.py --url http://localhost:5001
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import aiohttp
+
+file_root = os.path.dirname(os.path.abspath(__file__))
+path_list = [
+    file_root,
+    os.path.dirname(file_root)
+]
+for path in path_list:
+    if path not in sys.path:
+        sys.path.append(path)
+
+RESULTS_DIR = os.path.join(file_root, 'results')
+REPO_ROOT = os.path.dirname(file_root)
+
+# Request mix: each client cycles through these paths
+DEFAULT_PATHS = [
+    "/api/scans/sonar?project_key=load-{n}",
+    "/api/scans/fortify/summary?application_name=load-{n}",
+    "/api/scans/nexus?repository_name=load-{n}&severity=Critical&limit=20",
+    "/api/scans/all/summary?project_identifier=load-{n}",
+]
+
+# Distinct project identifiers in the mix, so both cached and uncached results are exercised
+DEFAULT_PROJECTS = 50
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(kind: str, workers: int, threads: int) -> Tuple[subprocess.Popen, str]:
+    """Start gunicorn or the development server on a free port; returns the process and base URL"""
+    port = _free_port()
+    if kind == "gunicorn":
+        command = [sys.executable, os.path.join(REPO_ROOT, "scan_server", "serve.py"),
+                   "--bind", f"127.0.0.1:{port}", "--workers", str(workers), "--threads", str(threads)]
+        env = {**os.environ, "SCAN_SERVER_LOG_LEVEL": "warning"}
+    else:
+        command = [sys.executable, "-c",
+                   "import logging; logging.disable(logging.INFO); "
+                   "from scan_server.flask_scan_server import app, warm_up; warm_up(); "
+                   f"app.run(host='127.0.0.1', port={port}, threaded=True)"]
+        env = dict(os.environ)
+    process = subprocess.Popen(command, cwd=REPO_ROOT, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return process, f"http://127.0.0.1:{port}"
+
+
+async def wait_until_ready(base_url: str, timeout: float = 30.0):
+    """Poll /ready until the server reports ready"""
+    deadline = time.monotonic() + timeout
+    async with aiohttp.ClientSession() as session:
+        while time.monotonic() < deadline:
+            try:
+                async with session.get(f"{base_url}/ready") as response:
+                    if response.status == 200:
+                        return
+            except aiohttp.ClientError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"Server at {base_url} did not become ready within {timeout}s")
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+async def run_level(base_url: str, concurrency: int, duration: float, paths: List[str],
+                    projects: int) -> Dict[str, Any]:
+    """
+    Keep `concurrency` requests in flight for `duration` seconds.
+
+    Returns:
+        dict: Request count, errors, requests/second and latency percentiles in milliseconds
+    """
+    latencies: List[float] = []
+    errors = 0
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    deadline = time.perf_counter() + duration
+
+    async with aiohttp.ClientSession(connector=connector) as session:
+        async def client(client_id: int):
+            nonlocal errors
+            n = client_id
+            while time.perf_counter() < deadline:
+                path = paths[n % len(paths)].format(n=n % projects)
+                n += concurrency
+                started = time.perf_counter()
+                try:
+                    async with session.get(f"{base_url}{path}", headers={"Accept-Encoding": "gzip"}) as response:
+                        await response.read()
+                        if response.status != 200:
+                            errors += 1
+                            continue
+                except aiohttp.ClientError:
+                    errors += 1
+                    continue
+                latencies.append((time.perf_counter() - started) * 1000)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(client(i) for i in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        'concurrency': concurrency,
+        'requests': len(latencies),
+        'errors': errors,
+        'seconds': round(elapsed, 3),
+        'requests_per_second': round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        'p50_ms': round(_percentile(latencies, 0.50), 2),
+        'p90_ms': round(_percentile(latencies, 0.90), 2),
+        'p99_ms': round(_percentile(latencies, 0.99), 2),
+        'max_ms': round(latencies[-1], 2) if latencies else 0.0,
+    }
+
+
+async def run_load_test(base_url: str, levels: List[int], duration: float, warmup: float,
+                        paths: List[str], projects: int) -> List[Dict[str, Any]]:
+    await wait_until_ready(base_url)
+    if warmup > 0:
+        await run_level(base_url, max(levels), warmup, paths, projects)
+    results = []
+    for concurrency in levels:
+        print(f"  concurrency {concurrency}...", flush=True)
+        results.append(await run_level(base_url, concurrency, duration, paths, projects))
+    return results
+
+
+def format_report(results: List[Dict[str, Any]]) -> List[str]:
+    lines = [f"{'concurrency':>11} {'req/s':>9} {'p50 ms':>9} {'p99 ms':>9} {'max ms':>9} {'errors':>7}"]
+    for level in results:
+        lines.append(f"{level['concurrency']:>11} {level['requests_per_second']:>9.1f} {level['p50_ms']:>9.2f} "
+                     f"{level['p99_ms']:>9.2f} {level['max_ms']:>9.2f} {level['errors']:>7}")
+    return lines
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test the scan results API")
+    parser.add_argument("--server", choices=["gunicorn", "dev"], default="gunicorn",
+                        help="Server to start for the test (ignored with --url)")
+    parser.add_argument("--url", help="Base URL of an already running server")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="gunicorn worker processes")
+    parser.add_argument("--threads", type=int, default=4, help="gunicorn threads per worker")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32, 64],
+                        help="Concurrent requests to hold in flight, one run per value")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per concurrency level")
+    parser.add_argument("--warmup", type=float, default=2.0, help="Seconds of warm-up traffic before measuring")
+    parser.add_argument("--projects", type=int, default=DEFAULT_PROJECTS, help="Distinct project identifiers")
+    parser.add_argument("--output", help="Result file (default: benchmarks/results/scan_server-<timestamp>.json)")
+    args = parser.parse_args()
+
+    process: Optional[subprocess.Popen] = None
+    base_url = args.url
+    if not base_url:
+        process, base_url = start_server(args.server, args.workers, args.threads)
+    try:
+        print(f"Load testing {base_url} ({args.url and 'external' or args.server})...")
+        levels = asyncio.run(run_load_test(base_url, args.concurrency, args.duration, args.warmup,
+                                           DEFAULT_PATHS, args.projects))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait(timeout=60)
+
+    document = {
+        'benchmark': 'scan_server_load',
+        'created': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'server': 'external' if args.url else args.server,
+        'workers': None if args.url or args.server == 'dev' else args.workers,
+        'threads': None if args.url or args.server == 'dev' else args.threads,
+        'duration_seconds': args.duration,
+        'paths': DEFAULT_PATHS,
+        'levels': levels,
+    }
+    output = args.output or os.path.join(RESULTS_DIR, f"scan_server-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(document, f, indent=2)
+    print("\n".join(format_report(levels)))
+    print(f"Results written to {output}")
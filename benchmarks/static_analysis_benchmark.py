@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Static Analysis Benchmark
+Times utils.static_analysis on a generated git repository of synthetic source files:
+the combined single-pass matcher against one pass per rule, a cold analysis
+serially and on the process pool, a warm rescan served from the blob cache, and an
+incremental rescan after a commit that changes a fraction of the files
+
+Run with: python benchmarks/static_analysis_benchmark.py --files 2000 --changed 0.01
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Any, Dict, List
+
+file_root = os.path.dirname(os.path.abspath(__file__))
+path_list = [
+    file_root,
+    os.path.dirname(file_root)
+]
+for path in path_list:
+    if path not in sys.path:
+        sys.path.append(path)
+
+from utils import static_analysis
+from utils.static_analysis import _MARKERS, RULES, analyze_repository, scan_text
+
+RESULTS_DIR = os.path.join(file_root, 'results')
+
+# Lines mixed into generated files; a few of them trigger rules
+SAFE_LINES = [
+    "    total = compute(total, item)",
+    "    if item is None:",
+    "        continue",
+    "    for key, value in mapping.items():",
+    "    logger.info('processed %s', key)",
+    "    result.append(transform(value))",
+    "    while queue and not done:",
+]
+FLAGGED_LINES = [
+    "    password = 'hunter2-secret'",
+    "    os.system(command)",
+    "    data = pickle.loads(payload)",
+    "    digest = hashlib.md5(body)",
+    "    requests.get(url, verify=False)",
+]
+
+GIT_ENV = {**os.environ, 'GIT_AUTHOR_NAME': 'Benchmark', 'GIT_AUTHOR_EMAIL': 'benchmark@example.com',
+           'GIT_COMMITTER_NAME': 'Benchmark', 'GIT_COMMITTER_EMAIL': 'benchmark@example.com'}
+
+
+def _source_file(rng: random.Random, lines: int) -> str:
+    body = []
+    for index in range(lines):
+        if index % 25 == 0:
+            body.append(f"def function_{index}(item, mapping, queue):")
+        pool = FLAGGED_LINES if rng.random() < 0.01 else SAFE_LINES
+        body.append(rng.choice(pool))
+    return "\n".join(body) + "\n"
+
+
+def _git(repo_path: str, *args: str):
+    subprocess.run(["git", *args], cwd=repo_path, env=GIT_ENV, check=True, capture_output=True)
+
+
+def build_repository(path: str, files: int, lines: int, seed: int = 0) -> List[str]:
+    """Create and commit a repository of generated Python files; returns their relative paths."""
+    rng = random.Random(seed)
+    paths = []
+    for index in range(files):
+        relative = os.path.join(f"pkg{index % 20}", f"module_{index}.py")
+        os.makedirs(os.path.join(path, os.path.dirname(relative)), exist_ok=True)
+        with open(os.path.join(path, relative), "w") as f:
+            f.write(_source_file(rng, lines))
+        paths.append(relative)
+    _git(path, "init", "-q")
+    _git(path, "add", "-A")
+    _git(path, "commit", "-q", "-m", "Initial commit")
+    return paths
+
+
+def multi_pass_scan(text: str) -> int:
+    """One regular expression pass per rule and complexity marker, the approach the combined matcher replaces"""
+    patterns = [rule.pattern for rule in RULES] + [pattern for _, _, pattern in _MARKERS]
+    return sum(1 for pattern in patterns for _ in re.finditer(pattern, text, re.MULTILINE))
+
+
+def _timed(func) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def run_benchmark(files: int, lines: int, changed: float, workers: int) -> Dict[str, Any]:
+    """
+    Run every stage on one generated repository.
+
+    Returns:
+        dict: Seconds per stage, issue counts and per-analysis file/cache counts
+    """
+    scratch = tempfile.mkdtemp(prefix="static-analysis-bench-")
+    try:
+        repo_path = os.path.join(scratch, "repo")
+        os.makedirs(repo_path)
+        paths = build_repository(repo_path, files, lines)
+        texts = []
+        for relative in paths:
+            with open(os.path.join(repo_path, relative)) as f:
+                texts.append(f.read())
+
+        stages = {
+            'matcher_combined_seconds': _timed(lambda: [scan_text(text) for text in texts]),
+            'matcher_per_rule_seconds': _timed(lambda: [multi_pass_scan(text) for text in texts]),
+        }
+
+        static_analysis.blob_cache.clear()
+        stages['cold_serial_seconds'] = _timed(lambda: analyze_repository(repo_path, max_workers=1))
+        static_analysis.blob_cache.clear()
+        cold = {}
+        stages['cold_pool_seconds'] = _timed(lambda: cold.update(analyze_repository(repo_path, max_workers=workers)))
+        warm = {}
+        stages['warm_seconds'] = _timed(lambda: warm.update(analyze_repository(repo_path, max_workers=workers)))
+
+        rng = random.Random(1)
+        modified = rng.sample(paths, max(1, int(len(paths) * changed)))
+        for relative in modified:
+            with open(os.path.join(repo_path, relative), "a") as f:
+                f.write(FLAGGED_LINES[0] + "\n")
+        _git(repo_path, "commit", "-q", "-a", "-m", "Update files")
+        incremental = {}
+        stages['incremental_seconds'] = _timed(
+            lambda: incremental.update(analyze_repository(repo_path, max_workers=workers)))
+
+        return {
+            'files': files,
+            'lines_per_file': lines,
+            'workers': workers,
+            'changed_files': len(modified),
+            'issues': {'cold': len(cold['issues']), 'incremental': len(incremental['issues'])},
+            'analysis': {'cold': cold['analysis'], 'warm': warm['analysis'], 'incremental': incremental['analysis']},
+            'stages': {name: round(seconds, 4) for name, seconds in stages.items()},
+        }
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+
+def format_report(result: Dict[str, Any]) -> List[str]:
+    stages = result['stages']
+    return [
+        f"{result['files']} files x {result['lines_per_file']} lines, {result['workers']} workers",
+        f"  matcher: combined {stages['matcher_combined_seconds']:.3f}s, "
+        f"one pass per rule {stages['matcher_per_rule_seconds']:.3f}s",
+        f"  cold analysis: serial {stages['cold_serial_seconds']:.3f}s, pool {stages['cold_pool_seconds']:.3f}s "
+        f"({result['issues']['cold']} issues)",
+        f"  warm rescan: {stages['warm_seconds']:.3f}s "
+        f"({result['analysis']['warm']['cache_hits']} files from cache)",
+        f"  rescan after changing {result['changed_files']} files: {stages['incremental_seconds']:.3f}s "
+        f"({result['analysis']['incremental']['files_scanned']} scanned)",
+    ]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the local static analysis engine")
+    parser.add_argument("--files", type=int, default=2000, help="Source files in the generated repository")
+    parser.add_argument("--lines", type=int, default=200, help="Lines per source file")
+    parser.add_argument("--changed", type=float, default=0.01, help="Fraction of files changed before the rescan")
+    parser.add_argument("--workers", type=int, default=static_analysis.ANALYSIS_MAX_WORKERS,
+                        help="Process pool size")
+    parser.add_argument("--output", help="Result file (default: benchmarks/results/static_analysis-<timestamp>.json)")
+    args = parser.parse_args()
+
+    print(f"Benchmarking {args.files} files...", flush=True)
+    result = run_benchmark(args.files, args.lines, args.changed, args.workers)
+    document = {
+        'benchmark': 'static_analysis',
+        'created': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'result': result,
+    }
+    output = args.output or os.path.join(RESULTS_DIR,
+                                         f"static_analysis-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(document, f, indent=2)
+    print("\n".join(format_report(result)))
+    print(f"Results written to {output}")
@@ -150,6 +150,26 @@ async def search_commits(repo_path: str, search_term: str, limit: int = 10) -> L
     return git_utils.search_commits(repo_path=repo_path, search_term=search_term, limit=limit)
 
 
+@mcp.tool()
+async def export_git_datasets(repo_path: str, output_dir: Optional[str] = None,
+                              datasets: Optional[List[str]] = None, file_format: str = "parquet") -> Dict[str, Any]:
+    """
+    Export commit history, churn, contributor and language datasets to Parquet or Arrow files.
+    Only the artifact paths and row counts are returned, not the data itself.
+
+    Args:
+        repo_path: Path to the Git repository
+        output_dir: Root directory for the artifacts (default: new temporary directory)
+        datasets: Datasets to export (history, churn, contributors, languages; default: all)
+        file_format: Output format, either 'parquet' or 'arrow'
+
+    Returns:
+        dict: Repository partition name, output directory and per-dataset artifact paths and row counts
+    """
+    return git_utils.export_datasets(repo_path=repo_path, output_dir=output_dir,
+                                     datasets=datasets, file_format=file_format)
+
+
 @mcp.tool()
 async def cleanup_repository(repo_path: str) -> bool:
     """
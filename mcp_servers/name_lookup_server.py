@@ -7,7 +7,10 @@ Run with: python name_lookup_server.py
 import logging
 import aiohttp
 import asyncio
-from typing import Dict, Any
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, Deque, Dict, List, Optional, Tuple
 import random
 
 import nest_asyncio  # Added import
@@ -20,8 +23,21 @@ from fastmcp import FastMCP
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+
+
+@asynccontextmanager
+async def lifespan(server: FastMCP):
+    """Prefetch names while the server runs and close the pooled HTTP session on shutdown"""
+    reservoir.start()
+    try:
+        yield {}
+    finally:
+        await reservoir.stop()
+        await close_session()
+
+
 # Initialize MCP server
-mcp = FastMCP("name-lookup-tools")
+mcp = FastMCP("name-lookup-tools", lifespan=lifespan)
 
 # API endpoints
 NAMEY_API_BASE = "https://namey.muffinlabs.com/name.json"
@@ -42,44 +58,244 @@ FALLBACK_NAMES_DB = {
 }
 
 
-async def fetch_random_names_from_api(count: int = 5) -> list:
-    """Fetch random names from the Namey API"""
-    names = []
-    try:
-        async with aiohttp.ClientSession() as session:
-            for _ in range(count):
-                # Namey API: get full names with both first and last
-                async with session.get(f"{NAMEY_API_BASE}?frequency=common&count=1") as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        # The API returns a list, get the first (and only) name
-                        if data and len(data) > 0:
-                            names.append(data[0])
-                    await asyncio.sleep(0.1)  # Small delay to be respectful to the API
-    except Exception as e:
-        logger.error(f"Error fetching names from API: {e}")
+# Pooled HTTP client: one keep-alive session per process, reused by every tool call
+HTTP_POOL_SIZE = 10
+HTTP_KEEPALIVE_SECONDS = 30.0
+CONNECT_TIMEOUT = 2.0
+REQUEST_TIMEOUT = 10.0
 
+# Largest count the Namey API returns in one request; larger counts are split into batches
+NAMEY_MAX_BATCH = 10
+
+# Batch requests in flight at once per process
+API_CONCURRENCY = 4
+
+# Namey query parameters of each kind of name
+NAME_PARAMS = {
+    "first": {"type": "first", "frequency": "common"},
+    "full": {"frequency": "common", "with_surname": "true"},
+}
+
+# Prefetched names kept per kind, the size below which a refill starts, and how long a
+# prefetched name may be served
+RESERVOIR_CAPACITY = 50
+RESERVOIR_LOW_WATER = 20
+RESERVOIR_TTL_SECONDS = 600.0
+
+# Seconds between checks for expired names; also the pause after a refill that fetched nothing
+RESERVOIR_CHECK_SECONDS = 30.0
+
+_session: Optional[aiohttp.ClientSession] = None
+_session_loop: Optional[asyncio.AbstractEventLoop] = None
+_request_slots: Optional[asyncio.Semaphore] = None
+
+
+def get_session() -> aiohttp.ClientSession:
+    """
+    Return the process-wide HTTP session, creating it on first use.
+
+    The session and its connection pool belong to the running event loop, so a new one is
+    created when called from a different loop.
+    """
+    global _session, _session_loop, _request_slots
+    loop = asyncio.get_running_loop()
+    if _session is None or _session.closed or _session_loop is not loop:
+        connector = aiohttp.TCPConnector(limit=HTTP_POOL_SIZE, keepalive_timeout=HTTP_KEEPALIVE_SECONDS)
+        timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT, sock_connect=CONNECT_TIMEOUT)
+        _session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+        _session_loop = loop
+        _request_slots = asyncio.Semaphore(API_CONCURRENCY)
+    return _session
+
+
+async def close_session():
+    """Close the process-wide HTTP session and its pooled connections."""
+    global _session, _session_loop, _request_slots
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = _session_loop = _request_slots = None
+
+
+async def _fetch_namey_batch(params: Dict[str, Any], count: int) -> List[str]:
+    """Fetch up to count names in a single Namey request"""
+    session = get_session()
+    async with _request_slots:
+        async with session.get(NAMEY_API_BASE, params={**params, "count": count}) as response:
+            if response.status != 200:
+                logger.warning(f"Namey API returned status {response.status}")
+                return []
+            data = await response.json(content_type=None)
+    return [name for name in data[:count] if isinstance(name, str)] if isinstance(data, list) else []
+
+
+async def fetch_names_from_namey(params: Dict[str, Any], count: int) -> List[str]:
+    """
+    Fetch count names from the Namey API with the pooled session.
+
+    Counts above NAMEY_MAX_BATCH are split into batches that are requested concurrently,
+    at most API_CONCURRENCY at a time; a failed batch is logged and skipped.
+
+    Args:
+        params: Query parameters besides count
+        count: Number of names
+
+    Returns:
+        list: The names received, possibly fewer than count
+    """
+    batches = [min(NAMEY_MAX_BATCH, count - start) for start in range(0, count, NAMEY_MAX_BATCH)]
+    outcomes = await asyncio.gather(*(_fetch_namey_batch(params, size) for size in batches),
+                                    return_exceptions=True)
+    names = []
+    for outcome in outcomes:
+        if isinstance(outcome, BaseException):
+            logger.error(f"Error fetching names from API: {outcome!r}")
+        else:
+            names.extend(outcome)
     return names
 
 
+async def fetch_random_names_from_api(count: int = 5) -> list:
+    """Fetch random full names from the Namey API"""
+    return await fetch_names_from_namey(NAME_PARAMS["full"], count)
+
+
 async def fetch_names_with_surname_from_api(surname: str, count: int = 5) -> list:
     """Generate names with specific surname using random first names from API"""
-    names = []
-    try:
-        async with aiohttp.ClientSession() as session:
-            for _ in range(count):
-                # Get only first names from Namey
-                async with session.get(f"{NAMEY_API_BASE}?type=first&frequency=common&count=1") as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        if data and len(data) > 0:
-                            first_name = data[0]
-                            names.append(f"{first_name} {surname.title()}")
-                    await asyncio.sleep(0.1)  # Small delay to be respectful to the API
-    except Exception as e:
-        logger.error(f"Error fetching first names from API: {e}")
-
-    return names
+    first_names = await fetch_names_from_namey(NAME_PARAMS["first"], count)
+    return [f"{first_name} {surname.title()}" for first_name in first_names]
+
+
+class NameReservoir:
+    """
+    In-memory pools of prefetched names, served without waiting for the API.
+
+    A background task keeps each pool (one per kind in NAME_PARAMS) filled: it tops a pool up
+    to ``capacity`` whenever it drops below ``low_water`` and drops names older than ``ttl``,
+    checking every ``check_interval`` seconds, when the oldest name expires and whenever a call
+    leaves a pool low. Names are served oldest first and each name is served once.
+
+    Args:
+        capacity: Names kept per kind
+        low_water: Pool size below which the pool is refilled
+        ttl: Seconds a prefetched name may be served
+        check_interval: Seconds between background checks
+    """
+
+    def __init__(self, capacity: int = RESERVOIR_CAPACITY, low_water: int = RESERVOIR_LOW_WATER,
+                 ttl: float = RESERVOIR_TTL_SECONDS, check_interval: float = RESERVOIR_CHECK_SECONDS):
+        self.capacity = capacity
+        self.low_water = low_water
+        self.ttl = ttl
+        self.check_interval = check_interval
+        # kind -> (fetched at, name), oldest first
+        self._pools: Dict[str, Deque[Tuple[float, str]]] = {kind: deque() for kind in NAME_PARAMS}
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self.served = 0
+        self.fetched = 0
+        self.expired = 0
+        self.misses = 0
+
+    def start(self):
+        """Start the background refill on the running event loop, if it is not running there yet."""
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._task.get_loop() is not loop:
+            self._wakeup = asyncio.Event()
+            self._task = loop.create_task(self._run(), name="name-reservoir")
+
+    async def stop(self):
+        """Stop the background refill."""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+    def take(self, kind: str, count: int) -> List[str]:
+        """Take up to count fresh names of a kind from the pool, waking the refill when it runs low."""
+        self.start()
+        pool = self._expire(kind)
+        names = [pool.popleft()[1] for _ in range(min(count, len(pool)))]
+        self.served += len(names)
+        if len(pool) < self.low_water:
+            self._wakeup.set()
+        return names
+
+    async def get(self, kind: str, count: int) -> List[str]:
+        """
+        Return count names of a kind, from the pool when it holds enough and from the API
+        for the rest.
+        """
+        names = self.take(kind, count)
+        if len(names) < count:
+            self.misses += 1
+            names.extend(await fetch_names_from_namey(NAME_PARAMS[kind], count - len(names)))
+        return names
+
+    async def refill(self, kind: str) -> int:
+        """Top the pool of a kind up to capacity; returns the number of names added."""
+        pool = self._expire(kind)
+        needed = self.capacity - len(pool)
+        if needed <= 0:
+            return 0
+        names = await fetch_names_from_namey(NAME_PARAMS[kind], needed)
+        fetched_at = time.monotonic()
+        # Concurrent calls may have refilled the pool while this one was fetching
+        added = names[:max(self.capacity - len(pool), 0)]
+        pool.extend((fetched_at, name) for name in added)
+        self.fetched += len(added)
+        return len(added)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the pool sizes and counters."""
+        return {
+            'pools': {kind: len(self._expire(kind)) for kind in self._pools},
+            'capacity': self.capacity,
+            'low_water': self.low_water,
+            'ttl_seconds': self.ttl,
+            'served': self.served,
+            'fetched': self.fetched,
+            'expired': self.expired,
+            'misses': self.misses,
+        }
+
+    def _expire(self, kind: str) -> Deque[Tuple[float, str]]:
+        pool = self._pools[kind]
+        cutoff = time.monotonic() - self.ttl
+        while pool and pool[0][0] < cutoff:
+            pool.popleft()
+            self.expired += 1
+        return pool
+
+    async def _run(self):
+        while True:
+            self._wakeup.clear()
+            added = None
+            for kind in self._pools:
+                if len(self._expire(kind)) < self.low_water:
+                    try:
+                        added = (added or 0) + await self.refill(kind)
+                    except Exception as e:
+                        logger.error(f"Error refilling {kind} names: {e}")
+                        added = added or 0
+            if added == 0:
+                # The API returned nothing: do not retry on every call until the next check
+                await asyncio.sleep(self.check_interval)
+                continue
+            # Check again no later than when the oldest prefetched name expires
+            oldest = min((pool[0][0] for pool in self._pools.values() if pool), default=None)
+            timeout = self.check_interval
+            if oldest is not None:
+                timeout = min(timeout, max(oldest + self.ttl - time.monotonic(), 0.0) + 0.01)
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+
+reservoir = NameReservoir()
 
 
 @mcp.tool()
@@ -87,8 +303,8 @@ async def get_names_by_surname(surname: str) -> str:
     """Get a list of common names for a given surname using free name APIs"""
     logger.info(f"Looking up names for surname: {surname}")
 
-    # First try to get names from API
-    api_names = await fetch_names_with_surname_from_api(surname, 5)
+    # First try prefetched first names, then the API
+    api_names = [f"{first_name} {surname.title()}" for first_name in await reservoir.get("first", 5)]
 
     if api_names:
         return f"Found {len(api_names)} names for '{surname}' from API: {', '.join(api_names)}"
@@ -116,8 +332,8 @@ async def get_random_names(count: int = 5) -> str:
     if count > 10:
         count = 10  # Limit to avoid overwhelming the API
 
-    # Try to get names from API
-    api_names = await fetch_random_names_from_api(count)
+    # Try prefetched names, then the API
+    api_names = await reservoir.get("full", count)
 
     if api_names:
         return f"Found {len(api_names)} random names from API: {', '.join(api_names)}"
@@ -183,6 +399,8 @@ async def get_name_statistics() -> str:
 
         result = f"Name Lookup Service Status: {status}\n"
         result += f"Fallback database contains {fallback_count} names across {len(FALLBACK_NAMES_DB)} surnames\n"
+        pools = reservoir.stats()['pools']
+        result += f"Prefetched names: {pools['full']} full names, {pools['first']} first names\n"
         if api_sample:
             result += api_sample
 
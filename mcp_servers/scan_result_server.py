@@ -1,13 +1,22 @@
 #!/usr/bin/env python3
 """
 Security Scan Results MCP Server (Client)
-Fetches scan results from Flask API server and provides them via MCP tools
+Fetches scan results from Flask API server and provides them via MCP tools.
+A background health monitor routes each call to the Flask server or, while it is down
+or markedly slower, straight to the local fallbacks; results say which one answered
+in "data_source" ("api" or "local")
 """
+import asyncio
+import logging
 import os
 import sys
+import time
 
 import requests
-from typing import Dict, Any
+from requests.adapters import HTTPAdapter
+from typing import Dict, Any, Callable, Iterator, List, Optional
+from urllib3.exceptions import ReadTimeoutError
+from urllib3.util.retry import Retry
 from fastmcp import FastMCP
 
 file_root = os.path.dirname(os.path.abspath(__file__))
@@ -19,41 +28,251 @@ for path in path_list:
     if path not in sys.path:
         sys.path.append(path)
 
-# Initialize FastMCP
-mcp = FastMCP("Security Scan Results MCP Client")
+from utils.json_utils import loads, loads_document, serialize_result, with_fields
+
+# Initialize FastMCP; results decoded from the Flask server are passed through as received
+mcp = FastMCP("Security Scan Results MCP Client", tool_serializer=serialize_result)
 
 # Configuration
 FLASK_SERVER_BASE_URL = "http://localhost:5001"
+HTTP_CACHE_MAXSIZE = 128
+NDJSON_MIMETYPE = "application/x-ndjson"
+
+# Connection pool and timeouts (seconds) for requests to the Flask server
+HTTP_POOL_SIZE = 10
+CONNECT_TIMEOUT = 2.0
+READ_TIMEOUT = 30.0
+
+# Retries for connection errors and transient 5xx answers, with exponential backoff
+HTTP_RETRIES = 2
+HTTP_RETRY_BACKOFF = 0.2
+HTTP_RETRY_STATUSES = (502, 503, 504)
+
+# Per-tool deadlines (seconds) for the fan-out in get_all_scan_results
+TOOL_TIMEOUTS = {
+    "sonar": 10.0,
+    "fortify": 10.0,
+    "nexus": 10.0,
+}
+
+# Background health checks of the Flask server (seconds between probes), consecutive failed
+# calls that mark it unhealthy (opening the circuit), how much slower (ms) it may answer a
+# kind of call than the local fallback before such calls go local, and seconds between
+# calls still sent to it meanwhile to re-measure it
+HEALTH_CHECK_INTERVAL = 5.0
+HEALTH_FAILURE_THRESHOLD = 3
+HEALTH_LATENCY_MARGIN_MS = 250.0
+HEALTH_RETRY_INTERVAL = 30.0
+
+# Longest single long-poll request of wait_for_scan; longer waits are split into several
+STATUS_LONG_POLL_SECONDS = 25.0
 
+from utils.cache import TTLCache
+from utils.health_monitor import LOCAL, REMOTE, HealthMonitor
+from utils.scan_condense import DEFAULT_EXAMPLES, DEFAULT_TOKEN_BUDGET, condense_results
+from utils.scan_status import MAX_WAIT_SECONDS, get_status_tracker
+from utils.dependency_analysis import analyze_dependencies, get_vulnerability_database
+from utils.static_analysis import analyze_repository
+from utils.scan_query import apply_query, has_query, query_nexus_findings as query_nexus_findings_impl
+from utils.scan_store import DEFAULT_DELTA_LIMIT, DEFAULT_TREND_LIMIT, get_scan_store
+from utils.scan_stream import assemble_batch_records, assemble_scan_records, batch_key
+from utils.scan_summary import DEFAULT_TOP_N, summarize_scan
 from utils.scan_results import (get_nexus_scan_results_impl,
                                 get_sonar_scan_results_impl,
                                 get_fortify_scan_results_impl,
-                                get_all_scan_results as get_all_scan_results_impl)
+                                get_all_scan_results as get_all_scan_results_impl,
+                                consolidate_scan_results)
+
+logger = logging.getLogger(__name__)
+
+# Full-result endpoint, identifier parameter and local fallback for each tool
+SCAN_SOURCES = {
+    "sonar": ("/api/scans/sonar", "project_key", get_sonar_scan_results_impl),
+    "fortify": ("/api/scans/fortify", "application_name", get_fortify_scan_results_impl),
+    "nexus": ("/api/scans/nexus", "repository_name", get_nexus_scan_results_impl),
+}
+
+# Summary endpoint, identifier parameter and local fallback for each tool
+SUMMARY_SOURCES = {
+    "sonar": ("/api/scans/sonar/summary", "project_key", get_sonar_scan_results_impl),
+    "fortify": ("/api/scans/fortify/summary", "application_name", get_fortify_scan_results_impl),
+    "nexus": ("/api/scans/nexus/summary", "repository_name", get_nexus_scan_results_impl),
+    "all": ("/api/scans/all/summary", "project_identifier", get_all_scan_results_impl),
+}
+
+# Responses that carried validators, keyed by URL and query parameters. Entries are
+# revalidated with If-None-Match / If-Modified-Since on every request, so they never expire.
+http_cache = TTLCache(maxsize=HTTP_CACHE_MAXSIZE, ttl=None)
+
+
+def _create_session() -> requests.Session:
+    """Create the shared keep-alive session with pooled, retrying connections"""
+    retry = Retry(total=HTTP_RETRIES, connect=HTTP_RETRIES, read=0, backoff_factor=HTTP_RETRY_BACKOFF,
+                  status_forcelist=HTTP_RETRY_STATUSES, allowed_methods=frozenset({"GET"}),
+                  raise_on_status=False)
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=HTTP_POOL_SIZE, max_retries=retry)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+http_session = _create_session()
+
+
+def _probe_flask_server() -> bool:
+    """Background health probe of the health monitor"""
+    response = http_session.get(f"{FLASK_SERVER_BASE_URL}/", timeout=(CONNECT_TIMEOUT, CONNECT_TIMEOUT))
+    return response.ok
+
+
+# Routes each tool call to the Flask server or to the local fallback, and is the circuit
+# breaker of requests to the Flask server: while it is unhealthy they fail immediately.
+# Started on first use.
+flask_health = HealthMonitor("flask-scan-server", probe=_probe_flask_server, interval=HEALTH_CHECK_INTERVAL,
+                             failure_threshold=HEALTH_FAILURE_THRESHOLD, latency_margin_ms=HEALTH_LATENCY_MARGIN_MS,
+                             retry_interval=HEALTH_RETRY_INTERVAL)
+
+
+class ServerUnavailable(Exception):
+    """The Flask server could not be reached, failed (5xx) or is marked unhealthy; callers fall back to local"""
+
+
+class RequestRejected(ValueError):
+    """The Flask server rejected the request (4xx); the message is the server's error"""
 
 
-def _make_api_request(endpoint: str, params: Dict[str, str] = None) -> Dict[str, Any]:
+def _error_message(response: requests.Response) -> str:
+    """The error message of a 4xx answer: its JSON "error" field, else the status line"""
+    try:
+        return str(loads(response.content)["error"])
+    except Exception:
+        return f"HTTP {response.status_code} from Flask server: {response.reason}"
+
+
+class DeadlineExceeded(Exception):
+    """The caller's deadline passed before the Flask server answered"""
+
+
+def _timed_out(error: requests.exceptions.RequestException) -> bool:
+    # With read retries disabled, urllib3 reports read timeouts as a ConnectionError
+    # wrapping a MaxRetryError whose reason is the timeout
+    if isinstance(error, requests.exceptions.Timeout):
+        return True
+    reason = getattr(error.args[0], "reason", None) if error.args else None
+    return isinstance(reason, ReadTimeoutError)
+
+
+def _iter_ndjson_records(response: requests.Response, validators: Dict[str, Any],
+                         deadline: Optional[float] = None) -> Iterator[Dict[str, Any]]:
+    """Parse an NDJSON response line by line, capturing the ETag from its end record"""
+    for line in response.iter_lines():
+        if deadline is not None and time.monotonic() >= deadline:
+            raise DeadlineExceeded("Deadline passed while streaming results from the Flask server")
+        if not line:
+            continue
+        record = loads(line)
+        if record.get("record") == "end" and record.get("etag"):
+            validators["etag"] = f'"{record["etag"]}"'
+        yield record
+
+
+def _make_api_request(endpoint: str, params: Dict[str, str] = None, stream: bool = False,
+                      json_body: Optional[Dict[str, Any]] = None,
+                      assemble: Callable[[Iterator[Dict[str, Any]]], Dict[str, Any]] = assemble_scan_records,
+                      read_timeout: float = READ_TIMEOUT, deadline: Optional[float] = None) -> Dict[str, Any]:
     """
     Make HTTP request to Flask API server
-    
+
+    Responses with an ETag or Last-Modified header are cached; repeat requests are sent
+    as conditional GETs and a 304 Not Modified answer is served from the cache.
+    Requests with a JSON body are sent as uncached POSTs.
+
+    Requests go through the pooled session and the health monitor, which is the circuit
+    breaker: connection errors, timeouts and 5xx answers count as failures, and while the
+    server is marked unhealthy the request fails immediately without contacting it.
+
     Args:
         endpoint: API endpoint path
         params: Query parameters
-        
+        stream: Request streamed NDJSON and assemble the result record by record,
+            instead of downloading and decoding one JSON document
+        json_body: Send a POST with this JSON body instead of a GET
+        assemble: Builds the result from the records of a streamed response
+        read_timeout: Seconds to wait for the server's answer (longer for long polls)
+        deadline: time.monotonic() by which the whole request must complete; the connect
+            and read timeouts are shortened to it, and missing it is not counted as a
+            server failure
+
     Returns:
         JSON response as dictionary
-        
+
     Raises:
-        Exception: If API request fails
+        ServerUnavailable: If the server cannot be reached, answers 5xx or is marked unhealthy
+        RequestRejected: If the server answers 4xx
+        DeadlineExceeded: If the deadline passes first
+        Exception: If API request fails otherwise
     """
+    flask_health.start()
+    if not flask_health.allow_request():
+        raise ServerUnavailable(f"Flask server at {FLASK_SERVER_BASE_URL} is unavailable (circuit open)")
+    connect_timeout = CONNECT_TIMEOUT
+    bounded = False
+    if deadline is not None:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise DeadlineExceeded("Deadline passed before the request to the Flask server was sent")
+        bounded = remaining < max(connect_timeout, read_timeout)
+        connect_timeout, read_timeout = min(connect_timeout, remaining), min(read_timeout, remaining)
     try:
         url = f"{FLASK_SERVER_BASE_URL}{endpoint}"
-        response = requests.get(url, params=params, timeout=30)
-        response.raise_for_status()
-        return response.json()
-    except requests.exceptions.ConnectionError:
-        raise Exception(f"Failed to connect to Flask server at {FLASK_SERVER_BASE_URL}. Make sure the server is running.")
-    except requests.exceptions.Timeout:
-        raise Exception("Request to Flask server timed out")
+        params = {key: value for key, value in (params or {}).items() if value is not None}
+        cache_key = (url, tuple(sorted(params.items())), stream)
+
+        headers = {"Accept": NDJSON_MIMETYPE} if stream else {}
+        cached = http_cache.get(cache_key) if json_body is None else None
+        if cached:
+            if cached["etag"]:
+                headers["If-None-Match"] = cached["etag"]
+            if cached["last_modified"]:
+                headers["If-Modified-Since"] = cached["last_modified"]
+
+        method = "GET" if json_body is None else "POST"
+        with http_session.request(method, url, params=params, json=json_body, headers=headers,
+                                  timeout=(connect_timeout, read_timeout), stream=stream) as response:
+            if response.status_code >= 500:
+                flask_health.record_failure(f"HTTP {response.status_code}")
+                raise ServerUnavailable(f"Flask server answered HTTP {response.status_code}")
+            flask_health.record_success()
+            if response.status_code == 304 and cached:
+                return cached["body"]
+            if response.status_code >= 400:
+                raise RequestRejected(_error_message(response))
+            response.raise_for_status()
+
+            validators = {"etag": response.headers.get("ETag"),
+                          "last_modified": response.headers.get("Last-Modified")}
+            if stream:
+                body = assemble(_iter_ndjson_records(response, validators, deadline))
+            else:
+                body = loads_document(response.content)
+
+        if json_body is None and (validators["etag"] or validators["last_modified"]):
+            http_cache.set(cache_key, {**validators, "body": body})
+        return body
+    except (ServerUnavailable, RequestRejected, DeadlineExceeded):
+        raise
+    except (requests.exceptions.ConnectionError, requests.exceptions.Timeout,
+            requests.exceptions.ChunkedEncodingError) as e:
+        timed_out = _timed_out(e)
+        if bounded and timed_out:
+            # The caller's deadline cut the timeout short; that says nothing about the server
+            raise DeadlineExceeded(f"Deadline passed while waiting for the Flask server: {e}")
+        flask_health.record_failure(e)
+        if timed_out:
+            raise ServerUnavailable("Request to Flask server timed out")
+        raise ServerUnavailable(f"Failed to connect to Flask server at {FLASK_SERVER_BASE_URL}. "
+                                f"Make sure the server is running.")
     except requests.exceptions.HTTPError as e:
         raise Exception(f"HTTP error from Flask server: {e}")
     except requests.exceptions.RequestException as e:
@@ -62,72 +281,589 @@ def _make_api_request(endpoint: str, params: Dict[str, str] = None) -> Dict[str,
         raise Exception(f"Unexpected error: {e}")
 
 
+def _elapsed_ms(started: float) -> float:
+    return (time.perf_counter() - started) * 1000
+
+
+def _route(kind: str, remote: Callable[[], Dict[str, Any]], local: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Answer a call from the source the health monitor picks for its kind: the Flask server
+    (remote) while it is healthy and not markedly slower than the local fallback, else
+    the local fallback directly. A remote call the server cannot answer (transport error,
+    5xx or open circuit) falls back to local as well; errors the server reports for the
+    request itself (4xx) are raised.
+    The result is tagged with "data_source": "api" or "local".
+    """
+    flask_health.start()
+    if flask_health.choose(kind) == REMOTE:
+        started = time.perf_counter()
+        try:
+            results = remote()
+        except ServerUnavailable:
+            # Reported to the monitor by _make_api_request; rejected requests (4xx) and missed
+            # deadlines are not answered locally instead
+            pass
+        else:
+            flask_health.record_latency(kind, REMOTE, _elapsed_ms(started))
+            return with_fields(results, data_source=REMOTE)
+    started = time.perf_counter()
+    results = local()
+    flask_health.record_latency(kind, LOCAL, _elapsed_ms(started))
+    return with_fields(results, data_source=LOCAL)
+
+
+def _query_scan_results(tool: str, endpoint: str, params: Dict[str, Any], query: Dict[str, Any],
+                        fallback: Callable[[], Dict[str, Any]], deadline: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Fetch scan results with server-side filtering, or generate them locally (filtered
+    the same way) when the Flask server is unavailable or slower. A deadline
+    (time.monotonic()) bounds the wait for the server, see _make_api_request.
+    """
+    query = {name: value for name, value in query.items() if value not in (None, "")}
+
+    def local() -> Dict[str, Any]:
+        results = fallback()
+        return apply_query(tool, results, query) if has_query(query) else results
+
+    return _route(tool, lambda: _make_api_request(endpoint, {**params, **query}, stream=True, deadline=deadline),
+                  local)
+
+
 @mcp.tool()
-def get_sonar_scan_results(project_key: str = "default-project") -> Dict[str, Any]:
+def get_sonar_scan_results(project_key: str = "default-project", revision: Optional[str] = None,
+                           severity: Optional[str] = None, issue_type: Optional[str] = None,
+                           component: Optional[str] = None, fields: Optional[str] = None,
+                           cursor: Optional[str] = None, limit: Optional[int] = None) -> Dict[str, Any]:
     """
     Collect SonarQube scan results for code quality and security analysis.
+    Use the filters to fetch only the issues needed; when any filter, fields or limit is
+    given the issues are paginated and "page.next_cursor" fetches the next page.
 
     Args:
         project_key: The project identifier in SonarQube
+        revision: Optional scan revision (default: latest)
+        severity: Comma-separated severities to keep, e.g. "Critical,High"
+        issue_type: Comma-separated issue types to keep, e.g. "Bug,Vulnerability"
+        component: Comma-separated component path fragments to keep, e.g. "Controller.java"
+        fields: Comma-separated issue fields to return, e.g. "key,severity,message"
+        cursor: Cursor from a previous page
+        limit: Maximum number of issues per page
 
     Returns:
         Dictionary containing SonarQube scan results
     """
-    try:
-        return _make_api_request("/api/scans/sonar", {"project_key": project_key})
-    except Exception as e:
-        return get_sonar_scan_results_impl(project_key=project_key)
+    query = {"severity": severity, "type": issue_type, "component": component,
+             "fields": fields, "cursor": cursor, "limit": limit}
+    return _query_scan_results("sonar", "/api/scans/sonar", {"project_key": project_key, "revision": revision},
+                               query, lambda: get_sonar_scan_results_impl(project_key=project_key, revision=revision))
 
 
 @mcp.tool()
-def get_fortify_scan_results(application_name: str = "default-app") -> Dict[str, Any]:
+def get_fortify_scan_results(application_name: str = "default-app", revision: Optional[str] = None,
+                             severity: Optional[str] = None, category: Optional[str] = None,
+                             component: Optional[str] = None, cwe: Optional[str] = None,
+                             fields: Optional[str] = None, cursor: Optional[str] = None,
+                             limit: Optional[int] = None) -> Dict[str, Any]:
     """
     Collect Fortify Static Code Analyzer (SCA) scan results for security vulnerabilities.
+    Use the filters to fetch only the vulnerabilities needed; when any filter, fields or
+    limit is given the vulnerabilities are paginated and "page.next_cursor" fetches the next page.
 
     Args:
         application_name: The application name in Fortify
+        revision: Optional scan revision (default: latest)
+        severity: Comma-separated severities to keep, e.g. "Critical,High"
+        category: Comma-separated categories to keep, e.g. "SQL Injection"
+        component: Comma-separated file path fragments to keep, e.g. "UserController.java"
+        cwe: Comma-separated CWE ids to keep, e.g. "79,89"
+        fields: Comma-separated vulnerability fields to return, e.g. "instance_id,severity,file_path"
+        cursor: Cursor from a previous page
+        limit: Maximum number of vulnerabilities per page
 
     Returns:
         Dictionary containing Fortify scan results
     """
-    try:
-        return _make_api_request("/api/scans/fortify", {"application_name": application_name})
-    except Exception as e:
-        return get_fortify_scan_results_impl(application_name=application_name)
+    query = {"severity": severity, "type": category, "component": component, "cwe": cwe,
+             "fields": fields, "cursor": cursor, "limit": limit}
+    return _query_scan_results("fortify", "/api/scans/fortify",
+                               {"application_name": application_name, "revision": revision}, query,
+                               lambda: get_fortify_scan_results_impl(application_name=application_name,
+                                                                     revision=revision))
 
 
 @mcp.tool()
-def get_nexus_scan_results(repository_name: str = "default-repo") -> Dict[str, Any]:
+def get_nexus_scan_results(repository_name: str = "default-repo", revision: Optional[str] = None,
+                           severity: Optional[str] = None, component_type: Optional[str] = None,
+                           component: Optional[str] = None, min_cvss: Optional[float] = None,
+                           fields: Optional[str] = None, cursor: Optional[str] = None,
+                           limit: Optional[int] = None) -> Dict[str, Any]:
     """
     Collect Nexus IQ scan results for open source component vulnerabilities and license compliance.
+    Use the filters to fetch only the components needed; when any filter, fields or limit is
+    given the components are paginated and "page.next_cursor" fetches the next page.
 
     Args:
         repository_name: The repository name in Nexus IQ
+        revision: Optional scan revision (default: latest)
+        severity: Comma-separated vulnerability severities a component must have, e.g. "Critical"
+        component_type: Comma-separated component types to keep, e.g. "maven,npm"
+        component: Comma-separated package name fragments to keep, e.g. "log4j"
+        min_cvss: Minimum highest CVSS score of a component, e.g. 9.0
+        fields: Comma-separated component fields to return, e.g. "package_name,version,highest_cvss"
+        cursor: Cursor from a previous page
+        limit: Maximum number of components per page
 
     Returns:
         Dictionary containing Nexus IQ scan results
     """
+    query = {"severity": severity, "type": component_type, "component": component, "min_cvss": min_cvss,
+             "fields": fields, "cursor": cursor, "limit": limit}
+    return _query_scan_results("nexus", "/api/scans/nexus",
+                               {"repository_name": repository_name, "revision": revision}, query,
+                               lambda: get_nexus_scan_results_impl(repository_name=repository_name,
+                                                                   revision=revision))
+
+
+async def _collect_tool_results(tool: str, identifier: str, revision: Optional[str], query: Dict[str, Any],
+                                timeout: float) -> Dict[str, Any]:
+    """
+    Fetch one tool's results in a worker thread, giving up after the tool's deadline. The
+    deadline is passed down to the request, so the worker thread stops waiting for the
+    server then as well instead of blocking until READ_TIMEOUT.
+    """
+    endpoint, identifier_param, fallback = SCAN_SOURCES[tool]
+    started = time.perf_counter()
     try:
-        return _make_api_request("/api/scans/nexus", {"repository_name": repository_name})
+        results = await asyncio.wait_for(
+            asyncio.to_thread(_query_scan_results, tool, endpoint,
+                              {identifier_param: identifier, "revision": revision}, query,
+                              lambda: fallback(identifier, revision), time.monotonic() + timeout),
+            timeout)
+        status = {"status": "complete", "data_source": results["data_source"]}
+    except (asyncio.TimeoutError, DeadlineExceeded):
+        results = None
+        status = {"status": "timeout", "error": f"No results within {timeout}s"}
     except Exception as e:
-        return get_nexus_scan_results_impl(repository_name=repository_name)
+        results = None
+        status = {"status": "error", "error": str(e)}
+    status["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    return {"results": results, **status}
+
+
+async def collect_all_scan_results(project_identifier: str, revision: Optional[str] = None,
+                                   query: Optional[Dict[str, Any]] = None,
+                                   timeouts: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+    """
+    Query the Sonar, Fortify and Nexus endpoints concurrently and consolidate whatever
+    finished within each tool's deadline. The "collection" key reports each tool's
+    outcome and whether the consolidated result is complete or partial.
+
+    Args:
+        project_identifier: Common project identifier used across all tools
+        revision: Optional scan revision
+        query: Filter, projection and pagination parameters applied to every tool
+        timeouts: Per-tool deadlines in seconds (default TOOL_TIMEOUTS)
+
+    Returns:
+        Dictionary containing consolidated scan results and collection status
+    """
+    timeouts = {**TOOL_TIMEOUTS, **(timeouts or {})}
+    tools = list(SCAN_SOURCES)
+    outcomes = await asyncio.gather(*(
+        _collect_tool_results(tool, project_identifier, revision, query or {}, timeouts[tool])
+        for tool in tools
+    ))
+    outcomes = dict(zip(tools, outcomes))
+
+    results = consolidate_scan_results(project_identifier,
+                                       {tool: outcome.pop("results") for tool, outcome in outcomes.items()})
+    complete = all(outcome["status"] == "complete" for outcome in outcomes.values())
+    sources = {outcome["data_source"] for outcome in outcomes.values() if "data_source" in outcome}
+    results["data_source"] = sources.pop() if len(sources) == 1 else "mixed" if sources else None
+    results["collection"] = {"status": "complete" if complete else "partial", "tools": outcomes}
+    return results
 
 
 @mcp.tool()
-def get_all_scan_results(project_identifier: str = "default-project") -> Dict[str, Any]:
+async def get_all_scan_results(project_identifier: str = "default-project", revision: Optional[str] = None,
+                               severity: Optional[str] = None, component: Optional[str] = None,
+                               fields: Optional[str] = None, limit: Optional[int] = None,
+                               timeout: Optional[float] = None) -> Dict[str, Any]:
     """
     Collect scan results from all three security tools (Sonar, Fortify, Nexus) for a given project.
+    The tools are queried concurrently, each with its own deadline; tools that miss it are left
+    out and "collection.status" is "partial" (see "collection.tools" for each tool's outcome and
+    data source; "data_source" is "mixed" when some tools were answered locally).
+    The filters apply to every tool's findings; use the single-tool tools to page further.
 
     Args:
         project_identifier: Common project identifier used across all tools
+        revision: Optional scan revision (default: latest)
+        severity: Comma-separated severities to keep, e.g. "Critical,High"
+        component: Comma-separated component, file path or package name fragments to keep
+        fields: Comma-separated finding fields to return
+        limit: Maximum number of findings per tool
+        timeout: Deadline in seconds for every tool (default: per-tool TOOL_TIMEOUTS)
 
     Returns:
         Dictionary containing consolidated scan results from all tools
     """
+    query = {"severity": severity, "component": component, "fields": fields, "limit": limit}
+    timeouts = {tool: timeout for tool in SCAN_SOURCES} if timeout is not None else None
+    return await collect_all_scan_results(project_identifier, revision, query, timeouts)
+
+
+@mcp.tool()
+def get_scan_summary(project_identifier: str = "default-project", tool: str = "all",
+                     revision: Optional[str] = None, top_n: int = DEFAULT_TOP_N) -> Dict[str, Any]:
+    """
+    Get an aggregate-only summary of scan results: counts by severity, type and component,
+    quality gate / policy status and only the top-N worst findings. Prefer this over the full
+    result tools for summary reports and risk assessments.
+
+    Args:
+        project_identifier: Project key, application name or repository name for the tool
+        tool: "sonar", "fortify", "nexus" or "all"
+        revision: Optional scan revision (default: latest)
+        top_n: Number of worst findings to include per tool
+
+    Returns:
+        Dictionary containing the scan summary
+    """
+    if tool not in SUMMARY_SOURCES:
+        raise ValueError(f"Unknown tool '{tool}'. Available tools: {', '.join(SUMMARY_SOURCES)}")
+    endpoint, identifier_param, fallback = SUMMARY_SOURCES[tool]
+    return _route(f"summary:{tool}",
+                  lambda: _make_api_request(endpoint, {identifier_param: project_identifier, "revision": revision,
+                                                       "top_n": top_n}),
+                  lambda: summarize_scan(tool, fallback(project_identifier, revision), top_n))
+
+
+@mcp.tool()
+async def get_condensed_scan_report(project_identifier: str = "default-project", tool: str = "all",
+                                    revision: Optional[str] = None, token_budget: int = DEFAULT_TOKEN_BUDGET,
+                                    examples: int = DEFAULT_EXAMPLES) -> Dict[str, Any]:
+    """
+    Get a compact report of a project's scan results that fits a token budget: status, severity
+    counts, quality gate and policy status per tool, then the findings deduplicated by rule and
+    component, grouped by rule and ranked worst first, each group with a few example locations.
+    Groups that do not fit are counted under "omitted". Prefer this over get_all_scan_results
+    when analyzing or summarizing scan results for a deployment decision.
+
+    Args:
+        project_identifier: Project key, application name or repository name for the tool
+        tool: "sonar", "fortify", "nexus" or "all"
+        revision: Optional scan revision (default: latest)
+        token_budget: Target size of the report in tokens
+        examples: Example locations per finding group
+
+    Returns:
+        Dictionary containing the condensed report
+    """
+    if tool == "all":
+        results = await collect_all_scan_results(project_identifier, revision)
+    elif tool in SCAN_SOURCES:
+        endpoint, identifier_param, fallback = SCAN_SOURCES[tool]
+        results = await asyncio.to_thread(_query_scan_results, tool, endpoint,
+                                          {identifier_param: project_identifier, "revision": revision}, {},
+                                          lambda: fallback(project_identifier, revision))
+    else:
+        raise ValueError(f"Unknown tool '{tool}'. Available tools: all, {', '.join(SCAN_SOURCES)}")
+    fields = {"data_source": results["data_source"]}
+    if "collection" in results:
+        fields["collection"] = {"status": results["collection"]["status"],
+                                "tools": {name: outcome["status"]
+                                          for name, outcome in results["collection"]["tools"].items()}}
+    return await asyncio.to_thread(condense_results, tool, results, token_budget, examples, fields)
+
+
+def _local_batch_project(project_identifier: str, revision: Optional[str], summary_only: bool, top_n: int,
+                         query: Dict[str, Any]) -> Dict[str, Any]:
+    """One project of a batch generated locally, shaped like the server's batch records"""
+    results = get_all_scan_results_impl(project_identifier, revision)
+    if summary_only:
+        return summarize_scan("all", results, top_n)
+    return apply_query("all", results, query) if has_query(query) else results
+
+
+async def _collect_local_batch(projects: List[Dict[str, Any]], summary_only: bool, top_n: int,
+                               query: Dict[str, Any]) -> Dict[str, Any]:
+    """Generate every project of a batch locally and concurrently, recording per-project errors"""
+    outcomes = await asyncio.gather(*(
+        asyncio.to_thread(_local_batch_project, project["project_identifier"], project["revision"],
+                          summary_only, top_n, query)
+        for project in projects
+    ), return_exceptions=True)
+
+    batch = {"projects": {}, "errors": {}}
+    for project, outcome in zip(projects, outcomes):
+        key = batch_key(project["project_identifier"], project["revision"])
+        if isinstance(outcome, Exception):
+            batch["errors"][key] = str(outcome)
+        else:
+            batch["projects"][key] = outcome
+    return batch
+
+
+@mcp.tool()
+async def get_scan_results_batch(project_identifiers: List[str], revision: Optional[str] = None,
+                                 summary_only: bool = True, top_n: int = DEFAULT_TOP_N,
+                                 severity: Optional[str] = None, component: Optional[str] = None,
+                                 fields: Optional[str] = None, limit: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Get consolidated scan results for many projects in one call. The projects are processed
+    concurrently on the server and streamed back as each one finishes. Use this instead of
+    calling get_all_scan_results or get_scan_summary once per project.
+
+    Args:
+        project_identifiers: Common project identifiers used across all tools
+        revision: Optional scan revision for every project (default: latest)
+        summary_only: Return the aggregate-only summary of each project (see get_scan_summary)
+        top_n: Number of worst findings per tool in summaries
+        severity: Comma-separated severities to keep, e.g. "Critical,High" (full results only)
+        component: Comma-separated component, file path or package name fragments to keep (full results only)
+        fields: Comma-separated finding fields to return (full results only)
+        limit: Maximum number of findings per tool and project (full results only)
+
+    Returns:
+        Dictionary with "projects" (results keyed by project identifier, in completion order),
+        "errors" (projects that failed) and "complete" (True when no project failed)
+    """
+    projects = [{"project_identifier": identifier, "revision": revision}
+                for identifier in dict.fromkeys(project_identifiers)]
+    query = {name: value for name, value in
+             {"severity": severity, "component": component, "fields": fields, "limit": limit}.items()
+             if value not in (None, "")}
+    flask_health.start()
+    if flask_health.choose("batch") == REMOTE:
+        started = time.perf_counter()
+        try:
+            batch = await asyncio.to_thread(
+                _make_api_request, "/api/scans/batch", stream=True, assemble=assemble_batch_records,
+                json_body={"projects": projects, "summary": summary_only, "top_n": top_n, **query})
+        except ServerUnavailable:
+            batch = None
+        else:
+            flask_health.record_latency("batch", REMOTE, _elapsed_ms(started))
+            batch["data_source"] = REMOTE
+    else:
+        batch = None
+    if batch is None:
+        started = time.perf_counter()
+        batch = await _collect_local_batch(projects, summary_only, top_n, query)
+        flask_health.record_latency("batch", LOCAL, _elapsed_ms(started))
+        batch["data_source"] = LOCAL
+    batch["complete"] = not batch["errors"]
+    return batch
+
+
+@mcp.tool()
+def query_nexus_findings(repository_name: str = "default-repo", revision: Optional[str] = None,
+                         cve: Optional[str] = None, license: Optional[str] = None,
+                         package: Optional[str] = None, severity: Optional[str] = None,
+                         min_cvss: Optional[float] = None, max_cvss: Optional[float] = None,
+                         cursor: Optional[str] = None, limit: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Look up Nexus IQ vulnerabilities and the components they affect using indexes, e.g. "which
+    components are affected by CVE-2021-44228?", "everything with CVSS >= 9" or "all GPL-3.0
+    components". Returns only the matching components, each with its matching vulnerabilities.
+
+    Args:
+        repository_name: Repository name in Nexus IQ
+        revision: Optional scan revision (default: latest)
+        cve: Comma-separated CVE ids
+        license: Comma-separated license names, e.g. "GPL-3.0,AGPL-3.0"
+        package: Comma-separated exact package names
+        severity: Comma-separated vulnerability severities, e.g. "Critical,High"
+        min_cvss: Minimum CVSS score (inclusive)
+        max_cvss: Maximum CVSS score (inclusive)
+        cursor: next_cursor from a previous call, to fetch the next page
+        limit: Maximum number of components to return
+
+    Returns:
+        Dictionary containing the matching components and match totals
+    """
+    params = {"cve": cve, "license": license, "package": package, "severity": severity,
+              "min_cvss": min_cvss, "max_cvss": max_cvss, "cursor": cursor, "limit": limit}
+    return _route("nexus_findings",
+                  lambda: _make_api_request("/api/scans/nexus/findings", {"repository_name": repository_name,
+                                                                          "revision": revision, **params}),
+                  lambda: query_nexus_findings_impl(get_nexus_scan_results_impl(repository_name, revision),
+                                                    **params))
+
+
+@mcp.tool()
+def get_scan_delta(project_identifier: str = "default-project", tool: str = "all",
+                   revision: Optional[str] = None, base_revision: Optional[str] = None,
+                   limit: int = DEFAULT_DELTA_LIMIT) -> Dict[str, Any]:
+    """
+    Get what changed between two scans of a project: counts of new, fixed and unchanged findings
+    (overall and per severity) plus the worst new and fixed findings. Use this to answer
+    "what is new since the last scan?" instead of comparing full scan results.
+
+    Args:
+        project_identifier: Common project identifier used across all tools
+        tool: "sonar", "fortify", "nexus" or "all"
+        revision: Scan revision to report on (default: latest)
+        base_revision: Revision to compare against; "" for the latest scan
+            (default: the scan recorded before the reported one)
+        limit: Maximum number of new and of fixed findings listed
+
+    Returns:
+        Dictionary containing the scan delta
+    """
+    return _route("delta",
+                  lambda: _make_api_request("/api/scans/delta", {"project_identifier": project_identifier,
+                                                                 "tool": tool, "revision": revision,
+                                                                 "base_revision": base_revision, "limit": limit}),
+                  lambda: get_scan_store().compare_scans(project_identifier, tool, revision, base_revision, limit))
+
+
+@mcp.tool()
+def get_scan_trend(project_identifier: str = "default-project", tool: str = "all",
+                   limit: int = DEFAULT_TREND_LIMIT) -> Dict[str, Any]:
+    """
+    Get per-severity finding counts of a project's recorded scans, oldest first, each with its
+    change against the scan before it.
+
+    Args:
+        project_identifier: Common project identifier used across all tools
+        tool: "sonar", "fortify", "nexus" or "all"
+        limit: Number of most recent scans to include
+
+    Returns:
+        Dictionary containing the trend
+    """
+    return _route("trend",
+                  lambda: _make_api_request("/api/scans/trend", {"project_identifier": project_identifier,
+                                                                 "tool": tool, "limit": limit}),
+                  lambda: get_scan_store().project_trend(project_identifier, tool, limit))
+
+
+def _long_poll_scan_status(project_identifier: str, tool: str, revision: Optional[str], deadline: float
+                           ) -> Dict[str, Any]:
+    """Hold status requests on the Flask server until the scans complete or the deadline passes"""
+    while True:
+        wait = min(max(deadline - time.monotonic(), 0.0), STATUS_LONG_POLL_SECONDS)
+        status = _make_api_request("/api/scans/status", {"project_identifier": project_identifier, "tool": tool,
+                                                         "revision": revision, "wait": round(wait, 3),
+                                                         "until": "complete"},
+                                   read_timeout=wait + READ_TIMEOUT)
+        if status["complete"] or deadline - time.monotonic() <= 0:
+            return status
+        # The server was holding too many requests to hold this one; poll again shortly
+        if "retry_after" in status:
+            time.sleep(min(status.pop("retry_after"), max(deadline - time.monotonic(), 0.0)))
+
+
+@mcp.tool()
+async def wait_for_scan(project_identifier: str = "default-project", tool: str = "all",
+                        revision: Optional[str] = None, timeout: float = 120.0) -> Dict[str, Any]:
+    """
+    Wait until a project's scans have finished ("Completed" or "Failed"), or until the timeout
+    passes, and get their statuses. Use this when scan results report "Queued" or "In Progress"
+    instead of fetching the results again and again; fetch the results once it returns with
+    "complete" true.
+
+    Args:
+        project_identifier: Common project identifier used across all tools
+        tool: "sonar", "fortify", "nexus" or "all"
+        revision: Optional scan revision (default: latest)
+        timeout: Longest time to wait in seconds
+
+    Returns:
+        Dictionary with each tool's status, "complete" (every scan finished) and "timed_out"
+    """
+    if tool != "all" and tool not in SCAN_SOURCES:
+        raise ValueError(f"Unknown tool '{tool}'. Available tools: all, {', '.join(SCAN_SOURCES)}")
+    timeout = float(timeout)
+    if not 0 <= timeout <= MAX_WAIT_SECONDS:
+        raise ValueError(f"timeout must be between 0 and {MAX_WAIT_SECONDS} seconds")
+    deadline = time.monotonic() + timeout
+    flask_health.start()
+    if flask_health.healthy:
+        try:
+            status = await asyncio.to_thread(_long_poll_scan_status, project_identifier, tool, revision, deadline)
+            return with_fields(status, data_source=REMOTE)
+        except ServerUnavailable:
+            pass
+    tools = None if tool == "all" else [tool]
+    status = await asyncio.to_thread(get_status_tracker().wait, project_identifier, revision, tools, "complete",
+                                     None, max(deadline - time.monotonic(), 0.0))
+    return with_fields(status, data_source=LOCAL)
+
+
+@mcp.tool()
+def analyze_repository_code(repo_path: str, project_key: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Run the local static analysis engine over a git repository checkout and get Sonar-shaped
+    results (secrets, dangerous calls and overly complex functions). Files unchanged since a
+    previous analysis are served from cache, so re-analyzing after a commit is fast. The results
+    are recorded, so get_scan_delta and get_scan_trend work on them with tool "sonar".
+
+    Args:
+        repo_path: Path to a local git repository
+        project_key: Project key to report and record the results under (default: the directory name)
+
+    Returns:
+        Dictionary containing the analysis results
+    """
+    try:
+        results = analyze_repository(repo_path, project_key)
+    except ValueError as e:
+        return {"error": True, "message": str(e), "repo_path": repo_path}
     try:
-        return _make_api_request("/api/scans/all", {"project_identifier": project_identifier})
+        get_scan_store().record_scan(results["project_key"], "sonar", results["analysis"]["revision"], results)
     except Exception as e:
-        return get_all_scan_results_impl(project_identifier=project_identifier)
+        logger.warning(f"Could not record analysis of {repo_path}: {e}")
+    return results
+
+
+@mcp.tool()
+def analyze_repository_dependencies(repo_path: str, repository_name: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Find the dependencies declared in a local repository's manifests (requirements.txt,
+    package.json / package-lock.json, pom.xml, go.mod, .csproj, packages.config) and their known
+    vulnerabilities, offline, and get Nexus-shaped results. Vulnerabilities come from the local
+    vulnerability database (see import_vulnerability_data). The results are recorded, so
+    get_scan_delta and get_scan_trend work on them with tool "nexus".
+
+    Args:
+        repo_path: Path to a local repository
+        repository_name: Repository name to report and record the results under (default: the directory name)
+
+    Returns:
+        Dictionary containing the analysis results
+    """
+    try:
+        results = analyze_dependencies(repo_path, repository_name)
+    except ValueError as e:
+        return {"error": True, "message": str(e), "repo_path": repo_path}
+    try:
+        get_scan_store().record_scan(results["repository_name"], "nexus", results["analysis"]["revision"], results)
+    except Exception as e:
+        logger.warning(f"Could not record dependency analysis of {repo_path}: {e}")
+    return results
+
+
+@mcp.tool()
+def import_vulnerability_data(path: str) -> Dict[str, Any]:
+    """
+    Load OSV vulnerability records into the local vulnerability database used by
+    analyze_repository_dependencies, e.g. an ecosystem export from osv.dev (a zip of JSON files),
+    a directory of JSON files or a single JSON file. Records already in the database are replaced.
+
+    Args:
+        path: Path to the OSV records
+
+    Returns:
+        Dictionary with the number of vulnerabilities imported and in the database
+    """
+    if not os.path.exists(path):
+        return {"error": True, "message": f"Path '{path}' does not exist"}
+    database = get_vulnerability_database()
+    imported = database.import_osv_path(path)
+    return {"imported": imported, "vulnerabilities": database.vulnerability_count(), "database": database.path}
 
 
 @mcp.tool()
@@ -136,16 +872,23 @@ def check_flask_server_health() -> Dict[str, Any]:
     Check if the Flask server is running and healthy.
 
     Returns:
-        Dictionary containing server health status
+        Dictionary containing server health status and the health monitor's circuit state and
+        routing state (latencies per source and kind of call, calls routed to each)
     """
+    flask_health.start()
+    # Probe even while the circuit is open: the result updates the monitor, so a recovered
+    # server closes the circuit here rather than at the next background probe
     try:
-        return _make_api_request("/")
+        if not flask_health.check():
+            raise ServerUnavailable(flask_health.last_failure or "Flask server reported unhealthy")
+        return {**_make_api_request("/"), "health_monitor": flask_health.stats()}
     except Exception as e:
         return {
             "error": True,
             "message": str(e),
             "server_url": FLASK_SERVER_BASE_URL,
-            "status": "unhealthy"
+            "status": "unhealthy",
+            "health_monitor": flask_health.stats()
         }
 
 
@@ -157,5 +900,15 @@ if __name__ == "__main__":
     print("  - get_fortify_scan_results")
     print("  - get_nexus_scan_results")
     print("  - get_all_scan_results")
+    print("  - get_scan_summary")
+    print("  - get_condensed_scan_report")
+    print("  - get_scan_results_batch")
+    print("  - query_nexus_findings")
+    print("  - get_scan_delta")
+    print("  - get_scan_trend")
+    print("  - wait_for_scan")
+    print("  - analyze_repository_code")
+    print("  - analyze_repository_dependencies")
+    print("  - import_vulnerability_data")
     print("  - check_flask_server_health")
     mcp.run()
@@ -3,9 +3,15 @@
 Flask Security Scan Results Server
 Provides REST API endpoints to serve dummy scan results from Sonar, Fortify, and Nexus
 """
+import logging
 import os
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
+from functools import partial
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 file_root = os.path.dirname(os.path.abspath(__file__))
 path_list = [
@@ -16,13 +22,269 @@ for path in path_list:
     if path not in sys.path:
         sys.path.append(path)
 
-from flask import Flask, jsonify, request
+from flask import Flask, g, jsonify, request
+from scan_server.json_provider import FastJSONProvider
+from scan_server.responses import (cached_response, conditional_json, event_stream, invalidate_project,
+                                   ndjson_records, ndjson_stream, response_cache, wants_ndjson)
 from utils.scan_results import (get_fortify_scan_results_impl,
                                 get_nexus_scan_results_impl,
                                 get_sonar_scan_results_impl,
-                                get_all_scan_results as get_all_scan_results_impl)
+                                get_all_scan_results as get_all_scan_results_impl,
+                                scan_results_cache)
+from utils.scanners import get_scan_executor, get_scanner, scanners
+from utils.scan_bulk import bulk_results_cache, get_bulk_scan_results, validate_scale
+from utils.scan_query import NEXUS_QUERY_PARAMETERS, QUERY_PARAMETERS, apply_query, has_query, query_nexus_findings
+from utils.scan_store import DEFAULT_DELTA_LIMIT, DEFAULT_TREND_LIMIT, get_scan_store
+from utils.scan_status import MAX_WAIT_SECONDS, get_status_tracker
+from utils.scan_stream import iter_all_scan_records, iter_scan_records
+from utils.scan_summary import DEFAULT_TOP_N, summarize_scan
 
 app = Flask(__name__)
+app.json = FastJSONProvider(app)
+
+# Most projects accepted by one batch request
+BATCH_MAX_PROJECTS = int(os.environ.get("SCAN_BATCH_MAX_PROJECTS", "50"))
+
+# Projects computed concurrently across all batch requests. Batches use their own pool:
+# project results fan out over the shared scanner executor, and waiting on that
+# executor from one of its own threads could deadlock it.
+BATCH_MAX_WORKERS = int(os.environ.get("SCAN_BATCH_MAX_WORKERS", "8"))
+
+_batch_executor = ThreadPoolExecutor(max_workers=BATCH_MAX_WORKERS, thread_name_prefix="scan-batch")
+
+# Scale served when a scan request has no scale parameter; set it to load test clients
+# such as the agents with production-sized results without changing their requests
+DEFAULT_SCAN_SCALE = os.environ.get("SCAN_DEFAULT_SCALE") or None
+
+# Seconds between keep-alive comments on idle status event streams
+STATUS_KEEPALIVE_SECONDS = 15.0
+
+# Longest a status long poll or event stream holds its request thread. Longer waits are
+# served in rounds: the client re-polls, and event stream clients reconnect.
+STATUS_MAX_HOLD_SECONDS = float(os.environ.get("SCAN_STATUS_MAX_HOLD_SECONDS", "25"))
+
+# Status requests held at once per worker process, by default half of the request threads
+# serve.py starts, so held requests never take every thread from other requests. Requests
+# past this are answered at once with a retry_after delay (streams: a reconnect delay).
+STATUS_MAX_HELD_REQUESTS = int(os.environ.get(
+    "SCAN_STATUS_MAX_HELD", str(max(1, int(os.environ.get("SCAN_SERVER_THREADS", "4")) // 2))))
+
+# Seconds a client waits before polling or reconnecting again
+STATUS_RETRY_SECONDS = 2.0
+
+_status_holds = threading.BoundedSemaphore(STATUS_MAX_HELD_REQUESTS)
+
+SCAN_FETCHERS = {
+    "sonar": get_sonar_scan_results_impl,
+    "fortify": get_fortify_scan_results_impl,
+    "nexus": get_nexus_scan_results_impl,
+    "all": get_all_scan_results_impl,
+}
+
+logger = logging.getLogger(__name__)
+
+
+def _latest_scan_id(project_identifier: str) -> int:
+    # Delta and trend responses change with every scan of the project recorded by any process
+    return get_scan_store().latest_scan_id(project_identifier)
+
+
+def _invalidate_status_change(record: Dict[str, Any]):
+    # Cached results report the scan's status, which just changed
+    invalidate_project(record["project_identifier"])
+
+
+get_status_tracker().add_listener(_invalidate_status_change)
+
+# Set once the process has warmed up, cleared again when it starts shutting down
+_ready = threading.Event()
+
+
+def warm_up():
+    """Create the shared scanner executor, open the scan store and prime the result cache, then report ready"""
+    get_scan_executor()
+    get_scan_store()
+    get_all_scan_results_impl("default-project")
+    _ready.set()
+
+
+def mark_not_ready():
+    """Fail the readiness check so load balancers stop routing new requests here"""
+    _ready.clear()
+
+
+@app.before_request
+def _start_timer():
+    g.request_started = time.perf_counter()
+
+
+@app.after_request
+def _log_request_timing(response):
+    # Streamed responses are timed up to the point their headers are sent
+    started = g.pop("request_started", None)
+    if started is not None:
+        duration_ms = (time.perf_counter() - started) * 1000
+        response.headers["Server-Timing"] = f"app;dur={duration_ms:.1f}"
+        logger.info(f"{request.method} {request.full_path.rstrip('?')} {response.status_code} {duration_ms:.1f}ms")
+    return response
+
+
+def _int_arg(name: str, default: int) -> int:
+    value = request.args.get(name, default)
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} must be an integer")
+
+
+def _scan_response(tool: str, results: Dict[str, Any]):
+    """
+    Apply any filter, projection and pagination parameters, then send the results as
+    streamed NDJSON when the client asked for it, otherwise as conditional JSON
+    """
+    last_modified = results["consolidated_scan_date" if tool == "all" else "scan_date"]
+    params = {name: request.args.get(name) for name in QUERY_PARAMETERS}
+    if has_query(params):
+        results = apply_query(tool, results, params)
+
+    if wants_ndjson():
+        if tool == "all":
+            records = partial(iter_all_scan_records, results)
+        else:
+            records = partial(iter_scan_records, tool, results)
+        return ndjson_stream(results, records, last_modified)
+    return conditional_json(results, last_modified)
+
+
+def _summary_response(tool: str, results: Dict[str, Any]):
+    """Send the aggregate-only summary of the results as conditional JSON"""
+    last_modified = results["consolidated_scan_date" if tool == "all" else "scan_date"]
+    return conditional_json(summarize_scan(tool, results, _int_arg('top_n', DEFAULT_TOP_N)), last_modified)
+
+
+def _record_scan(tool: str, project_identifier: str, revision: Optional[str], results: Dict[str, Any]):
+    """Record served results in the scan store; a store failure never fails the request"""
+    try:
+        store = get_scan_store()
+        if tool == "all":
+            store.record_consolidated(project_identifier, revision, results)
+        else:
+            store.record_scan(project_identifier, tool, revision, results)
+    except Exception as e:
+        logger.warning(f"Could not record {tool} scan of {project_identifier}: {e}")
+
+
+def _scan_results(tool: str, identifier: str, revision: Optional[str]) -> Dict[str, Any]:
+    """
+    The requested scan results: bulk results with the scale parameter's number of findings
+    or components per tool when it is given (or SCAN_DEFAULT_SCALE is set), otherwise the
+    regular results, which are recorded in the scan store and report the scan's live status.
+    Bulk results are load test data and are neither recorded nor tracked.
+    """
+    scale = request.args.get('scale', DEFAULT_SCAN_SCALE)
+    if scale not in (None, ""):
+        return get_bulk_scan_results(tool, identifier, revision, validate_scale(scale))
+    results = SCAN_FETCHERS[tool](identifier, revision)
+    _record_scan(tool, identifier, revision, results)
+    return get_status_tracker().apply(tool, identifier, revision, results)
+
+
+def _status_tools(tool: str) -> Optional[List[str]]:
+    """Tools of a status request: None (every scanner) for "all", else the one validated tool"""
+    return None if tool == "all" else [get_scanner(tool).name]
+
+
+def _float_arg(name: str, default: float) -> float:
+    value = request.args.get(name, default)
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} must be a number")
+
+
+def _parse_batch_request(body: Any) -> Tuple[List[Tuple[str, Optional[str]]], Dict[str, Any]]:
+    """
+    Validate a batch request body.
+
+    Returns:
+        tuple: Unique (project_identifier, revision) pairs in request order, and the
+        options applied to every project (summary, top_n and query parameters)
+
+    Raises:
+        ValueError: If the body is malformed
+    """
+    if not isinstance(body, dict):
+        raise ValueError("Request body must be a JSON object")
+    projects = body.get("projects")
+    if not isinstance(projects, list) or not projects:
+        raise ValueError("projects must be a non-empty list")
+    if len(projects) > BATCH_MAX_PROJECTS:
+        raise ValueError(f"At most {BATCH_MAX_PROJECTS} projects may be requested at once")
+
+    default_revision = body.get("revision")
+    pairs = []
+    for project in projects:
+        if isinstance(project, str):
+            project = {"project_identifier": project}
+        if not isinstance(project, dict) or not isinstance(project.get("project_identifier"), str) \
+                or not project["project_identifier"]:
+            raise ValueError("Each project must be an identifier or an object with a project_identifier")
+        pair = (project["project_identifier"], project.get("revision", default_revision))
+        if pair not in pairs:
+            pairs.append(pair)
+
+    if body.get("cursor") not in (None, ""):
+        raise ValueError("cursor is only supported on single-tool endpoints")
+    top_n = body.get("top_n", DEFAULT_TOP_N)
+    if isinstance(top_n, bool) or not isinstance(top_n, int):
+        raise ValueError("top_n must be an integer")
+    options = {
+        "summary": bool(body.get("summary", False)),
+        "top_n": top_n,
+        # Query parameters arrive as JSON values; the query layer parses them like URL arguments
+        "query": {name: str(body[name]) for name in QUERY_PARAMETERS if body.get(name) not in (None, "")},
+    }
+    return pairs, options
+
+
+def _batch_project(project_identifier: str, revision: Optional[str], options: Dict[str, Any]) -> Dict[str, Any]:
+    """Consolidated results (queried) or summary of one project in a batch"""
+    results = get_all_scan_results_impl(project_identifier=project_identifier, revision=revision)
+    _record_scan("all", project_identifier, revision, results)
+    if options["summary"]:
+        return summarize_scan("all", results, options["top_n"])
+    if options["query"]:
+        return apply_query("all", results, options["query"])
+    return results
+
+
+def _iter_batch_records(pairs: List[Tuple[str, Optional[str]]], options: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """
+    Compute every project concurrently and yield one record per project as it
+    finishes, then an "end" record. Projects not yet started are cancelled if the
+    client goes away.
+    """
+    futures = {
+        _batch_executor.submit(_batch_project, project_identifier, revision, options): (project_identifier, revision)
+        for project_identifier, revision in pairs
+    }
+    failed = 0
+    try:
+        for future in as_completed(futures):
+            project_identifier, revision = futures[future]
+            try:
+                data = future.result()
+            except Exception as e:
+                failed += 1
+                yield {"record": "project_error", "project_identifier": project_identifier,
+                       "revision": revision, "error": str(e)}
+            else:
+                yield {"record": "project", "project_identifier": project_identifier,
+                       "revision": revision, "data": data}
+        yield {"record": "end", "projects": len(pairs), "failed": failed}
+    finally:
+        for future in futures:
+            future.cancel()
 
 
 # Flask API Routes
@@ -36,46 +298,314 @@ def health_check():
     })
 
 
+@app.route('/ready', methods=['GET'])
+def readiness_check():
+    """Readiness endpoint: 200 once warmed up, 503 before that and while shutting down"""
+    ready = _ready.is_set()
+    return jsonify({
+        "status": "ready" if ready else "not ready",
+        "scanners": [adapter.name for adapter in scanners()],
+        "pid": os.getpid(),
+        "timestamp": datetime.now().isoformat()
+    }), 200 if ready else 503
+
+
 @app.route('/api/scans/sonar', methods=['GET'])
+@cached_response('project_key', 'default-project')
 def get_sonar_results():
     """Get SonarQube scan results"""
     project_key = request.args.get('project_key', 'default-project')
+    revision = request.args.get('revision')
     try:
-        results = get_sonar_scan_results_impl(project_key)
-        return jsonify(results)
+        results = _scan_results("sonar", project_key, revision)
+        return _scan_response("sonar", results)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
 @app.route('/api/scans/fortify', methods=['GET'])
+@cached_response('application_name', 'default-app')
 def get_fortify_results():
     """Get Fortify scan results"""
     application_name = request.args.get('application_name', 'default-app')
+    revision = request.args.get('revision')
     try:
-        results = get_fortify_scan_results_impl(application_name)
-        return jsonify(results)
+        results = _scan_results("fortify", application_name, revision)
+        return _scan_response("fortify", results)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
 @app.route('/api/scans/nexus', methods=['GET'])
+@cached_response('repository_name', 'default-repo')
 def get_nexus_results():
     """Get Nexus IQ scan results"""
     repository_name = request.args.get('repository_name', 'default-repo')
+    revision = request.args.get('revision')
     try:
-        results = get_nexus_scan_results_impl(repository_name)
-        return jsonify(results)
+        results = _scan_results("nexus", repository_name, revision)
+        return _scan_response("nexus", results)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
 @app.route('/api/scans/all', methods=['GET'])
+@cached_response('project_identifier', 'default-project')
 def get_all_results():
     """Get consolidated scan results from all tools"""
     project_identifier = request.args.get('project_identifier', 'default-project')
+    revision = request.args.get('revision')
+
+    try:
+        results = _scan_results("all", project_identifier, revision)
+        return _scan_response("all", results)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route('/api/scans/nexus/findings', methods=['GET'])
+@cached_response('repository_name', 'default-repo')
+def get_nexus_findings():
+    """Look up Nexus vulnerabilities by CVE, license, package, severity or CVSS range"""
+    repository_name = request.args.get('repository_name', 'default-repo')
+    revision = request.args.get('revision')
+    try:
+        results = _scan_results("nexus", repository_name, revision)
+        params = {name: request.args.get(name) for name in NEXUS_QUERY_PARAMETERS}
+        return conditional_json(query_nexus_findings(results, **params), results["scan_date"])
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route('/api/scans/sonar/summary', methods=['GET'])
+@cached_response('project_key', 'default-project')
+def get_sonar_summary():
+    """Get aggregate counts and the worst SonarQube findings"""
+    project_key = request.args.get('project_key', 'default-project')
+    revision = request.args.get('revision')
+    try:
+        results = _scan_results("sonar", project_key, revision)
+        return _summary_response("sonar", results)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route('/api/scans/fortify/summary', methods=['GET'])
+@cached_response('application_name', 'default-app')
+def get_fortify_summary():
+    """Get aggregate counts and the worst Fortify findings"""
+    application_name = request.args.get('application_name', 'default-app')
+    revision = request.args.get('revision')
+    try:
+        results = _scan_results("fortify", application_name, revision)
+        return _summary_response("fortify", results)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route('/api/scans/nexus/summary', methods=['GET'])
+@cached_response('repository_name', 'default-repo')
+def get_nexus_summary():
+    """Get aggregate counts and the worst Nexus IQ components"""
+    repository_name = request.args.get('repository_name', 'default-repo')
+    revision = request.args.get('revision')
+    try:
+        results = _scan_results("nexus", repository_name, revision)
+        return _summary_response("nexus", results)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route('/api/scans/all/summary', methods=['GET'])
+@cached_response('project_identifier', 'default-project')
+def get_all_summary():
+    """Get aggregate counts and the worst findings from all tools"""
+    project_identifier = request.args.get('project_identifier', 'default-project')
+    revision = request.args.get('revision')
+    try:
+        results = _scan_results("all", project_identifier, revision)
+        return _summary_response("all", results)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route('/api/scans/delta', methods=['GET'])
+@cached_response('project_identifier', 'default-project', validator=_latest_scan_id)
+def get_scan_delta():
+    """
+    Get the findings that are new, fixed and unchanged in a scan compared with a base scan
+    (by default the previously recorded scan of the same project and tool)
+    """
+    project_identifier = request.args.get('project_identifier', 'default-project')
+    tool = request.args.get('tool', 'all')
+    revision = request.args.get('revision')
+    # An empty base_revision compares against the latest scan
+    base_revision = request.args.get('base_revision')
+    try:
+        limit = _int_arg('limit', DEFAULT_DELTA_LIMIT)
+        return conditional_json(get_scan_store().compare_scans(project_identifier, tool, revision, base_revision,
+                                                               limit))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route('/api/scans/trend', methods=['GET'])
+@cached_response('project_identifier', 'default-project', validator=_latest_scan_id)
+def get_scan_trend():
+    """Get per-severity finding counts of a project's recorded scans, oldest first"""
+    project_identifier = request.args.get('project_identifier', 'default-project')
+    tool = request.args.get('tool', 'all')
+    try:
+        limit = _int_arg('limit', DEFAULT_TREND_LIMIT)
+        return conditional_json(get_scan_store().project_trend(project_identifier, tool, limit))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route('/api/scans/status', methods=['GET'])
+def get_scan_status():
+    """
+    Get the live status of a project's scans. With wait=<seconds> the request is held
+    (long poll) until every scan is complete, or with until=change until a status differs
+    from the since=<state> token of an earlier response, or until the wait passes. A request
+    is held at most STATUS_MAX_HOLD_SECONDS, so longer waits return "timed_out" and the
+    client polls again. When too many requests are held already, the status is returned at
+    once with "retry_after", the seconds to wait before polling again.
+    """
+    project_identifier = request.args.get('project_identifier', 'default-project')
+    revision = request.args.get('revision')
+    try:
+        tools = _status_tools(request.args.get('tool', 'all'))
+        tracker = get_status_tracker()
+        wait = _float_arg('wait', 0.0)
+        if wait > MAX_WAIT_SECONDS:
+            raise ValueError(f"wait must be between 0 and {MAX_WAIT_SECONDS} seconds")
+        retry_after = None
+        if wait > 0:
+            held = _status_holds.acquire(blocking=False)
+            try:
+                status = tracker.wait(project_identifier, revision, tools, request.args.get('until', 'complete'),
+                                      request.args.get('since'), min(wait, STATUS_MAX_HOLD_SECONDS) if held else 0.0)
+            finally:
+                if held:
+                    _status_holds.release()
+            if not held and status["timed_out"]:
+                retry_after = status["retry_after"] = STATUS_RETRY_SECONDS
+        else:
+            status = tracker.project_status(project_identifier, revision, tools)
+            status.pop("next_change")
+        response = jsonify(status)
+        response.headers["Cache-Control"] = "no-store"
+        if retry_after is not None:
+            response.headers["Retry-After"] = str(int(retry_after))
+        return response
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route('/api/scans/status/events', methods=['GET'])
+def get_scan_status_events():
+    """
+    Stream the live status of a project's scans as server-sent events: a "status" event now
+    and on every change, then "complete" once every scan has finished, or "timeout" when
+    timeout=<seconds> passes first. A stream lasts at most STATUS_MAX_HOLD_SECONDS (longer
+    timeouts are shortened to it) and sets a reconnect delay, so EventSource clients keep
+    watching by reconnecting. When too many requests are held already, the stream ends after
+    the first "status" event.
+    """
+    project_identifier = request.args.get('project_identifier', 'default-project')
+    revision = request.args.get('revision')
+    try:
+        tools = _status_tools(request.args.get('tool', 'all'))
+        timeout = _float_arg('timeout', STATUS_MAX_HOLD_SECONDS)
+        if not 0 < timeout <= MAX_WAIT_SECONDS:
+            raise ValueError(f"timeout must be between 0 and {MAX_WAIT_SECONDS} seconds")
+        timeout = min(timeout, STATUS_MAX_HOLD_SECONDS)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    tracker = get_status_tracker()
+
+    def events():
+        status = tracker.project_status(project_identifier, revision, tools)
+        status.pop("next_change")
+        yield "status", status
+        if status["complete"]:
+            yield "complete", status
+            return
+        # Taken inside the generator, so the slot is released however the stream ends
+        if not _status_holds.acquire(blocking=False):
+            return
+        try:
+            yield from watch(status)
+        finally:
+            _status_holds.release()
+
+    def watch(status):
+        deadline = time.monotonic() + timeout
+        while not status["complete"]:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                yield "timeout", status
+                return
+            changed = tracker.wait(project_identifier, revision, tools, "change", status["state"],
+                                   min(remaining, STATUS_KEEPALIVE_SECONDS))
+            if changed["timed_out"]:
+                yield None
+            else:
+                status = changed
+                yield "status", status
+        yield "complete", status
+
+    return event_stream(events(), retry=STATUS_RETRY_SECONDS)
+
+
+@app.route('/metrics', methods=['GET'])
+def get_metrics():
+    """Hit ratios and sizes of this worker process's response and result caches"""
+    return jsonify({
+        "pid": os.getpid(),
+        "response_cache": response_cache.stats(),
+        "scan_results_cache": scan_results_cache.stats(),
+        "bulk_results_cache": bulk_results_cache.stats(),
+        "timestamp": datetime.now().isoformat()
+    })
+
 
+@app.route('/api/scans/batch', methods=['POST'])
+def get_batch_results():
+    """
+    Get consolidated results (or summaries) for many projects at once, streamed as
+    NDJSON records in the order the projects finish
+    """
     try:
-        return jsonify(get_all_scan_results_impl(project_identifier=project_identifier))
+        pairs, options = _parse_batch_request(request.get_json(silent=True))
+        return ndjson_records(_iter_batch_records(pairs, options))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -93,8 +623,37 @@ def internal_error(error):
 if __name__ == "__main__":
     print("Starting Security Scan Results Flask Server...")
     print("Available endpoints:")
-    print("  GET /api/scans/sonar?project_key=<key>")
-    print("  GET /api/scans/fortify?application_name=<name>")
-    print("  GET /api/scans/nexus?repository_name=<name>")
-    print("  GET /api/scans/all?project_identifier=<identifier>")
-    app.run(debug=True, host='0.0.0.0', port=5001)
+    print("  GET /api/scans/sonar?project_key=<key>[&revision=<revision>]")
+    print("  GET /api/scans/fortify?application_name=<name>[&revision=<revision>]")
+    print("  GET /api/scans/nexus?repository_name=<name>[&revision=<revision>]")
+    print("  GET /api/scans/all?project_identifier=<identifier>[&revision=<revision>]")
+    print("Scan endpoints accept severity, type, component, cwe, min_cvss, fields, cursor and limit")
+    print("to filter, project and paginate findings")
+    print("Scan endpoints accept format=ndjson (or Accept: application/x-ndjson) for streamed results")
+    print("and gzip/zstd Accept-Encoding for compressed responses")
+    print("  GET /api/scans/nexus/findings?repository_name=<name>[&revision=<revision>][&cve=<ids>][&license=<names>]"
+          "[&package=<names>][&severity=<levels>][&min_cvss=<score>][&max_cvss=<score>][&cursor=<c>][&limit=<n>]")
+    print("  GET /api/scans/<tool>/summary?<identifier>[&revision=<revision>][&top_n=<n>]")
+    print("Summary endpoints return counts by severity, type and component plus the top-N worst findings")
+    print("Scan, summary and findings endpoints accept scale=<n> for generated load test results with n findings")
+    print("or components per tool (default SCAN_DEFAULT_SCALE); these are not recorded in the scan store")
+    print("  POST /api/scans/batch {\"projects\": [<identifier>, ...][, \"summary\": true][, \"top_n\": <n>]}")
+    print("Batch requests stream one NDJSON record per project as each project finishes")
+    print("  GET /api/scans/delta?project_identifier=<identifier>[&tool=<tool>][&revision=<revision>]"
+          "[&base_revision=<revision>][&limit=<n>]")
+    print("  GET /api/scans/trend?project_identifier=<identifier>[&tool=<tool>][&limit=<n>]")
+    print("Served scans are recorded in the scan store; delta and trend are computed from recorded scans")
+    print("GET responses are cached encoded per worker (SCAN_RESPONSE_CACHE_BYTES, SCAN_RESPONSE_CACHE_TTL)")
+    print("until a new scan of the project is recorded")
+    print("  GET /metrics (cache hit ratios and sizes)")
+    print("  GET /api/scans/status?project_identifier=<identifier>[&tool=<tool>][&revision=<revision>]"
+          "[&wait=<seconds>][&until=complete|change][&since=<state>]")
+    print("  GET /api/scans/status/events?project_identifier=<identifier>[&tool=<tool>][&revision=<revision>]"
+          "[&timeout=<seconds>]")
+    print("Status requests with wait long-poll until the scans complete; status events stream changes (SSE)")
+    print("  GET /ready (readiness check)")
+    print("Development server only; use scan_server/serve.py for multi-worker production serving")
+    logging.basicConfig(level=logging.INFO)
+    warm_up()
+    app.run(debug=os.environ.get("SCAN_SERVER_DEBUG", "").lower() in ("1", "true", "yes"),
+            host='0.0.0.0', port=5001, threaded=True)
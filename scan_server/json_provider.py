@@ -0,0 +1,37 @@
+"""
+Flask JSON provider backed by utils.json_utils
+Encodes with orjson when it is installed, and exposes dumps_bytes so responses can
+be built from encoded bytes without a str round trip
+"""
+from typing import Any, Union
+
+from flask.json.provider import DefaultJSONProvider
+
+from utils import json_utils
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    JSON provider that encodes with orjson when available. Keys keep their insertion
+    order (no sorting), and values orjson does not support go through Flask's default
+    conversions (dates, decimals, UUIDs, dataclasses). Calls with extra json.dumps
+    options such as indent use the standard library provider.
+    """
+
+    sort_keys = False
+
+    def dumps_bytes(self, obj: Any, **kwargs: Any) -> bytes:
+        # jsonify asks for compact separators, which is what orjson produces anyway
+        if kwargs.get("separators") == (",", ":"):
+            kwargs.pop("separators")
+        if kwargs:
+            return super().dumps(obj, **kwargs).encode("utf-8")
+        return json_utils.dumps(obj, default=self.default)
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return self.dumps_bytes(obj, **kwargs).decode("utf-8")
+
+    def loads(self, s: Union[str, bytes], **kwargs: Any) -> Any:
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return json_utils.loads(s)
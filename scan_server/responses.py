@@ -0,0 +1,385 @@
+"""
+Response helpers for the Flask scan server
+Conditional (ETag / Last-Modified) JSON responses, gzip/zstd content negotiation,
+streamed NDJSON responses, server-sent events and a cache of encoded response bodies
+"""
+import functools
+import hashlib
+import os
+import zlib
+from datetime import datetime
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, NamedTuple, Optional, Tuple
+
+from flask import Response, current_app, g, request
+from werkzeug.http import is_resource_modified
+
+from utils.cache import ByteLRUCache, TTLCache, get_derived, store_derived
+
+try:
+    import zstandard
+except ImportError:  # zstd is only offered when the zstandard package is installed
+    zstandard = None
+
+# Scan responses may be stored by any cache but must be revalidated with the
+# server (ETag / Last-Modified) before reuse
+SCAN_CACHE_CONTROL = "public, no-cache"
+
+NDJSON_MIMETYPE = "application/x-ndjson"
+EVENT_STREAM_MIMETYPE = "text/event-stream"
+
+# Bodies smaller than this are not worth compressing
+COMPRESSION_MIN_BYTES = 1024
+
+# Streamed responses flush the compressor after this many uncompressed bytes
+STREAM_FLUSH_BYTES = 64 * 1024
+
+# ETags of completed NDJSON streams, keyed by the result object they were computed from
+# (see utils.cache.store_derived) plus the request path and arguments
+STREAM_ETAG_CACHE_MAXSIZE = 256
+STREAM_ETAG_CACHE_TTL = 300
+
+stream_etags = TTLCache(maxsize=STREAM_ETAG_CACHE_MAXSIZE, ttl=STREAM_ETAG_CACHE_TTL)
+
+# Encoded (serialized and compressed) bodies of GET responses, keyed by endpoint, normalized
+# query parameters and representation, bounded by their total size. Entries are tagged with
+# the project they were computed from and dropped when the status of one of its scans changes.
+RESPONSE_CACHE_MAX_BYTES = int(os.environ.get("SCAN_RESPONSE_CACHE_BYTES", 256 * 2 ** 20))
+RESPONSE_CACHE_MAX_ENTRY_BYTES = int(os.environ.get("SCAN_RESPONSE_CACHE_MAX_ENTRY_BYTES", 32 * 2 ** 20))
+RESPONSE_CACHE_TTL = float(os.environ.get("SCAN_RESPONSE_CACHE_TTL", 60))
+
+response_cache = ByteLRUCache(max_bytes=RESPONSE_CACHE_MAX_BYTES, ttl=RESPONSE_CACHE_TTL,
+                              max_entry_bytes=RESPONSE_CACHE_MAX_ENTRY_BYTES)
+
+
+class CachedBody(NamedTuple):
+    """An encoded response body with the headers needed to serve it again"""
+    body: bytes
+    mimetype: str
+    encoding: Optional[str]
+    etag: str
+    last_modified: Optional[str]
+
+
+def negotiate_encoding() -> Optional[str]:
+    """Pick the best content encoding the client accepts (zstd preferred over gzip)."""
+    offered = ["zstd", "gzip"] if zstandard is not None else ["gzip"]
+    return request.accept_encodings.best_match(offered)
+
+
+def wants_ndjson() -> bool:
+    """Whether the client asked for NDJSON via ?format=ndjson or the Accept header."""
+    if request.args.get("format") == "ndjson":
+        return True
+    return request.accept_mimetypes.best_match(["application/json", NDJSON_MIMETYPE]) == NDJSON_MIMETYPE
+
+
+def _compressor(encoding: str):
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor().compressobj()
+    return zlib.compressobj(6, zlib.DEFLATED, 31)
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    """Compress a complete body with the given content encoding."""
+    compressor = _compressor(encoding)
+    return compressor.compress(data) + compressor.flush()
+
+
+def iter_compressed(chunks: Iterable[bytes], encoding: str) -> Iterator[bytes]:
+    """Compress a stream of chunks, flushing periodically so clients can decode incrementally."""
+    compressor = _compressor(encoding)
+    sync_flush = zstandard.COMPRESSOBJ_FLUSH_BLOCK if encoding == "zstd" else zlib.Z_SYNC_FLUSH
+    pending = 0
+    for chunk in chunks:
+        output = compressor.compress(chunk)
+        pending += len(chunk)
+        if pending >= STREAM_FLUSH_BYTES:
+            output += compressor.flush(sync_flush)
+            pending = 0
+        if output:
+            yield output
+    yield compressor.flush()
+
+
+def bytes_encoder() -> Callable[[Any], bytes]:
+    """
+    The app's JSON encoder to bytes, straight from the provider when it supports that.
+    Resolve it in the request; streaming generators run after the app context is gone.
+    """
+    provider = current_app.json
+    if hasattr(provider, "dumps_bytes"):
+        return provider.dumps_bytes
+    return lambda payload: provider.dumps(payload).encode("utf-8")
+
+
+def dumps_bytes(payload: Any) -> bytes:
+    """Encode a payload with the app's JSON provider, straight to bytes when it supports that."""
+    return bytes_encoder()(payload)
+
+
+def _representation_etag(digest: str, encoding: Optional[str]) -> str:
+    # Compressed representations have different bytes, so they get their own strong ETag
+    return f"{digest}-{encoding}" if encoding else digest
+
+
+def _set_cache_headers(response: Response, last_modified: Optional[str]):
+    if last_modified:
+        response.last_modified = datetime.fromisoformat(last_modified)
+    response.headers["Cache-Control"] = SCAN_CACHE_CONTROL
+    response.vary.add("Accept-Encoding")
+
+
+def _response_cache_key() -> Tuple[Hashable, ...]:
+    # Parameter order and empty parameters do not change a response; format=ndjson and the
+    # Accept header select the same representation
+    params = tuple(sorted((name, value) for name, value in request.args.items(multi=True)
+                          if value != "" and name != "format"))
+    return request.path, params, wants_ndjson(), negotiate_encoding()
+
+
+def cached_response(identifier_param: str, default_identifier: str,
+                    validator: Optional[Callable[[str], Hashable]] = None) -> Callable:
+    """
+    Serve a GET view from response_cache when an entry for the request is cached, otherwise
+    run it and let conditional_json / ndjson_stream store the encoded body. Entries are
+    tagged with the project identifier parameter, so invalidate_project drops them.
+    Error responses are never cached.
+
+    Args:
+        identifier_param: Query parameter holding the project identifier
+        default_identifier: Identifier the view uses when the parameter is missing
+        validator: Called with the project identifier, returns a value that is part of
+            the cache key, for responses that depend on state shared between processes
+            (such as the scans recorded in the scan store). The value is read again after
+            the view has run, so a response is stored under the state it was computed from.
+    """
+
+    def decorator(view: Callable) -> Callable:
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            identifier = request.args.get(identifier_param, default_identifier)
+            base_key = _response_cache_key()
+
+            def entry_key() -> Hashable:
+                return base_key if validator is None else (*base_key, validator(identifier))
+
+            key = entry_key()
+            cached = response_cache.get(key)
+            if cached is not None:
+                response = cached_body_response(cached)
+                response.headers["X-Cache"] = "HIT"
+                return response
+            tags = (identifier,)
+            g.response_cache_entry = (entry_key, tags, response_cache.version(tags))
+            response = view(*args, **kwargs)
+            g.pop("response_cache_entry", None)
+            if isinstance(response, Response):
+                response.headers["X-Cache"] = "MISS"
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+def invalidate_project(project_identifier: str) -> int:
+    """Drop every cached response computed for the project; returns the number dropped."""
+    return response_cache.invalidate(project_identifier)
+
+
+def _store_cached_body(entry: Tuple[Callable[[], Hashable], Tuple[Hashable, ...], Tuple[int, ...]],
+                       cached: CachedBody) -> bool:
+    key, tags, version = entry
+    return response_cache.set(key(), cached, len(cached.body), tags, version)
+
+
+def cached_body_response(cached: CachedBody) -> Response:
+    """Build a response from an encoded body, answering 304 when the request's validators match."""
+    response = current_app.response_class(cached.body, mimetype=cached.mimetype)
+    if cached.encoding:
+        response.headers["Content-Encoding"] = cached.encoding
+    response.set_etag(cached.etag)
+    _set_cache_headers(response, cached.last_modified)
+    return response.make_conditional(request)
+
+
+def conditional_json(payload: Dict[str, Any], last_modified: Optional[str] = None) -> Response:
+    """
+    Build a JSON response with a strong ETag, Last-Modified and Cache-Control headers,
+    answering 304 Not Modified when the request's If-None-Match / If-Modified-Since match.
+    Bodies are compressed with the negotiated content encoding, and stored in the
+    response cache when the view is wrapped with cached_response.
+
+    Args:
+        payload: Response payload
+        last_modified: ISO-8601 timestamp of the underlying scan
+
+    Returns:
+        Flask response (200 with body, or 304 without)
+    """
+    data = dumps_bytes(payload) + b"\n"
+    encoding = negotiate_encoding() if len(data) >= COMPRESSION_MIN_BYTES else None
+    etag = _representation_etag(hashlib.sha256(data).hexdigest(), encoding)
+
+    entry = g.pop("response_cache_entry", None)
+    if entry is not None:
+        cached = CachedBody(compress(data, encoding) if encoding else data, "application/json", encoding, etag,
+                            last_modified)
+        _store_cached_body(entry, cached)
+        return cached_body_response(cached)
+
+    response = current_app.response_class(data, mimetype="application/json")
+    response.set_etag(etag)
+    _set_cache_headers(response, last_modified)
+    response = response.make_conditional(request)
+
+    if encoding and response.status_code == 200:
+        response.set_data(compress(data, encoding))
+        response.headers["Content-Encoding"] = encoding
+    return response
+
+
+def ndjson_stream(results: Dict[str, Any], records: Callable[[], Iterable[Dict[str, Any]]],
+                  last_modified: Optional[str] = None) -> Response:
+    """
+    Stream results as newline-delimited JSON, one record per line, ending with an
+    "end" record that carries the stream's ETag.
+
+    Once a stream for the same request and result has completed, its ETag is known
+    up front: it is sent as a header and If-None-Match is answered with 304. When the
+    view is wrapped with cached_response, a stream that completes is stored in the
+    response cache as sent (compressed), unless it exceeds the largest cached entry.
+
+    Args:
+        results: Result object the records are produced from
+        records: Callable returning the record iterator
+        last_modified: ISO-8601 timestamp of the underlying scan
+
+    Returns:
+        Flask streaming response (200), or 304 without a body
+    """
+    key = (request.path, tuple(sorted(request.args.items(multi=True))))
+    encoding = negotiate_encoding()
+    cache_entry = g.pop("response_cache_entry", None)
+    known = get_derived(stream_etags, results, key)
+    etag = _representation_etag(known, encoding) if known else None
+
+    if etag and not is_resource_modified(request.environ, etag=etag):
+        response = current_app.response_class(status=304)
+        response.set_etag(etag)
+        _set_cache_headers(response, last_modified)
+        return response
+
+    dumps = bytes_encoder()
+
+    completed = {}
+
+    def generate() -> Iterator[bytes]:
+        digest = hashlib.sha256()
+        try:
+            for record in records():
+                line = dumps(record) + b"\n"
+                digest.update(line)
+                yield line
+        except Exception as e:
+            yield dumps({"record": "error", "data": {"error": str(e)}}) + b"\n"
+            return
+        store_derived(stream_etags, results, key, digest.hexdigest())
+        completed["etag"] = _representation_etag(digest.hexdigest(), encoding)
+        yield dumps({"record": "end", "etag": completed["etag"]}) + b"\n"
+
+    def caching(chunks: Iterable[bytes]) -> Iterator[bytes]:
+        kept, size = [], 0
+        for chunk in chunks:
+            if kept is not None:
+                size += len(chunk)
+                if size > response_cache.max_entry_bytes:
+                    kept = None
+                else:
+                    kept.append(chunk)
+            yield chunk
+        if kept is not None and "etag" in completed:
+            _store_cached_body(cache_entry, CachedBody(b"".join(kept), NDJSON_MIMETYPE, encoding,
+                                                       completed["etag"], last_modified))
+
+    body = generate()
+    if encoding:
+        body = iter_compressed(body, encoding)
+    if cache_entry is not None:
+        body = caching(body)
+    response = current_app.response_class(body, mimetype=NDJSON_MIMETYPE)
+    if encoding:
+        response.headers["Content-Encoding"] = encoding
+    if etag:
+        response.set_etag(etag)
+    _set_cache_headers(response, last_modified)
+    response.headers["X-Accel-Buffering"] = "no"
+    return response
+
+
+def ndjson_records(records: Iterable[Dict[str, Any]]) -> Response:
+    """
+    Stream records as newline-delimited JSON without validators, for responses that
+    are computed per request (such as POSTed batches) and must not be cached. A
+    failure while producing records ends the stream with an "error" record.
+
+    Args:
+        records: Record iterator, typically ending with an "end" record
+
+    Returns:
+        Flask streaming response
+    """
+    dumps = bytes_encoder()
+    encoding = negotiate_encoding()
+
+    def generate() -> Iterator[bytes]:
+        try:
+            for record in records:
+                yield dumps(record) + b"\n"
+        except Exception as e:
+            yield dumps({"record": "error", "data": {"error": str(e)}}) + b"\n"
+
+    body = generate()
+    response = current_app.response_class(iter_compressed(body, encoding) if encoding else body,
+                                          mimetype=NDJSON_MIMETYPE)
+    if encoding:
+        response.headers["Content-Encoding"] = encoding
+    response.headers["Cache-Control"] = "no-store"
+    response.vary.add("Accept-Encoding")
+    response.headers["X-Accel-Buffering"] = "no"
+    return response
+
+
+def event_stream(events: Iterable[Optional[Tuple[str, Any]]], retry: Optional[float] = None) -> Response:
+    """
+    Stream server-sent events (text/event-stream). Each item is an (event, data) pair, sent
+    with the data as JSON, or None to send a keep-alive comment. Events are never compressed
+    or cached, so each one reaches the client as soon as it is produced. A failure while
+    producing events ends the stream with an "error" event.
+
+    Args:
+        events: Event iterator
+        retry: Seconds EventSource clients wait before reconnecting once the stream ends
+
+    Returns:
+        Flask streaming response
+    """
+    dumps = bytes_encoder()
+
+    def generate() -> Iterator[bytes]:
+        if retry is not None:
+            yield b"retry: " + str(int(retry * 1000)).encode("ascii") + b"\n\n"
+        try:
+            for item in events:
+                if item is None:
+                    yield b": keep-alive\n\n"
+                else:
+                    event, data = item
+                    yield b"event: " + event.encode("utf-8") + b"\ndata: " + dumps(data) + b"\n\n"
+        except Exception as e:
+            yield b"event: error\ndata: " + dumps({"error": str(e)}) + b"\n\n"
+
+    response = current_app.response_class(generate(), mimetype=EVENT_STREAM_MIMETYPE)
+    response.headers["Cache-Control"] = "no-store"
+    response.headers["X-Accel-Buffering"] = "no"
+    return response
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Production server for the Flask Security Scan Results API
+Runs the app under gunicorn with multiple worker processes, each serving requests
+from a thread pool, with graceful shutdown and per-worker warm-up / readiness
+
+Run with: python scan_server/serve.py [--workers N] [--threads N] [--bind HOST:PORT]
+
+Settings default to these environment variables:
+    SCAN_SERVER_BIND              Address to listen on (default 0.0.0.0:5001)
+    SCAN_SERVER_WORKERS           Worker processes (default 2 * CPUs + 1)
+    SCAN_SERVER_THREADS           Request threads per worker (default 4)
+    SCAN_SERVER_TIMEOUT           Seconds before a silent worker is restarted (default 60)
+    SCAN_SERVER_GRACEFUL_TIMEOUT  Seconds in-flight requests get to finish on shutdown (default 30)
+    SCAN_SERVER_KEEPALIVE         Seconds to keep idle client connections open (default 5)
+    SCAN_SERVER_LOG_LEVEL         Log level (default info)
+"""
+import argparse
+import logging
+import os
+import signal
+import sys
+from typing import Any, Dict
+
+file_root = os.path.dirname(os.path.abspath(__file__))
+path_list = [
+    file_root,
+    os.path.dirname(file_root)
+]
+for path in path_list:
+    if path not in sys.path:
+        sys.path.append(path)
+
+from gunicorn.app.base import BaseApplication
+
+
+def default_settings() -> Dict[str, Any]:
+    """Serving settings from the environment, with production defaults"""
+    return {
+        "bind": os.environ.get("SCAN_SERVER_BIND", "0.0.0.0:5001"),
+        "workers": int(os.environ.get("SCAN_SERVER_WORKERS", 2 * (os.cpu_count() or 1) + 1)),
+        "threads": int(os.environ.get("SCAN_SERVER_THREADS", 4)),
+        "timeout": int(os.environ.get("SCAN_SERVER_TIMEOUT", 60)),
+        "graceful_timeout": int(os.environ.get("SCAN_SERVER_GRACEFUL_TIMEOUT", 30)),
+        "keepalive": int(os.environ.get("SCAN_SERVER_KEEPALIVE", 5)),
+        "loglevel": os.environ.get("SCAN_SERVER_LOG_LEVEL", "info"),
+    }
+
+
+def _post_worker_init(worker):
+    """Warm up each worker, and fail its readiness check as soon as it is asked to stop"""
+    from scan_server.flask_scan_server import mark_not_ready, warm_up
+
+    logging.basicConfig(level=worker.cfg.loglevel.upper())
+    warm_up()
+    stop = signal.getsignal(signal.SIGTERM)
+
+    def handle_term(signum, frame):
+        mark_not_ready()
+        stop(signum, frame)
+
+    signal.signal(signal.SIGTERM, handle_term)
+
+
+class ScanServerApplication(BaseApplication):
+    """gunicorn application serving the Flask scan server with threaded workers"""
+
+    def __init__(self, settings: Dict[str, Any]):
+        self.settings = settings
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.settings.items():
+            self.cfg.set(key, value)
+        self.cfg.set("worker_class", "gthread")
+        self.cfg.set("post_worker_init", _post_worker_init)
+
+    def load(self):
+        from scan_server.flask_scan_server import app
+        return app
+
+
+def main():
+    settings = default_settings()
+    parser = argparse.ArgumentParser(description="Serve the scan results API with gunicorn")
+    parser.add_argument("--bind", default=settings["bind"], help="Address to listen on")
+    parser.add_argument("--workers", type=int, default=settings["workers"], help="Worker processes")
+    parser.add_argument("--threads", type=int, default=settings["threads"], help="Request threads per worker")
+    args = parser.parse_args()
+    settings.update(bind=args.bind, workers=args.workers, threads=args.threads)
+
+    print(f"Starting Security Scan Results API on {settings['bind']} "
+          f"({settings['workers']} workers x {settings['threads']} threads)")
+    ScanServerApplication(settings).run()
+
+
+if __name__ == "__main__":
+    main()
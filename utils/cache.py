@@ -0,0 +1,300 @@
+"""
+In-process caching helpers
+Provides a thread-safe LRU cache with per-entry TTL, a memoization decorator, caches of
+values derived from other objects and a byte-bounded LRU cache with tag-based invalidation
+"""
+
+import functools
+import inspect
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache whose entries also expire after a time-to-live.
+
+    Args:
+        maxsize: Maximum number of entries kept before the least recently used is evicted
+        ttl: Seconds an entry stays valid after it is stored (None disables expiry)
+    """
+
+    def __init__(self, maxsize: int = 128, ttl: Optional[float] = 300.0):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        # Reentrant: dropping an entry may release a source whose derived entries pop themselves
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any):
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.pop(key, _MISSING)
+        return default if entry is _MISSING else entry[1]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit, miss and eviction counters."""
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'maxsize': self.maxsize,
+            'ttl_seconds': self.ttl,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+def memoize(cache: TTLCache) -> Callable:
+    """
+    Memoize a function in the given cache, keyed by its bound arguments (defaults applied,
+    so positional and keyword calls share entries). The wrapped function exposes the
+    cache as ``.cache``.
+
+    Cached values are shared between callers and must be treated as read-only.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = (func.__qualname__, tuple(bound.arguments.items()))
+            value = cache.get(key, _MISSING)
+            if value is _MISSING:
+                value = func(*args, **kwargs)
+                cache.set(key, value)
+            return value
+
+        wrapper.cache = cache
+        return wrapper
+
+    return decorator
+
+
+class DerivableDict(dict):
+    """
+    A dict that can be weakly referenced, so values derived from it (see ``derived``) are
+    released together with it instead of keeping it alive.
+    """
+    __slots__ = ("__weakref__",)
+
+
+class _Strong:
+    """Stands in for a weak reference to a source that cannot be weakly referenced"""
+    __slots__ = ("source",)
+
+    def __init__(self, source: Any):
+        self.source = source
+
+    def __call__(self) -> Any:
+        return self.source
+
+
+def get_derived(cache: TTLCache, source: Any, key: Hashable, default: Any = None) -> Any:
+    """Return the value stored with store_derived for this source object and key, or default."""
+    cached = cache.get((id(source), key))
+    if cached is not None and cached[0]() is source:
+        return cached[1]
+    return default
+
+
+def store_derived(cache: TTLCache, source: Any, key: Hashable, value: Any):
+    """
+    Store a value derived from ``source``, keyed by the source's identity plus ``key``.
+
+    The cache refers to the source weakly when it can (``DerivableDict``, ``JSONDocument``...),
+    and the entry is dropped as soon as the source is garbage collected. Other sources are
+    held strongly until the entry is evicted or expires.
+    """
+    cache_key = (id(source), key)
+    try:
+        ref = weakref.ref(source, lambda _, cache_key=cache_key: cache.pop(cache_key))
+    except TypeError:
+        ref = _Strong(source)
+    cache.set(cache_key, (ref, value))
+
+
+def derived(cache: TTLCache, source: Any, key: Hashable, factory: Callable[[], Any]) -> Any:
+    """
+    Return a value derived from ``source`` (an index, summary, ETag...), building it with
+    ``factory`` on first use. The entry is keyed by the source's identity plus ``key``, is
+    only reused while it still belongs to that same source object and does not keep a
+    weakly referenceable source alive (see store_derived).
+    """
+    value = get_derived(cache, source, key, _MISSING)
+    if value is _MISSING:
+        value = factory()
+        store_derived(cache, source, key, value)
+    return value
+
+
+class ByteLRUCache:
+    """
+    Thread-safe LRU cache bounded by the total size of its values (e.g. encoded response
+    bodies) rather than by entry count, with a time-to-live and tag-based invalidation.
+
+    Each entry carries tags (e.g. the project it was computed from); ``invalidate(tag)``
+    drops every entry with that tag. Writers that compute a value while an invalidation
+    may happen pass the ``version`` read before computing, so a value computed from
+    stale data is not stored.
+
+    Args:
+        max_bytes: Total size of the values kept before the least recently used are evicted
+        ttl: Seconds an entry stays valid after it is stored (None disables expiry)
+        max_entry_bytes: Largest single value stored (default max_bytes)
+    """
+
+    def __init__(self, max_bytes: int, ttl: Optional[float] = 300.0, max_entry_bytes: Optional[int] = None):
+        if max_bytes < 1:
+            raise ValueError("max_bytes must be at least 1")
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = min(max_entry_bytes or max_bytes, max_bytes)
+        self.ttl = ttl
+        # key -> (expires_at, size, tags, value)
+        self._entries: "OrderedDict[Hashable, Tuple[Optional[float], int, Tuple[Hashable, ...], Any]]" = OrderedDict()
+        self._tagged: Dict[Hashable, set] = {}
+        self._generations: Dict[Hashable, int] = {}
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.rejected = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+            if entry[0] is not None and entry[0] <= time.monotonic():
+                self._remove(key)
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[3]
+
+    def version(self, tags: Iterable[Hashable]) -> Tuple[int, ...]:
+        """Invalidation generation of the tags; pass it to set() to skip storing stale values."""
+        with self._lock:
+            return tuple(self._generations.get(tag, 0) for tag in tags)
+
+    def set(self, key: Hashable, value: Any, size: int, tags: Iterable[Hashable] = (),
+            version: Optional[Tuple[int, ...]] = None) -> bool:
+        """
+        Store a value of the given size in bytes.
+
+        Returns:
+            bool: False if the value is larger than max_entry_bytes, or its tags were
+            invalidated since ``version`` was read
+        """
+        tags = tuple(tags)
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            if size > self.max_entry_bytes or (
+                    version is not None and version != tuple(self._generations.get(tag, 0) for tag in tags)):
+                self.rejected += 1
+                return False
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (expires_at, size, tags, value)
+            self.bytes += size
+            for tag in tags:
+                self._tagged.setdefault(tag, set()).add(key)
+            while self.bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+            return True
+
+    def invalidate(self, tag: Hashable) -> int:
+        """Drop every entry with the tag; returns the number of entries dropped."""
+        with self._lock:
+            self._generations[tag] = self._generations.get(tag, 0) + 1
+            keys = list(self._tagged.get(tag, ()))
+            for key in keys:
+                self._remove(key)
+            self.invalidations += len(keys)
+            return len(keys)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._tagged.clear()
+            self.bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remove(self, key: Hashable):
+        # Must be called with the lock held
+        _, size, tags, _ = self._entries.pop(key)
+        self.bytes -= size
+        for tag in tags:
+            keys = self._tagged.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tagged[tag]
+
+    def stats(self) -> Dict[str, Any]:
+        """Return size, hit, miss, eviction and invalidation counters."""
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'bytes': self.bytes,
+            'max_bytes': self.max_bytes,
+            'max_entry_bytes': self.max_entry_bytes,
+            'ttl_seconds': self.ttl,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0,
+            'evictions': self.evictions,
+            'invalidations': self.invalidations,
+            'rejected': self.rejected,
+        }
@@ -0,0 +1,712 @@
+"""
+Local Dependency Analysis
+Finds the dependency manifests of a repository checkout (requirements.txt,
+package.json / package-lock.json, pom.xml, go.mod, .csproj, packages.config),
+matches the declared packages against a local vulnerability database, and reports
+the findings in the schema of get_nexus_scan_results_impl, with no network access
+
+The database is a SQLite file loaded from OSV records (the format of the osv.dev
+per-ecosystem exports). Affected version ranges are stored with versions encoded as
+order-preserving strings and indexed by (ecosystem, package, introduced), so all
+dependencies of a repository are matched by one indexed join instead of comparing
+every dependency with every range.
+"""
+
+import hashlib
+import json
+import logging
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+import xml.etree.ElementTree as ElementTree
+import zipfile
+from collections import Counter
+from contextlib import closing
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from git import InvalidGitRepositoryError, NoSuchPathError, Repo
+
+from utils.scan_models import NexusComponent, NexusVulnerability, PolicyViolation
+from utils.scanners import SEVERITY_LEVELS
+
+logger = logging.getLogger(__name__)
+
+VULNERABILITY_DB_PATH = os.environ.get(
+    "VULNERABILITY_DB_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "vulnerability_db.sqlite3"))
+
+# Directories never searched for manifests: installed packages and build output
+SKIPPED_DIRECTORIES = {"node_modules", "bower_components", "vendor", "target", "build", "dist", "venv", "env",
+                       "site-packages", "__pycache__"}
+
+# OSV ecosystem names and the Nexus component type they map to
+OSV_ECOSYSTEMS = {"PyPI": "pypi", "npm": "npm", "Maven": "maven", "Go": "golang", "NuGet": "nuget"}
+
+# Release numbers compared per version; longer versions are truncated, shorter ones padded
+VERSION_PARTS = 6
+
+# Version suffixes that denote a final release rather than a pre-release
+FINAL_QUALIFIERS = {"final", "ga", "release"}
+POST_RELEASE_QUALIFIERS = ("post", "sp", "patch", "pl")
+
+# CVSS score used when a record only has a severity label (the lower bound of its band)
+SEVERITY_LABEL_SCORES = {"CRITICAL": 9.0, "HIGH": 7.0, "MODERATE": 4.0, "MEDIUM": 4.0, "LOW": 0.1}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS vulnerabilities (
+    vuln_id TEXT PRIMARY KEY,
+    cve_id TEXT NOT NULL,
+    cvss_score REAL NOT NULL,
+    severity TEXT NOT NULL,
+    summary TEXT,
+    published_date TEXT,
+    modified_date TEXT
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS affected (
+    ecosystem TEXT NOT NULL,
+    package TEXT NOT NULL,
+    introduced TEXT NOT NULL,
+    fixed TEXT,
+    last_affected TEXT,
+    vuln_id TEXT NOT NULL REFERENCES vulnerabilities (vuln_id) ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS affected_lookup ON affected (ecosystem, package, introduced);
+CREATE INDEX IF NOT EXISTS affected_vulnerability ON affected (vuln_id);
+"""
+
+# All dependencies of one analysis are matched in a single join: the temporary table of
+# wanted versions drives lookups on affected_lookup, bounded by the introduced version
+MATCH_QUERY = """
+SELECT DISTINCT wanted.position, v.cve_id, v.cvss_score, v.severity, v.summary, v.published_date,
+       v.modified_date
+FROM wanted
+JOIN affected a ON a.ecosystem = wanted.ecosystem AND a.package = wanted.package
+                AND a.introduced <= wanted.version
+JOIN vulnerabilities v ON v.vuln_id = a.vuln_id
+WHERE (a.fixed IS NULL OR wanted.version < a.fixed)
+  AND (a.last_affected IS NULL OR wanted.version <= a.last_affected)
+"""
+
+
+class Dependency(NamedTuple):
+    type: str
+    name: str
+    version: Optional[str]
+    direct: bool
+    license: Optional[str] = None
+
+
+_VERSION = re.compile(r"v?(\d+(?:\.\d+)*)(.*)", re.IGNORECASE | re.DOTALL)
+
+
+def version_key(version: str) -> Optional[str]:
+    """
+    Encode a version as a string that sorts in version order, so ranges can be
+    compared (and indexed) by SQLite as plain text: "1.10" > "1.9", "1.0.0-rc1" <
+    "1.0.0" < "1.0.0.post1". Handles semver, PEP 440, Maven and Go module versions
+    well enough for range matching.
+
+    Returns:
+        str: The encoded version, or None for versions without a leading number
+    """
+    match = _VERSION.fullmatch(version.strip())
+    if not match:
+        return None
+    release = [min(int(part), 9_999_999_999) for part in match.group(1).split(".")][:VERSION_PARTS]
+    release += [0] * (VERSION_PARTS - len(release))
+    key = ".".join(f"{part:010d}" for part in release)
+    # Build metadata ("+build.5") does not affect ordering
+    suffix = match.group(2).split("+", 1)[0].strip(".-_").lower()
+    if not suffix or suffix in FINAL_QUALIFIERS:
+        return key + "~"
+    tokens = ".".join(f"{int(token):010d}" if token.isdigit() else token
+                      for token in re.findall(r"\d+|[a-z]+", suffix))
+    # "~" marks a final release; pre-releases sort before it, post-releases after
+    if suffix.startswith(POST_RELEASE_QUALIFIERS):
+        return f"{key}~{tokens}"
+    return f"{key}-{tokens}"
+
+
+def normalize_package_name(component_type: str, name: str) -> str:
+    """Package name as compared with the database (PyPI and NuGet names are case-insensitive)."""
+    if component_type == "pypi":
+        return re.sub(r"[-_.]+", "-", name).lower()
+    if component_type == "nuget":
+        return name.lower()
+    return name
+
+
+def cvss3_base_score(vector: str) -> Optional[float]:
+    """
+    Compute the base score of a CVSS 3.x vector, e.g. "CVSS:3.1/AV:N/AC:L/PR:N/UI:N/S:U/C:H/I:H/A:H".
+
+    Returns:
+        float: The base score, or None when the vector is not a complete CVSS 3 vector
+    """
+    metrics = dict(part.split(":", 1) for part in vector.split("/") if ":" in part)
+    if not metrics.get("CVSS", "").startswith("3"):
+        return None
+    try:
+        changed = metrics["S"] == "C"
+        attack_vector = {"N": 0.85, "A": 0.62, "L": 0.55, "P": 0.2}[metrics["AV"]]
+        complexity = {"L": 0.77, "H": 0.44}[metrics["AC"]]
+        privileges = {"N": 0.85, "L": 0.68 if changed else 0.62, "H": 0.5 if changed else 0.27}[metrics["PR"]]
+        interaction = {"N": 0.85, "R": 0.62}[metrics["UI"]]
+        impacts = [{"H": 0.56, "L": 0.22, "N": 0.0}[metrics[name]] for name in ("C", "I", "A")]
+    except KeyError:
+        return None
+
+    base_impact = 1 - (1 - impacts[0]) * (1 - impacts[1]) * (1 - impacts[2])
+    if changed:
+        impact = 7.52 * (base_impact - 0.029) - 3.25 * (base_impact - 0.02) ** 15
+    else:
+        impact = 6.42 * base_impact
+    if impact <= 0:
+        return 0.0
+    exploitability = 8.22 * attack_vector * complexity * privileges * interaction
+    score = min((1.08 if changed else 1) * (impact + exploitability), 10)
+    # Round up to one decimal as specified by CVSS 3.1, avoiding floating point artifacts
+    scaled = round(score * 100_000)
+    return scaled / 100_000 if scaled % 10_000 == 0 else (math.floor(scaled / 10_000) + 1) / 10
+
+
+def severity_for_score(score: float) -> str:
+    """Severity level of a CVSS score."""
+    if score >= 9.0:
+        return "Critical"
+    if score >= 7.0:
+        return "High"
+    if score >= 4.0:
+        return "Medium"
+    return "Low" if score > 0 else "Info"
+
+
+def _osv_score(record: Dict[str, Any]) -> float:
+    for severity in record.get("severity") or []:
+        if severity.get("type") in ("CVSS_V3", "CVSS_V31"):
+            score = cvss3_base_score(severity.get("score", ""))
+            if score is not None:
+                return score
+    label = str((record.get("database_specific") or {}).get("severity", "")).upper()
+    return SEVERITY_LABEL_SCORES.get(label, 0.0)
+
+
+def _osv_ranges(affected: Dict[str, Any]) -> Iterator[Tuple[str, Optional[str], Optional[str]]]:
+    """(introduced, fixed, last_affected) version keys of one OSV affected entry."""
+    ranges = [entry for entry in affected.get("ranges") or [] if entry.get("type") in ("ECOSYSTEM", "SEMVER")]
+    for entry in ranges:
+        introduced = None
+        for event in entry.get("events") or []:
+            if "introduced" in event:
+                # "0" means every version, including pre-releases of 0.0.0
+                introduced = "" if event["introduced"] == "0" else version_key(event["introduced"])
+            elif introduced is not None and "fixed" in event:
+                fixed = version_key(event["fixed"])
+                if fixed is not None:
+                    yield introduced, fixed, None
+                introduced = None
+            elif introduced is not None and "last_affected" in event:
+                last_affected = version_key(event["last_affected"])
+                if last_affected is not None:
+                    yield introduced, None, last_affected
+                introduced = None
+        if introduced is not None:
+            yield introduced, None, None
+    if not ranges:
+        # Only enumerated versions (e.g. records derived from git ranges)
+        for version in affected.get("versions") or []:
+            key = version_key(version)
+            if key is not None:
+                yield key, None, key
+
+
+def _read_osv_file(name: str, data: bytes) -> Iterator[Dict[str, Any]]:
+    try:
+        document = json.loads(data)
+    except ValueError as e:
+        logger.warning(f"Skipping unreadable OSV file {name}: {e}")
+        return
+    yield from document if isinstance(document, list) else [document]
+
+
+def iter_osv_records(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Read OSV records from a JSON file (one record or a list), a directory of JSON
+    files, or a zip archive of them such as an osv.dev ecosystem export.
+    """
+    if os.path.isdir(path):
+        for root, _, filenames in os.walk(path):
+            for filename in sorted(filenames):
+                if filename.endswith(".json"):
+                    with open(os.path.join(root, filename), "rb") as f:
+                        yield from _read_osv_file(filename, f.read())
+    elif zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            for name in archive.namelist():
+                if name.endswith(".json"):
+                    yield from _read_osv_file(name, archive.read(name))
+    else:
+        with open(path, "rb") as f:
+            yield from _read_osv_file(path, f.read())
+
+
+class VulnerabilityDatabase:
+    """
+    SQLite vulnerability database loaded from OSV records. Safe to share between
+    threads (each thread uses its own connection).
+
+    Args:
+        path: Database file, created with its directory on first use
+    """
+
+    def __init__(self, path: str = VULNERABILITY_DB_PATH):
+        self.path = path
+        self._local = threading.local()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with closing(self._connect()) as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, timeout=30.0)
+        connection.execute("PRAGMA foreign_keys=ON")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute("CREATE TEMP TABLE IF NOT EXISTS wanted (position INTEGER PRIMARY KEY, "
+                           "ecosystem TEXT NOT NULL, package TEXT NOT NULL, version TEXT NOT NULL)")
+        return connection
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = self._local.connection = self._connect()
+        return connection
+
+    def import_osv(self, records: Iterable[Dict[str, Any]]) -> int:
+        """
+        Add or replace vulnerabilities from OSV records. Withdrawn records are removed,
+        and records for ecosystems without a Nexus component type are skipped.
+
+        Args:
+            records: OSV records (see iter_osv_records)
+
+        Returns:
+            int: Number of vulnerabilities imported
+        """
+        imported = 0
+        with self.connection as connection:
+            for record in records:
+                vuln_id = record.get("id")
+                if not vuln_id:
+                    continue
+                connection.execute("DELETE FROM vulnerabilities WHERE vuln_id = ?", (vuln_id,))
+                if record.get("withdrawn"):
+                    continue
+                ranges = [(OSV_ECOSYSTEMS[affected["package"]["ecosystem"]], affected["package"]["name"], ranges)
+                          for affected in record.get("affected") or []
+                          if affected.get("package", {}).get("ecosystem") in OSV_ECOSYSTEMS
+                          for ranges in _osv_ranges(affected)]
+                if not ranges:
+                    continue
+                score = _osv_score(record)
+                cve_id = next((alias for alias in [vuln_id, *(record.get("aliases") or [])]
+                               if alias.startswith("CVE-")), vuln_id)
+                summary = record.get("summary") or (record.get("details") or "").strip().split("\n", 1)[0]
+                connection.execute("INSERT INTO vulnerabilities VALUES (?, ?, ?, ?, ?, ?, ?)",
+                                   (vuln_id, cve_id, score, severity_for_score(score), summary,
+                                    record.get("published"), record.get("modified")))
+                connection.executemany(
+                    "INSERT INTO affected VALUES (?, ?, ?, ?, ?, ?)",
+                    [(ecosystem, normalize_package_name(ecosystem, name), *bounds, vuln_id)
+                     for ecosystem, name, bounds in ranges])
+                imported += 1
+        return imported
+
+    def import_osv_path(self, path: str) -> int:
+        """Import the OSV records at a path (see iter_osv_records); returns the number imported."""
+        imported = self.import_osv(iter_osv_records(path))
+        logger.info(f"Imported {imported} vulnerabilities from {path}")
+        return imported
+
+    def vulnerability_count(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM vulnerabilities").fetchone()[0]
+
+    def match(self, dependencies: List[Dependency]) -> Dict[int, List[NexusVulnerability]]:
+        """
+        Find the vulnerabilities affecting each dependency version.
+
+        Args:
+            dependencies: Dependencies with versions; those without one are never matched
+
+        Returns:
+            dict: Position in dependencies -> its vulnerabilities, worst first, one per CVE
+        """
+        wanted = []
+        for position, dependency in enumerate(dependencies):
+            key = version_key(dependency.version) if dependency.version else None
+            if key is not None:
+                wanted.append((position, dependency.type, normalize_package_name(dependency.type, dependency.name),
+                               key))
+        matches: Dict[int, Dict[str, NexusVulnerability]] = {}
+        with self.connection as connection:
+            connection.execute("DELETE FROM wanted")
+            connection.executemany("INSERT INTO wanted VALUES (?, ?, ?, ?)", wanted)
+            for position, cve_id, *fields in connection.execute(MATCH_QUERY):
+                # Advisories from several sources can describe the same CVE; keep the best scored
+                found = matches.setdefault(position, {})
+                if cve_id not in found or fields[0] > found[cve_id].cvss_score:
+                    found[cve_id] = NexusVulnerability(cve_id, *fields)
+            connection.execute("DELETE FROM wanted")
+        return {position: sorted(found.values(), key=lambda v: (-v.cvss_score, v.cve_id))
+                for position, found in matches.items()}
+
+
+_database: Optional[VulnerabilityDatabase] = None
+_database_lock = threading.Lock()
+
+
+def get_vulnerability_database() -> VulnerabilityDatabase:
+    """The process-wide vulnerability database at VULNERABILITY_DB_PATH, opened on first use."""
+    global _database
+    if _database is None:
+        with _database_lock:
+            if _database is None:
+                _database = VulnerabilityDatabase()
+    return _database
+
+
+# Manifest parsers: each takes the file's text and returns its dependencies
+
+_REQUIREMENT = re.compile(r"([A-Za-z0-9][A-Za-z0-9._-]*)\s*(?:\[[^\]]*\])?\s*(?:===?\s*([^\s;,#]+))?")
+
+
+def parse_requirements(text: str) -> List[Dependency]:
+    """requirements.txt; only pinned (==) requirements have a version."""
+    dependencies = []
+    for line in text.splitlines():
+        line = line.split(" #", 1)[0].strip()
+        if not line or line.startswith(("#", "-", "git+", "http:", "https:")):
+            continue
+        match = _REQUIREMENT.match(line)
+        if match:
+            version = match.group(2)
+            # Wildcard pins ("==1.4.*") are ranges
+            dependencies.append(Dependency("pypi", match.group(1), None if version and "*" in version else version,
+                                           True))
+    return dependencies
+
+
+_NPM_PINNED = re.compile(r"[\^~=v]*(\d+\.\d+\.\d+[^\s]*)")
+
+
+def parse_package_json(text: str) -> List[Dependency]:
+    """
+    package.json, used when there is no package-lock.json next to it. Exact versions
+    are used as they are, caret and tilde ranges by the lowest version they allow.
+    """
+    document = json.loads(text)
+    dependencies = []
+    for section in ("dependencies", "devDependencies", "optionalDependencies"):
+        for name, spec in (document.get(section) or {}).items():
+            match = _NPM_PINNED.fullmatch(spec.strip()) if isinstance(spec, str) else None
+            dependencies.append(Dependency("npm", name, match.group(1) if match else None, True))
+    return dependencies
+
+
+def parse_package_lock(text: str) -> List[Dependency]:
+    """package-lock.json (lockfile versions 1 to 3), including transitive dependencies."""
+    document = json.loads(text)
+    packages = document.get("packages")
+    if packages is not None:
+        root = packages.get("", {})
+        direct = {name for section in ("dependencies", "devDependencies", "optionalDependencies")
+                  for name in root.get(section) or {}}
+        dependencies = []
+        for location, package in packages.items():
+            if not location or "node_modules/" not in location or package.get("link"):
+                continue
+            name = package.get("name") or location.rsplit("node_modules/", 1)[1]
+            top_level = location.count("node_modules/") == 1
+            dependencies.append(Dependency("npm", name, package.get("version"), top_level and name in direct,
+                                           package.get("license")))
+        return dependencies
+
+    # Lockfile version 1: nested "dependencies" objects
+    dependencies = []
+    pending = [(document.get("dependencies") or {}, True)]
+    while pending:
+        section, top_level = pending.pop()
+        for name, package in section.items():
+            dependencies.append(Dependency("npm", name, package.get("version"), top_level and not package.get("dev")))
+            if package.get("dependencies"):
+                pending.append((package["dependencies"], False))
+    return dependencies
+
+
+_POM_PROPERTY = re.compile(r"\$\{([^}]+)\}")
+
+
+def parse_pom(text: str) -> List[Dependency]:
+    """pom.xml dependencies and managed dependencies; ${property} versions are resolved within the file."""
+    root = ElementTree.fromstring(text)
+    namespace = root.tag[:root.tag.index("}") + 1] if root.tag.startswith("{") else ""
+
+    def child_text(element, name: str) -> Optional[str]:
+        found = element.find(namespace + name)
+        return found.text.strip() if found is not None and found.text else None
+
+    properties = {element.tag[len(namespace):]: (element.text or "").strip()
+                  for element in root.iterfind(f"{namespace}properties/*")}
+    properties["project.version"] = child_text(root, "version") or ""
+    properties["version"] = properties["project.version"]
+
+    def resolve(value: Optional[str]) -> Optional[str]:
+        for _ in range(5):
+            if value is None or "${" not in value:
+                break
+            value = _POM_PROPERTY.sub(lambda match: properties.get(match.group(1), match.group(0)), value)
+        return None if value is None or "${" in value else value
+
+    dependencies = []
+    for path in (f"{namespace}dependencies/{namespace}dependency",
+                 f"{namespace}dependencyManagement/{namespace}dependencies/{namespace}dependency"):
+        for element in root.iterfind(path):
+            group, artifact = child_text(element, "groupId"), child_text(element, "artifactId")
+            if group and artifact and child_text(element, "type") != "pom":
+                dependencies.append(Dependency("maven", f"{resolve(group)}:{resolve(artifact)}",
+                                               resolve(child_text(element, "version")), True))
+    return dependencies
+
+
+_GO_REQUIRE = re.compile(r"^\s*(?:require\s+)?([^\s()]+)\s+(v[^\s]+)(\s*//\s*indirect)?", re.MULTILINE)
+
+
+def parse_go_mod(text: str) -> List[Dependency]:
+    """go.mod require directives (single-line and block form)."""
+    dependencies = []
+    in_block = False
+    for line in text.splitlines():
+        stripped = line.strip()
+        if stripped.startswith("require ("):
+            in_block = True
+            continue
+        if in_block and stripped.startswith(")"):
+            in_block = False
+            continue
+        if in_block or stripped.startswith("require "):
+            match = _GO_REQUIRE.match(line)
+            if match:
+                dependencies.append(Dependency("golang", match.group(1), match.group(2), not match.group(3)))
+    return dependencies
+
+
+def parse_nuget(text: str) -> List[Dependency]:
+    """.csproj / .fsproj / .vbproj PackageReference items and packages.config entries."""
+    root = ElementTree.fromstring(text)
+    dependencies = []
+    for element in root.iter():
+        tag = element.tag.rsplit("}", 1)[-1]
+        if tag == "PackageReference" and element.get("Include"):
+            version = element.get("Version") or next(
+                ((child.text or "").strip() for child in element if child.tag.rsplit("}", 1)[-1] == "Version"), None)
+            dependencies.append(Dependency("nuget", element.get("Include"), version or None, True))
+        elif tag == "package" and element.get("id"):
+            dependencies.append(Dependency("nuget", element.get("id"), element.get("version"), True))
+    return dependencies
+
+
+def manifest_parser(filename: str):
+    """The parser for a manifest file name, or None if it is not a manifest."""
+    if filename.startswith("requirements") and filename.endswith(".txt"):
+        return parse_requirements
+    if filename.endswith((".csproj", ".fsproj", ".vbproj")) or filename == "packages.config":
+        return parse_nuget
+    return {"package.json": parse_package_json, "package-lock.json": parse_package_lock, "pom.xml": parse_pom,
+            "go.mod": parse_go_mod}.get(filename)
+
+
+def find_manifests(repo_path: str) -> List[str]:
+    """
+    Manifest paths relative to repo_path, skipping hidden directories and installed
+    packages, and package.json files that have a package-lock.json next to them.
+    """
+    manifests = []
+    for root, directories, filenames in os.walk(repo_path):
+        directories[:] = sorted(name for name in directories
+                                if not name.startswith(".") and name not in SKIPPED_DIRECTORIES)
+        for filename in sorted(filenames):
+            if manifest_parser(filename) is None:
+                continue
+            if filename == "package.json" and "package-lock.json" in filenames:
+                continue
+            manifests.append(os.path.relpath(os.path.join(root, filename), repo_path))
+    return manifests
+
+
+def collect_dependencies(repo_path: str, manifests: List[str]) -> Tuple[List[Dependency], Dict[str, str]]:
+    """
+    Parse manifests and merge dependencies declared more than once (direct if any
+    manifest declares them directly).
+
+    Returns:
+        tuple: The unique dependencies, and manifests that failed to parse with their errors
+    """
+    merged: Dict[Tuple[str, str, Optional[str]], Dependency] = {}
+    errors = {}
+    for manifest in manifests:
+        try:
+            with open(os.path.join(repo_path, manifest), encoding="utf-8", errors="replace") as f:
+                parsed = manifest_parser(os.path.basename(manifest))(f.read())
+        except (ValueError, ElementTree.ParseError, OSError) as e:
+            logger.warning(f"Could not parse {manifest}: {e}")
+            errors[manifest] = str(e)
+            continue
+        for dependency in parsed:
+            key = (dependency.type, normalize_package_name(dependency.type, dependency.name), dependency.version)
+            existing = merged.get(key)
+            if existing is None:
+                merged[key] = dependency
+            elif dependency.direct and not existing.direct or dependency.license and not existing.license:
+                merged[key] = existing._replace(direct=existing.direct or dependency.direct,
+                                                license=existing.license or dependency.license)
+    return list(merged.values()), errors
+
+
+def license_threat_level(license: str) -> str:
+    """License threat level as reported by Nexus IQ for the common license families."""
+    normalized = license.upper()
+    if normalized.startswith(("GPL", "AGPL", "SSPL")):
+        return "High"
+    if normalized.startswith(("LGPL", "MPL", "EPL", "CDDL")):
+        return "Medium"
+    return "Low" if normalized == "UNKNOWN" else "None"
+
+
+def _head_revision(repo_path: str) -> Optional[str]:
+    try:
+        return Repo(repo_path).head.commit.hexsha
+    except (InvalidGitRepositoryError, NoSuchPathError, ValueError):
+        return None
+
+
+def analyze_dependencies(repo_path: str, repository_name: Optional[str] = None,
+                         database: Optional[VulnerabilityDatabase] = None) -> Dict[str, Any]:
+    """
+    Find a repository's dependencies and their known vulnerabilities, offline.
+
+    Args:
+        repo_path: Path to the repository (e.g. returned by GitUtils.clone_repository)
+        repository_name: Repository name reported in the results (default: the directory name)
+        database: Vulnerability database (default: get_vulnerability_database())
+
+    Returns:
+        dict: Results in the schema of get_nexus_scan_results_impl, plus "analysis" with
+        the revision, manifests, dependency counts and elapsed time
+    """
+    started = time.perf_counter()
+    if not os.path.isdir(repo_path):
+        raise ValueError(f"Repository path '{repo_path}' does not exist")
+    repository_name = repository_name or os.path.basename(os.path.abspath(repo_path))
+    database = database or get_vulnerability_database()
+
+    manifests = find_manifests(repo_path)
+    dependencies, errors = collect_dependencies(repo_path, manifests)
+    resolved = [dependency for dependency in dependencies if dependency.version]
+    matches = database.match(resolved)
+
+    scan_date = datetime.now().isoformat()
+    components = []
+    policy_violations = []
+    severities = Counter()
+    licenses = Counter()
+    total_vulnerabilities = 0
+    for position, dependency in enumerate(resolved):
+        vulnerabilities = matches.get(position, [])
+        license = dependency.license or "Unknown"
+        threat_level = license_threat_level(license)
+        violations = []
+        if any(v.severity in ("Critical", "High") for v in vulnerabilities):
+            violations.append(("Security", vulnerabilities[0].severity, "Critical Security Policy",
+                               "Component has critical security vulnerabilities"))
+        if threat_level == "High":
+            violations.append(("License", "High", "License Compliance Policy",
+                               "License is not approved for commercial use"))
+        identity = f"{dependency.type}:{dependency.name}@{dependency.version}"
+        component_id = f"{dependency.type}-{hashlib.sha1(identity.encode('utf-8')).hexdigest()[:8]}"
+        for index, (violation_type, severity, policy_name, description) in enumerate(violations):
+            policy_violations.append(PolicyViolation(f"policy-{component_id.rsplit('-', 1)[1]}{index}",
+                                                     violation_type, severity, policy_name, dependency.name,
+                                                     description, scan_date))
+        components.append(NexusComponent(
+            component_id=component_id,
+            package_name=dependency.name,
+            version=dependency.version,
+            type=dependency.type,
+            license=license,
+            direct_dependency=dependency.direct,
+            vulnerabilities=vulnerabilities,
+            vulnerability_count=len(vulnerabilities),
+            highest_cvss=vulnerabilities[0].cvss_score if vulnerabilities else 0,
+            policy_violations=len(violations),
+            license_threat_level=threat_level,
+            # Not known without the registry
+            age_months=None
+        ))
+        licenses[license] += 1
+        total_vulnerabilities += len(vulnerabilities)
+        severities.update(v.severity for v in vulnerabilities)
+
+    open_policy_violations = sum(1 for violation in policy_violations if violation.severity in ("Critical", "High"))
+    worst_severity = min((SEVERITY_LEVELS.index(severity) for severity in severities), default=None)
+    revision = _head_revision(repo_path)
+    # Outside git, identify the scan by its dependencies
+    scan_revision = revision or hashlib.sha1(
+        "\n".join(sorted(f"{d.type}:{d.name}@{d.version}" for d in dependencies)).encode("utf-8")).hexdigest()
+
+    logger.info(f"Analyzed dependencies of {repository_name}: {len(manifests)} manifests, "
+                f"{len(dependencies)} dependencies, {total_vulnerabilities} vulnerabilities")
+    return {
+        "scan_id": f"nexus-local-{scan_revision[:12]}",
+        "repository_name": repository_name,
+        "application_name": f"App-{repository_name}",
+        "scan_date": scan_date,
+        "status": "Completed",
+        "stage": "build",
+        "summary": {
+            "total_components": len(components),
+            "components_with_vulnerabilities": len(matches),
+            "total_vulnerabilities": total_vulnerabilities,
+            "critical_vulnerabilities": severities["Critical"],
+            "high_vulnerabilities": severities["High"],
+            "policy_violations": len(policy_violations),
+            "license_issues": sum(1 for component in components
+                                  if component.license_threat_level in ("Medium", "High"))
+        },
+        "components": components,
+        "policy_violations": policy_violations,
+        "risk_metrics": {
+            "application_risk_score": round(max((component.highest_cvss for component in components), default=0) * 10, 1),
+            "policy_evaluation": "Fail" if worst_severity is not None and worst_severity <= 1
+            else "Warn" if policy_violations else "Pass",
+            "open_policy_violations": open_policy_violations,
+            # Not known without the registry
+            "legacy_components": None
+        },
+        "license_summary": dict(licenses),
+        "dashboard_url": None,
+        "analysis": {
+            "engine": "local",
+            "database": database.path,
+            "revision": revision,
+            "manifests": manifests,
+            "manifest_errors": errors,
+            "dependencies": len(dependencies),
+            "unresolved_dependencies": len(dependencies) - len(resolved),
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+        },
+    }
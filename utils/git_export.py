@@ -0,0 +1,370 @@
+"""
+Git Dataset Export
+Streams commit history, file churn, contributor and language datasets from a
+Git repository into Arrow IPC or Parquet files, partitioned by repository
+"""
+
+import logging
+import os
+import re
+import tempfile
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
+
+from git import Repo
+
+logger = logging.getLogger(__name__)
+
+# Datasets that can be exported
+DATASETS = ('history', 'churn', 'contributors', 'languages')
+
+# Supported output formats and their file extensions
+FILE_FORMATS = {
+    'parquet': '.parquet',
+    'arrow': '.arrow',
+}
+
+# Number of rows buffered per dataset before a record batch is flushed
+DEFAULT_BATCH_SIZE = 10000
+
+# Field and record separators used in the `git log` format string
+_RECORD_START = '\x1e'
+_FIELD_SEP = '\x1f'
+_RECORD_END = '\x1d'
+_LOG_FORMAT = f'{_RECORD_START}%H{_FIELD_SEP}%P{_FIELD_SEP}%an{_FIELD_SEP}%ae{_FIELD_SEP}%ct{_FIELD_SEP}%B{_RECORD_END}'
+
+
+def _schemas():
+    """Build the Arrow schemas for every dataset (pyarrow is imported lazily)."""
+    import pyarrow as pa
+
+    timestamp = pa.timestamp('s', tz='UTC')
+    return {
+        'history': pa.schema([
+            ('repository', pa.string()),
+            ('hash', pa.string()),
+            ('parent_count', pa.int16()),
+            ('author_name', pa.string()),
+            ('author_email', pa.string()),
+            ('committed_date', timestamp),
+            ('message', pa.string()),
+            ('files_changed', pa.int32()),
+            ('insertions', pa.int64()),
+            ('deletions', pa.int64()),
+        ]),
+        'churn': pa.schema([
+            ('repository', pa.string()),
+            ('hash', pa.string()),
+            ('author_email', pa.string()),
+            ('committed_date', timestamp),
+            ('path', pa.string()),
+            ('insertions', pa.int64()),
+            ('deletions', pa.int64()),
+            ('binary', pa.bool_()),
+        ]),
+        'contributors': pa.schema([
+            ('repository', pa.string()),
+            ('author_email', pa.string()),
+            ('author_name', pa.string()),
+            ('commits', pa.int64()),
+            ('insertions', pa.int64()),
+            ('deletions', pa.int64()),
+            # Files changed summed over the contributor's commits, as in the history dataset
+            ('files_changed', pa.int64()),
+            ('first_commit', timestamp),
+            ('last_commit', timestamp),
+        ]),
+        'languages': pa.schema([
+            ('repository', pa.string()),
+            ('language', pa.string()),
+            ('extension', pa.string()),
+            ('files', pa.int64()),
+        ]),
+    }
+
+
+class _BatchedWriter:
+    """
+    Buffers rows column-wise and flushes them as record batches, so memory use
+    is bounded by the batch size rather than the size of the dataset.
+    """
+
+    def __init__(self, path: str, schema, file_format: str, batch_size: int):
+        import pyarrow as pa
+
+        self.path = path
+        self.schema = schema
+        self.batch_size = batch_size
+        self.rows = 0
+        self._columns = {name: [] for name in schema.names}
+        self._buffered = 0
+
+        if file_format == 'parquet':
+            import pyarrow.parquet as pq
+            self._writer = pq.ParquetWriter(path, schema, compression='zstd')
+        else:
+            self._sink = pa.OSFile(path, 'wb')
+            self._writer = pa.ipc.new_file(self._sink, schema)
+
+    def write(self, row: Dict[str, Any]):
+        for name, values in self._columns.items():
+            values.append(row.get(name))
+        self._buffered += 1
+        if self._buffered >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        import pyarrow as pa
+
+        if not self._buffered:
+            return
+        batch = pa.RecordBatch.from_pydict(self._columns, schema=self.schema)
+        self._writer.write_batch(batch)
+        self.rows += self._buffered
+        self._columns = {name: [] for name in self.schema.names}
+        self._buffered = 0
+
+    def close(self):
+        self.flush()
+        self._writer.close()
+        if hasattr(self, '_sink'):
+            self._sink.close()
+
+
+def repository_partition_name(repo: Repo, repo_path: str) -> str:
+    """
+    Derive a stable partition name for a repository, preferring the origin URL.
+
+    Args:
+        repo: Opened repository
+        repo_path: Path to the repository on disk
+
+    Returns:
+        str: Filesystem-safe repository name
+    """
+    name = None
+    try:
+        if repo.remotes:
+            url = list(repo.remotes.origin.urls)[0]
+            name = url.rstrip('/').rsplit('/', 1)[-1].rsplit(':', 1)[-1]
+            if name.endswith('.git'):
+                name = name[:-4]
+    except Exception:
+        name = None
+    if not name:
+        name = Path(repo_path).resolve().name
+    return re.sub(r'[^A-Za-z0-9._-]', '_', name) or 'repository'
+
+
+def iter_commit_log(repo: Repo) -> Iterator[Tuple[Dict[str, Any], List[Tuple[str, Optional[int], Optional[int]]]]]:
+    """
+    Stream commits with their per-file numstat from a single `git log` process.
+
+    Args:
+        repo: Opened repository
+
+    Yields:
+        tuple: (commit header dict, list of (path, insertions, deletions)); binary
+        files have None for insertions and deletions
+    """
+    process = repo.git(c='core.quotepath=off').log('--numstat', '--no-renames', f'--format={_LOG_FORMAT}',
+                                                   as_process=True)
+    stream = process.proc.stdout
+
+    header = None
+    header_lines: List[str] = []
+    files: List[Tuple[str, Optional[int], Optional[int]]] = []
+    in_header = False
+
+    def parse_header(text: str) -> Dict[str, Any]:
+        commit_hash, parents, author_name, author_email, timestamp, message = text.split(_FIELD_SEP, 5)
+        return {
+            'hash': commit_hash,
+            'parent_count': len(parents.split()) if parents else 0,
+            'author_name': author_name,
+            'author_email': author_email,
+            'committed_date': datetime.fromtimestamp(int(timestamp), tz=timezone.utc),
+            'message': message.strip(),
+        }
+
+    try:
+        for raw_line in stream:
+            line = raw_line.decode('utf-8', errors='replace').rstrip('\n')
+
+            if line.startswith(_RECORD_START):
+                if header is not None:
+                    yield header, files
+                header, files = None, []
+                header_lines = [line[1:]]
+                in_header = True
+            elif in_header:
+                header_lines.append(line)
+            elif line:
+                insertions, deletions, path = line.split('\t', 2)
+                if insertions == '-':
+                    files.append((path, None, None))
+                else:
+                    files.append((path, int(insertions), int(deletions)))
+                continue
+            else:
+                continue
+
+            if in_header and _RECORD_END in line:
+                text = '\n'.join(header_lines)
+                header = parse_header(text[:text.rindex(_RECORD_END)])
+                in_header = False
+
+        if header is not None:
+            yield header, files
+    finally:
+        stream.close()
+        process.proc.wait()
+
+
+class GitDatasetExporter:
+    """
+    Writes git analysis datasets to columnar files using streaming writers.
+
+    Output layout is hive-style partitioned by repository:
+    ``<output_dir>/<dataset>/repository=<name>/part-0.<ext>``
+    """
+
+    def __init__(self, file_format: str = 'parquet', batch_size: int = DEFAULT_BATCH_SIZE):
+        if file_format not in FILE_FORMATS:
+            raise ValueError(f"Unsupported format '{file_format}'. Available formats: {', '.join(FILE_FORMATS)}")
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        self.file_format = file_format
+        self.batch_size = batch_size
+
+    def export(self, repo_path: str, output_dir: Optional[str] = None, datasets: Optional[List[str]] = None,
+               file_list: Optional[Iterable[str]] = None, language_map: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """
+        Export the requested datasets for a repository.
+
+        Args:
+            repo_path: Path to the Git repository
+            output_dir: Root directory for the artifacts (default: new temporary directory)
+            datasets: Datasets to export (default: all of DATASETS)
+            file_list: Repository file paths used for the language breakdown, consumed once
+            language_map: File extension to language mapping
+
+        Returns:
+            dict: Repository partition name, output directory and per-dataset artifact paths and row counts
+        """
+        datasets = list(datasets or DATASETS)
+        unknown = [name for name in datasets if name not in DATASETS]
+        if unknown:
+            raise ValueError(f"Unknown datasets {unknown}. Available datasets: {', '.join(DATASETS)}")
+
+        repo = Repo(repo_path)
+        repository = repository_partition_name(repo, repo_path)
+        output_dir = output_dir or tempfile.mkdtemp(prefix='git-export-')
+        schemas = _schemas()
+
+        writers: Dict[str, _BatchedWriter] = {}
+        try:
+            for name in datasets:
+                partition_dir = os.path.join(output_dir, name, f'repository={repository}')
+                os.makedirs(partition_dir, exist_ok=True)
+                path = os.path.join(partition_dir, f'part-0{FILE_FORMATS[self.file_format]}')
+                writers[name] = _BatchedWriter(path, schemas[name], self.file_format, self.batch_size)
+
+            if writers.keys() & {'history', 'churn', 'contributors'}:
+                self._write_commit_datasets(repo, repository, writers)
+            if 'languages' in writers:
+                self._write_languages(repository, writers['languages'], file_list or [], language_map or {})
+        finally:
+            for writer in writers.values():
+                writer.close()
+
+        logger.info(f"Exported {', '.join(datasets)} for {repository} to {output_dir}")
+        return {
+            'repository': repository,
+            'format': self.file_format,
+            'output_dir': output_dir,
+            'artifacts': {
+                name: {'path': writer.path, 'rows': writer.rows}
+                for name, writer in writers.items()
+            }
+        }
+
+    def _write_commit_datasets(self, repo: Repo, repository: str, writers: Dict[str, _BatchedWriter]):
+        history = writers.get('history')
+        churn = writers.get('churn')
+        contributors = {} if 'contributors' in writers else None
+
+        for header, files in iter_commit_log(repo):
+            insertions = sum(f[1] or 0 for f in files)
+            deletions = sum(f[2] or 0 for f in files)
+
+            if history is not None:
+                history.write({
+                    'repository': repository,
+                    **header,
+                    'files_changed': len(files),
+                    'insertions': insertions,
+                    'deletions': deletions,
+                })
+
+            if churn is not None:
+                for path, file_insertions, file_deletions in files:
+                    churn.write({
+                        'repository': repository,
+                        'hash': header['hash'],
+                        'author_email': header['author_email'],
+                        'committed_date': header['committed_date'],
+                        'path': path,
+                        'insertions': file_insertions,
+                        'deletions': file_deletions,
+                        'binary': file_insertions is None,
+                    })
+
+            if contributors is not None:
+                stats = contributors.get(header['author_email'])
+                if stats is None:
+                    # git log walks newest first, so the first name seen is the latest one
+                    stats = contributors[header['author_email']] = {
+                        'author_name': header['author_name'],
+                        'commits': 0,
+                        'insertions': 0,
+                        'deletions': 0,
+                        'files_changed': 0,
+                        'first_commit': header['committed_date'],
+                        'last_commit': header['committed_date'],
+                    }
+                stats['commits'] += 1
+                stats['insertions'] += insertions
+                stats['deletions'] += deletions
+                stats['files_changed'] += len(files)
+                stats['first_commit'] = min(stats['first_commit'], header['committed_date'])
+                stats['last_commit'] = max(stats['last_commit'], header['committed_date'])
+
+        if contributors is not None:
+            writer = writers['contributors']
+            for email, stats in sorted(contributors.items(), key=lambda item: item[1]['commits'], reverse=True):
+                writer.write({
+                    'repository': repository,
+                    'author_email': email,
+                    'author_name': stats['author_name'],
+                    'commits': stats['commits'],
+                    'insertions': stats['insertions'],
+                    'deletions': stats['deletions'],
+                    'files_changed': stats['files_changed'],
+                    'first_commit': stats['first_commit'],
+                    'last_commit': stats['last_commit'],
+                })
+
+    def _write_languages(self, repository: str, writer: _BatchedWriter, file_list: Iterable[str],
+                         language_map: Dict[str, str]):
+        extensions = Counter(Path(file_path).suffix.lower() for file_path in file_list)
+        for extension, count in extensions.most_common():
+            if extension in language_map:
+                writer.write({
+                    'repository': repository,
+                    'language': language_map[extension],
+                    'extension': extension,
+                    'files': count,
+                })
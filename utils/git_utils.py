@@ -6,7 +6,7 @@ import tempfile
 from collections import Counter, defaultdict
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterator, Optional
 from urllib.parse import urlparse
 
 # import nest_asyncio  # Added import
@@ -165,39 +165,38 @@ class GitUtils:
         Returns:
             list: List of file paths relative to repository root
         """
-        file_list = []
-        repo_path = Path(repo_path)
-
         try:
-            for path in repo_path.rglob('*'):
-                # Skip directories
-                if path.is_dir():
-                    continue
+            return list(self._iter_files(repo_path))
+        except Exception as e:
+            logger.error(f"Error getting file list: {str(e)}")
+            return []
 
-                # Skip .git directory
-                if '.git' in path.parts:
-                    continue
+    def _iter_files(self, repo_path: str) -> Iterator[str]:
+        """Yield the paths listed by get_file_list_helper one at a time, while walking the tree."""
+        repo_path = Path(repo_path)
+        for path in repo_path.rglob('*'):
+            # Skip directories
+            if path.is_dir():
+                continue
 
-                # Skip hidden directories and files
-                if any(part.startswith('.') for part in path.parts):
-                    continue
+            # Skip .git directory
+            if '.git' in path.parts:
+                continue
 
-                # Skip __pycache__ and similar directories
-                if any(part.startswith('__') for part in path.parts):
-                    continue
+            # Skip hidden directories and files
+            if any(part.startswith('.') for part in path.parts):
+                continue
 
-                # Skip files with extensions we want to ignore
-                if path.suffix.lower() in SKIP_EXTENSIONS:
-                    continue
+            # Skip __pycache__ and similar directories
+            if any(part.startswith('__') for part in path.parts):
+                continue
 
-                # Add relative path to the list
-                rel_path = str(path.relative_to(repo_path))
-                file_list.append(rel_path)
+            # Skip files with extensions we want to ignore
+            if path.suffix.lower() in SKIP_EXTENSIONS:
+                continue
 
-            return file_list
-        except Exception as e:
-            logger.error(f"Error getting file list: {str(e)}")
-            return []
+            # Yield the path relative to the repository root
+            yield str(path.relative_to(repo_path))
 
     def get_git_stats(self, repo_path: str) -> Dict[str, Any]:
         """
@@ -554,6 +553,36 @@ class GitUtils:
             logger.error(f"Error searching commits: {str(e)}")
             raise GitHubError(f"Failed to search commits: {str(e)}") from e
 
+    def export_datasets(self, repo_path: str, output_dir: Optional[str] = None,
+                        datasets: Optional[List[str]] = None, file_format: str = "parquet") -> Dict[str, Any]:
+        """
+        Export commit history, churn, contributor and language datasets to columnar files.
+
+        Args:
+            repo_path: Path to the Git repository
+            output_dir: Root directory for the artifacts (default: new temporary directory)
+            datasets: Datasets to export (history, churn, contributors, languages; default: all)
+            file_format: Output format, either 'parquet' or 'arrow'
+
+        Returns:
+            dict: Repository partition name, output directory and per-dataset artifact paths and row counts
+        """
+        try:
+            from utils.git_export import GitDatasetExporter
+
+            exporter = GitDatasetExporter(file_format=file_format)
+            # The working tree is only walked for the languages dataset, streaming its paths
+            wants_languages = not datasets or 'languages' in datasets
+            return exporter.export(repo_path,
+                                   output_dir=output_dir,
+                                   datasets=datasets,
+                                   file_list=self._iter_files(repo_path) if wants_languages else None,
+                                   language_map=LANGUAGE_EXTENSIONS)
+
+        except Exception as e:
+            logger.error(f"Error exporting datasets: {str(e)}")
+            raise GitHubError(f"Failed to export datasets: {str(e)}") from e
+
     def cleanup_repository(self, repo_path: str) -> bool:
         """
         Clean up the cloned repository by removing the temporary directory.
@@ -0,0 +1,232 @@
+"""
+Health Monitor
+Tracks the availability and latency of a remote data source with a background
+probe and with the outcome of real calls, and routes each call either to the remote
+source or to a local fallback: unhealthy sources are skipped without waiting for a
+timeout (the monitor doubles as the source's circuit breaker), and a healthy source
+is left for the local fallback only while it is markedly slower
+"""
+
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+REMOTE = "api"
+LOCAL = "local"
+
+# Circuit breaker view of the health state
+CLOSED = "closed"
+OPEN = "open"
+
+
+class HealthMonitor:
+    """
+    Thread-safe health and latency tracker, and circuit breaker, for a remote source with
+    a local fallback.
+
+    ``probe`` is called from a background thread every ``interval`` seconds once
+    ``start`` is called; its latency is tracked and its result sets the health state.
+    ``failure_threshold`` consecutive failures of real calls (``record_failure``: transport
+    errors, server errors) mark the source unhealthy too, opening the circuit until the
+    next successful probe or call; a failed probe opens it immediately. While it is open,
+    ``allow_request`` rejects calls. Latencies of real calls are tracked per kind of call
+    for both sources as exponentially weighted moving averages.
+
+    ``choose`` picks the local fallback while the remote source is unhealthy, or while
+    its average latency for that kind of call exceeds the local one by more than
+    ``latency_margin_ms``; in that case one call is still sent to the remote source
+    every ``retry_interval`` seconds, so its average follows when it speeds up again.
+
+    Args:
+        name: Name used in logs and stats
+        probe: Callable returning True when the remote source is healthy
+        interval: Seconds between background probes
+        failure_threshold: Consecutive failed calls that mark the source unhealthy
+        latency_margin_ms: How much slower the remote source may be before calls go local
+        retry_interval: Seconds between remote calls while the remote source is too slow
+        smoothing: Weight of the newest sample in the moving averages (0-1]
+    """
+
+    def __init__(self, name: str, probe: Callable[[], bool], interval: float = 5.0, failure_threshold: int = 3,
+                 latency_margin_ms: float = 250.0, retry_interval: float = 30.0, smoothing: float = 0.3):
+        if not 0 < smoothing <= 1:
+            raise ValueError("smoothing must be in (0, 1]")
+        if failure_threshold < 1:
+            raise ValueError("failure_threshold must be at least 1")
+        self.name = name
+        self.probe = probe
+        self.interval = interval
+        self.failure_threshold = failure_threshold
+        self.latency_margin_ms = latency_margin_ms
+        self.retry_interval = retry_interval
+        self.smoothing = smoothing
+
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        # None until the first probe or call outcome: the remote source is tried
+        self._healthy: Optional[bool] = None
+        self._consecutive_failures = 0
+        self._latency: Dict[str, Dict[str, float]] = {REMOTE: {}, LOCAL: {}}
+        self._remote_sampled_at: Dict[str, float] = {}
+
+        self.probe_latency_ms: Optional[float] = None
+        self.probes = 0
+        self.probe_failures = 0
+        self.failures = 0
+        self.successes = 0
+        self.rejected = 0
+        self.times_opened = 0
+        self.routed = {REMOTE: 0, LOCAL: 0}
+        self.last_failure: Optional[str] = None
+        self.last_check: Optional[str] = None
+        self.last_state_change: Optional[str] = None
+
+    @property
+    def healthy(self) -> bool:
+        """Whether the remote source is believed healthy (True until proven otherwise)."""
+        return self._healthy is not False
+
+    def start(self):
+        """Start the background probe, if it is not running yet."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name=f"{self.name}-health", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stop the background probe."""
+        self._stop.set()
+
+    def check(self) -> bool:
+        """Probe the remote source now, updating the health state; returns the result."""
+        started = time.perf_counter()
+        try:
+            healthy = bool(self.probe())
+            error = None
+        except Exception as e:
+            healthy = False
+            error = e
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        with self._lock:
+            self.probes += 1
+            self.last_check = datetime.now().isoformat()
+            if healthy:
+                self.probe_latency_ms = self._average(self.probe_latency_ms, elapsed_ms)
+                self._consecutive_failures = 0
+            else:
+                self.probe_failures += 1
+                self.last_failure = str(error) if error is not None else "probe reported unhealthy"
+            self._set_health(healthy)
+        return healthy
+
+    def allow_request(self) -> bool:
+        """Whether a call may be sent to the remote source: False, counted as rejected, while the circuit is open."""
+        with self._lock:
+            if self._healthy is False:
+                self.rejected += 1
+                return False
+            return True
+
+    def record_success(self):
+        """A real call reached the remote source and was answered."""
+        with self._lock:
+            self.successes += 1
+            self._consecutive_failures = 0
+            self._set_health(True)
+
+    def record_failure(self, error: Any = None):
+        """
+        A real call could not reach the remote source or failed on its side: after
+        failure_threshold consecutive failures stop routing to it until a probe or call succeeds.
+        """
+        with self._lock:
+            self.failures += 1
+            self._consecutive_failures += 1
+            self.last_failure = str(error) if error is not None else None
+            if self._consecutive_failures >= self.failure_threshold:
+                self._set_health(False)
+
+    def record_latency(self, kind: str, source: str, elapsed_ms: float):
+        """A call of the given kind completed on source (REMOTE or LOCAL) in elapsed_ms."""
+        with self._lock:
+            averages = self._latency[source]
+            averages[kind] = self._average(averages.get(kind), elapsed_ms)
+            if source == REMOTE:
+                self._remote_sampled_at[kind] = time.monotonic()
+                self._consecutive_failures = 0
+                self._set_health(True)
+
+    def choose(self, kind: str) -> str:
+        """The source (REMOTE or LOCAL) the next call of this kind should use."""
+        with self._lock:
+            source = self._choose(kind)
+            self.routed[source] += 1
+            return source
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the health state, latency averages and counters."""
+        with self._lock:
+            return {
+                'name': self.name,
+                'healthy': self._healthy,
+                'state': CLOSED if self._healthy is not False else OPEN,
+                'consecutive_failures': self._consecutive_failures,
+                'failure_threshold': self.failure_threshold,
+                'probe_latency_ms': _rounded(self.probe_latency_ms),
+                'latency_ms': {source: {kind: _rounded(value) for kind, value in averages.items()}
+                               for source, averages in self._latency.items()},
+                'routed': dict(self.routed),
+                'probes': self.probes,
+                'probe_failures': self.probe_failures,
+                'failures': self.failures,
+                'successes': self.successes,
+                'rejected': self.rejected,
+                'times_opened': self.times_opened,
+                'last_failure': self.last_failure,
+                'last_check': self.last_check,
+                'last_state_change': self.last_state_change,
+            }
+
+    def _choose(self, kind: str) -> str:
+        # Must be called with the lock held
+        if self._healthy is False:
+            return LOCAL
+        remote = self._latency[REMOTE].get(kind)
+        local = self._latency[LOCAL].get(kind)
+        if remote is None or local is None or remote <= local + self.latency_margin_ms:
+            return REMOTE
+        if time.monotonic() - self._remote_sampled_at.get(kind, 0.0) >= self.retry_interval:
+            # Resample the slow remote source; the call counts as a fresh sample
+            self._remote_sampled_at[kind] = time.monotonic()
+            return REMOTE
+        return LOCAL
+
+    def _average(self, current: Optional[float], sample: float) -> float:
+        if current is None:
+            return sample
+        return current + self.smoothing * (sample - current)
+
+    def _set_health(self, healthy: bool):
+        # Must be called with the lock held
+        if self._healthy is not healthy:
+            logger.info(f"Source '{self.name}' is {'healthy' if healthy else 'unhealthy'}")
+            if not healthy:
+                self.times_opened += 1
+            self._healthy = healthy
+            self.last_state_change = datetime.now().isoformat()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.check()
+            self._stop.wait(self.interval)
+
+
+def _rounded(value: Optional[float]) -> Optional[float]:
+    return round(value, 1) if value is not None else None
@@ -0,0 +1,107 @@
+"""
+JSON helpers
+Fast JSON encoding and decoding with orjson when it is installed (falling back to the
+standard library), plus a decoded-document type that keeps its source bytes so they can
+be passed through without re-encoding
+"""
+
+import dataclasses
+import json
+from typing import Any, Callable, Optional, Union
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; the standard library encoder is used without it
+    orjson = None
+
+
+class JSONDocument(dict):
+    """
+    A decoded JSON object that remembers the bytes it was decoded from.
+
+    Callers use it as a normal dict; serializers can emit ``raw`` directly instead of
+    encoding the dict again. It must not be modified after decoding, or ``raw`` would
+    no longer match its contents.
+    """
+    __slots__ = ("raw", "__weakref__")
+
+    def __init__(self, value: dict, raw: bytes):
+        super().__init__(value)
+        self.raw = raw
+
+
+def _dataclass_default(default: Optional[Callable[[Any], Any]]) -> Callable[[Any], Any]:
+    # orjson encodes dataclasses natively; the standard library encoder needs them as dicts
+    def encode(value: Any) -> Any:
+        if dataclasses.is_dataclass(value) and not isinstance(value, type):
+            return {field.name: getattr(value, field.name) for field in dataclasses.fields(value)}
+        if default is None:
+            raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+        return default(value)
+
+    return encode
+
+
+def dumps(obj: Any, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+    """
+    Encode a value as compact UTF-8 JSON.
+
+    Args:
+        obj: Value to encode
+        default: Called for values the encoder does not support; returns a serializable value
+
+    Returns:
+        bytes: Encoded JSON
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, default=default, option=orjson.OPT_NON_STR_KEYS)
+        except orjson.JSONEncodeError:
+            # e.g. integers beyond 64 bits, which the standard library encoder handles
+            pass
+    return json.dumps(obj, default=_dataclass_default(default), ensure_ascii=False,
+                      separators=(",", ":")).encode("utf-8")
+
+
+def loads(data: Union[bytes, bytearray, str]) -> Any:
+    """Decode JSON from bytes or text."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def loads_document(data: bytes) -> Any:
+    """Decode JSON, returning objects as JSONDocument so their bytes can be passed through."""
+    value = loads(data)
+    return JSONDocument(value, data) if isinstance(value, dict) else value
+
+
+def serialize_result(result: Any) -> str:
+    """
+    Serialize a tool result to JSON text, passing JSONDocument bytes through unchanged.
+    Unsupported values are serialized with str().
+    """
+    if isinstance(result, JSONDocument):
+        return result.raw.decode("utf-8").rstrip("\n")
+    return dumps(result, default=str).decode("utf-8")
+
+
+def with_fields(result: Any, **fields: Any) -> Any:
+    """
+    Return a copy of a JSON object result with extra top-level fields in front, leaving
+    the original (which may be a cached result) unchanged. A JSONDocument stays a
+    JSONDocument: the fields are spliced into its bytes instead of re-encoding it.
+    Values other than dicts are returned unchanged.
+    """
+    if not isinstance(result, dict):
+        return result
+    value = {**fields, **result}
+    if not isinstance(result, JSONDocument):
+        return value
+    raw = result.raw.lstrip()
+    if not raw.startswith(b"{"):
+        return value
+    prefix = dumps(fields)[:-1]
+    rest = raw[1:].lstrip()
+    separator = b"" if rest.startswith(b"}") or not fields else b","
+    return JSONDocument(value, prefix + separator + rest)
@@ -0,0 +1,498 @@
+"""
+Bulk Scan Results
+Vectorized generation of production-sized scan results (10^5 to 10^6 findings or
+components) for load testing the scan server, its filtering and summarization
+paths and the agents on top of them
+
+Every column is drawn at once with NumPy from skewed, realistic distributions
+(severities weighted towards Medium and Low, findings concentrated in a few hot
+files, most components without vulnerabilities, CVSS scores driving severities)
+and the models are built from the columns in one pass. Results have the same schema
+and models as utils.scan_results and are seeded from the tool, identifier,
+revision and scale, so the same inputs always produce the same results.
+"""
+
+import gc
+import os
+from collections import Counter
+from contextlib import contextmanager
+from datetime import timedelta
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; bulk generation is unavailable without it
+    np = None
+
+from utils.cache import DerivableDict, TTLCache, memoize
+from utils.scan_models import (FortifyVulnerability, NexusComponent, NexusVulnerability, PolicyViolation,
+                               SonarIssue, severity_counts)
+from utils.scan_results import (FORTIFY_CATEGORIES, NEXUS_VIOLATION_TYPES, SCAN_CACHE_TTL_SECONDS,
+                                SONAR_ISSUE_TYPES, consolidate_scan_results, scan_base_date, scan_seed)
+from utils.scanners import SEVERITY_LEVELS, scanners
+
+# Largest accepted scale (findings or components per tool)
+MAX_SCALE = int(os.environ.get("SCAN_MAX_SCALE", 2_000_000))
+
+# Bulk results are large, so only a few are kept (one consolidated result holds one per tool)
+BULK_CACHE_MAXSIZE = 8
+
+bulk_results_cache = TTLCache(maxsize=BULK_CACHE_MAXSIZE, ttl=SCAN_CACHE_TTL_SECONDS)
+
+# Probabilities of SEVERITY_LEVELS for Sonar issues and Fortify vulnerabilities
+SONAR_SEVERITY_WEIGHTS = (0.02, 0.08, 0.30, 0.40, 0.20)
+FORTIFY_SEVERITY_WEIGHTS = (0.05, 0.20, 0.40, 0.25, 0.10)
+
+# Technical debt ratios (debt minutes per 30 minutes per line) up to which the
+# maintainability rating is A, B, C and D; E beyond
+MAINTAINABILITY_THRESHOLDS = (0.05, 0.1, 0.2, 0.5)
+
+# Probabilities of SONAR_ISSUE_TYPES
+SONAR_TYPE_WEIGHTS = (0.55, 0.15, 0.05, 0.05, 0.12, 0.08)
+
+SONAR_MESSAGES = (
+    "Potential SQL injection vulnerability",
+    "Unused import should be removed",
+    "Method complexity is too high",
+    "Hardcoded credentials detected",
+    "Potential XSS vulnerability",
+    "Memory leak possible",
+    "Dead code should be removed"
+)
+SONAR_MESSAGE_WEIGHTS = (0.05, 0.30, 0.20, 0.02, 0.05, 0.08, 0.30)
+
+# Probabilities of FORTIFY_CATEGORIES, and each category's CWE id and OWASP category
+FORTIFY_CATEGORY_WEIGHTS = (0.18, 0.12, 0.14, 0.05, 0.02, 0.04, 0.02, 0.05, 0.12, 0.10, 0.08, 0.08)
+FORTIFY_CATEGORY_CWES = (79, 89, 22, 78, 90, 91, 120, 99, 359, 328, 330, 501)
+FORTIFY_CATEGORY_OWASP = ("A03:2021", "A03:2021", "A01:2021", "A03:2021", "A03:2021", "A03:2021",
+                          "A06:2021", "A03:2021", "A04:2021", "A02:2021", "A02:2021", "A04:2021")
+
+FORTIFY_FUNCTIONS = ("authenticate", "processInput", "executeQuery", "validateUser", "encryptData",
+                     "handleRequest", "loadConfig", "renderView", "parsePayload", "writeAudit")
+FORTIFY_DESCRIPTIONS = (
+    "User input is not properly validated before being used in SQL query",
+    "Data from user input is not encoded before output to web page",
+    "File path constructed from user input without proper validation",
+    "Cryptographic hash function is weak and vulnerable to attacks",
+    "Random number generator is not cryptographically secure"
+)
+
+SOURCE_MODULES = ("web", "service", "dao", "util", "api", "auth", "billing", "search", "admin", "core")
+SOURCE_CLASSES = ("UserController", "AuthService", "DatabaseDAO", "ValidationUtil", "OrderService",
+                  "PaymentGateway", "SessionManager", "ReportBuilder", "CacheClient", "EventPublisher")
+
+# Component types with their probabilities and popular package names
+NEXUS_TYPE_PACKAGES = {
+    "npm": (0.40, ("lodash", "express", "react", "axios", "moment", "webpack", "chalk", "debug", "uuid", "yargs")),
+    "maven": (0.30, ("org.apache.commons:commons-lang3", "org.apache.httpcomponents:httpclient",
+                     "org.apache.logging.log4j:log4j-core", "com.fasterxml.jackson.core:jackson-databind",
+                     "org.springframework:spring-core", "com.google.guava:guava")),
+    "pypi": (0.15, ("requests", "django", "flask", "numpy", "pandas", "urllib3", "pyyaml", "jinja2")),
+    "nuget": (0.10, ("Newtonsoft.Json", "Microsoft.AspNetCore", "Serilog", "Dapper", "AutoMapper")),
+    "docker": (0.05, ("alpine", "ubuntu", "nginx", "node", "python")),
+}
+
+# Licenses with their probabilities and Nexus license threat levels
+NEXUS_LICENSES = (
+    ("MIT", 0.35, "None"), ("Apache-2.0", 0.28, "None"), ("BSD-3-Clause", 0.10, "None"), ("ISC", 0.07, "None"),
+    ("GPL-3.0", 0.05, "High"), ("LGPL-2.1", 0.05, "Medium"), ("MPL-2.0", 0.04, "Medium"),
+    ("EPL-1.0", 0.04, "Medium"), ("Unlicense", 0.02, "Low"),
+)
+
+NEXUS_SUMMARIES = (
+    "Remote code execution vulnerability",
+    "Cross-site scripting vulnerability",
+    "Denial of service vulnerability",
+    "Information disclosure vulnerability",
+    "Authentication bypass"
+)
+
+# Mean vulnerabilities per component; counts are negative binomial, so most components have none
+NEXUS_MEAN_VULNERABILITIES = 0.6
+NEXUS_VULNERABILITY_DISPERSION = 0.3
+
+# Policy violations per component
+NEXUS_VIOLATION_RATE = 0.05
+
+
+@contextmanager
+def _collection_paused():
+    """
+    Pause the cyclic garbage collector while models are built: millions of new container
+    objects would otherwise trigger repeated full collections that find nothing to free.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def validate_scale(scale: Any) -> int:
+    """
+    Check a requested scale.
+
+    Returns:
+        int: The scale as an integer
+
+    Raises:
+        ValueError: If the scale is not an integer between 1 and MAX_SCALE, or numpy is missing
+    """
+    try:
+        scale = int(scale)
+    except (TypeError, ValueError):
+        raise ValueError("scale must be an integer")
+    if not 1 <= scale <= MAX_SCALE:
+        raise ValueError(f"scale must be between 1 and {MAX_SCALE}")
+    if np is None:
+        raise ValueError("scale requires numpy, which is not installed")
+    return scale
+
+
+def _rng(tool: str, identifier: str, revision: Optional[str], scale: int):
+    return np.random.default_rng([scan_seed(tool, identifier, revision), scale])
+
+
+def _pick(rng, values: Sequence[Any], size: int, weights: Optional[Sequence[float]] = None) -> List[Any]:
+    """size values drawn from values (with the given probabilities) as a list"""
+    indexes = rng.choice(len(values), size=size, p=_normalized(weights))
+    return _take(values, indexes)
+
+
+def _take(values: Sequence[Any], indexes) -> List[Any]:
+    return np.asarray(values, dtype=object)[indexes].tolist()
+
+
+def _normalized(weights: Optional[Sequence[float]]):
+    if weights is None:
+        return None
+    weights = np.asarray(weights, dtype=float)
+    return weights / weights.sum()
+
+
+def _dates(rng, days_back: int, size: int) -> List[str]:
+    """ISO dates up to days_back days before the base date, as generate_random_date produces them"""
+    base_date = scan_base_date()
+    table = [(base_date - timedelta(days=days)).isoformat() for days in range(days_back + 1)]
+    return _take(table, rng.integers(0, days_back + 1, size))
+
+
+def _hot_indexes(rng, pool: int, size: int):
+    """Indexes into a pool with a Zipf-like skew: a few entries get most of the draws"""
+    return (rng.zipf(1.3, size) - 1) % pool
+
+
+def _source_files(rng, size: int, extension: str = "java") -> List[str]:
+    # Roughly 4 * sqrt(size) distinct files, with findings concentrated in a few of them
+    pool = max(10, int(4 * size ** 0.5))
+    paths = [f"src/main/java/com/example/{SOURCE_MODULES[index % len(SOURCE_MODULES)]}/"
+             f"{SOURCE_CLASSES[index // len(SOURCE_MODULES) % len(SOURCE_CLASSES)]}{index}.{extension}"
+             for index in range(pool)]
+    return _take(paths, _hot_indexes(rng, pool, size))
+
+
+def _unique_ids(rng, size: int) -> List[str]:
+    # An odd multiplier permutes 32-bit integers, so ids never collide within a result
+    offset = int(rng.integers(0, 2 ** 32))
+    ids = (np.arange(size, dtype=np.uint64) * np.uint64(2654435761) + np.uint64(offset)) % np.uint64(2 ** 32)
+    return [f"{value:08x}" for value in ids.tolist()]
+
+
+def _scan_uuid(rng) -> str:
+    return "".join(f"{value:016x}" for value in rng.integers(0, 2 ** 63, 2).tolist())
+
+
+def _severity_counter(indexes) -> Counter:
+    counts = np.bincount(indexes, minlength=len(SEVERITY_LEVELS)).tolist()
+    return Counter(dict(zip(SEVERITY_LEVELS, counts)))
+
+
+def generate_bulk_sonar_scan_results(project_key: str, revision: Optional[str], scale: int) -> Dict[str, Any]:
+    """
+    Generate SonarQube scan results with scale issues.
+    """
+    rng = _rng("sonar", project_key, revision, scale)
+    severity_indexes = rng.choice(len(SEVERITY_LEVELS), size=scale, p=_normalized(SONAR_SEVERITY_WEIGHTS))
+    type_indexes = rng.choice(len(SONAR_ISSUE_TYPES), size=scale, p=_normalized(SONAR_TYPE_WEIGHTS))
+    lines = np.clip(rng.lognormal(4.0, 1.0, scale), 1, 5000).astype(np.int64).tolist()
+    efforts = np.clip(rng.lognormal(3.0, 0.8, scale), 1, 480).astype(np.int64)
+    debts = rng.integers(1, 9, scale)
+
+    issues = list(map(
+        SonarIssue,
+        [f"sonar-{value}" for value in _unique_ids(rng, scale)],
+        _take(SONAR_ISSUE_TYPES, type_indexes),
+        _take(SEVERITY_LEVELS, severity_indexes),
+        _source_files(rng, scale),
+        lines,
+        _pick(rng, SONAR_MESSAGES, scale, SONAR_MESSAGE_WEIGHTS),
+        _take([f"{minutes}min" for minutes in range(481)], efforts),
+        _take([f"{hours}h" for hours in range(9)], debts),
+        _dates(rng, 7, scale),
+    ))
+
+    vulnerability_issues = int(np.count_nonzero(type_indexes == SONAR_ISSUE_TYPES.index("Vulnerability")))
+    lines_of_code = int(scale * rng.integers(20, 60))
+    coverage = round(float(rng.uniform(40, 95)), 1)
+    debt_hours = int(efforts.sum()) // 60
+    debt_ratio = int(efforts.sum()) / (lines_of_code * 30)
+    worst_vulnerability = int(severity_indexes[type_indexes == SONAR_ISSUE_TYPES.index("Vulnerability")]
+                              .min(initial=len(SEVERITY_LEVELS)))
+    gate_status = "FAILED" if vulnerability_issues or coverage < 80 else "PASSED"
+    return {
+        "scan_id": f"sonar-{_scan_uuid(rng)}",
+        "project_key": project_key,
+        "project_name": f"Project {project_key.title()}",
+        "scan_date": _dates(rng, 1, 1)[0],
+        "status": "Completed",
+        "metrics": {
+            "lines_of_code": lines_of_code,
+            "coverage": coverage,
+            "duplicated_lines_density": round(float(rng.uniform(0, 15)), 1),
+            "maintainability_rating": "ABCDE"[int(np.searchsorted(MAINTAINABILITY_THRESHOLDS, debt_ratio))],
+            "reliability_rating": "ABCDE"[int(rng.integers(0, 5))],
+            # As in SonarQube: E for a Critical vulnerability down to A for none
+            "security_rating": ("EDCBA" + "A")[worst_vulnerability],
+            "technical_debt": f"{debt_hours}h"
+        },
+        "issues": issues,
+        "issue_counts": severity_counts(_severity_counter(severity_indexes)),
+        "quality_gate": {
+            "status": gate_status,
+            "conditions": [
+                {
+                    "metric": "coverage",
+                    "operator": "LT",
+                    "threshold": "80.0",
+                    "actual_value": str(coverage),
+                    "status": "PASSED" if coverage >= 80 else "FAILED"
+                },
+                {
+                    "metric": "new_vulnerabilities",
+                    "operator": "GT",
+                    "threshold": "0",
+                    "actual_value": str(vulnerability_issues),
+                    "status": "FAILED" if vulnerability_issues else "PASSED"
+                }
+            ]
+        },
+        "dashboard_url": f"https://sonarqube.company.com/dashboard?id={project_key}"
+    }
+
+
+def generate_bulk_fortify_scan_results(application_name: str, revision: Optional[str],
+                                       scale: int) -> Dict[str, Any]:
+    """
+    Generate Fortify scan results with scale vulnerabilities.
+    """
+    rng = _rng("fortify", application_name, revision, scale)
+    severity_indexes = rng.choice(len(SEVERITY_LEVELS), size=scale, p=_normalized(FORTIFY_SEVERITY_WEIGHTS))
+    category_indexes = rng.choice(len(FORTIFY_CATEGORIES), size=scale, p=_normalized(FORTIFY_CATEGORY_WEIGHTS))
+
+    vulnerabilities = list(map(
+        FortifyVulnerability,
+        [f"fortify-{value}" for value in _unique_ids(rng, scale)],
+        _take(FORTIFY_CATEGORIES, category_indexes),
+        _take(SEVERITY_LEVELS, severity_indexes),
+        _pick(rng, ("High", "Medium", "Low"), scale, (0.3, 0.5, 0.2)),
+        np.round(rng.uniform(1, 5, scale), 1).tolist(),
+        np.round(rng.uniform(1, 5, scale), 1).tolist(),
+        _source_files(rng, scale),
+        np.clip(rng.lognormal(4.0, 1.0, scale), 1, 5000).astype(np.int64).tolist(),
+        _take(FORTIFY_FUNCTIONS, _hot_indexes(rng, len(FORTIFY_FUNCTIONS), scale)),
+        _pick(rng, FORTIFY_DESCRIPTIONS, scale),
+        ["Implement proper input validation and output encoding"] * scale,
+        _take(FORTIFY_CATEGORY_CWES, category_indexes),
+        _take(FORTIFY_CATEGORY_OWASP, category_indexes),
+        _dates(rng, 30, scale),
+        _dates(rng, 3, scale),
+    ))
+
+    category_counts = np.bincount(category_indexes, minlength=len(FORTIFY_CATEGORIES)).tolist()
+    scan_duration = int(scale // 50 + rng.integers(300, 3600))
+    critical_share = float(np.count_nonzero(severity_indexes <= 1)) / scale
+    return {
+        "scan_id": f"fortify-{_scan_uuid(rng)}",
+        "application_name": application_name,
+        "version": f"v{rng.integers(1, 11)}.{rng.integers(0, 10)}.{rng.integers(0, 10)}",
+        "scan_date": _dates(rng, 1, 1)[0],
+        "status": "Completed",
+        "scan_statistics": {
+            "total_files_scanned": max(10, int(4 * scale ** 0.5)),
+            "lines_of_code": int(scale * rng.integers(50, 200)),
+            "scan_duration_seconds": scan_duration,
+            "scan_duration_formatted": f"{scan_duration // 60}m {scan_duration % 60}s",
+            "fortify_version": f"22.{rng.integers(1, 3)}.{rng.integers(0, 4)}"
+        },
+        "vulnerabilities": vulnerabilities,
+        "vulnerability_counts": severity_counts(_severity_counter(severity_indexes)),
+        "category_breakdown": {category: count for category, count in zip(FORTIFY_CATEGORIES, category_counts)
+                               if count},
+        "risk_metrics": {
+            "fortify_priority_order": round(1 + 4 * critical_share, 2),
+            "business_criticality": "High" if critical_share > 0.2 else "Medium",
+            "overall_risk_score": round(1 + 9 * critical_share, 1)
+        },
+        "dashboard_url": f"https://fortify.company.com/ssc/html/ssc/index.jsp#!/version/{rng.integers(1000, 10000)}/fix"
+    }
+
+
+def generate_bulk_nexus_scan_results(repository_name: str, revision: Optional[str], scale: int) -> Dict[str, Any]:
+    """
+    Generate Nexus IQ scan results with scale components.
+    """
+    rng = _rng("nexus", repository_name, revision, scale)
+
+    # Vulnerabilities: CVSS scores skewed high, severities derived from them
+    dispersion = NEXUS_VULNERABILITY_DISPERSION
+    counts = rng.negative_binomial(dispersion, dispersion / (dispersion + NEXUS_MEAN_VULNERABILITIES), scale)
+    total = int(counts.sum())
+    cvss = np.clip(np.round(rng.beta(5, 2.5, total) * 10, 1), 0.1, 10.0)
+    # Index into SEVERITY_LEVELS: Critical from 9.0, High from 7.0, Medium from 4.0, else Low
+    severity_indexes = 3 - np.digitize(cvss, (4.0, 7.0, 9.0))
+    years = rng.choice(np.arange(2015, 2026), size=total, p=_normalized(np.arange(1, 12)))
+    numbers = rng.integers(1000, 60000, total)
+    vulnerabilities = list(map(
+        NexusVulnerability,
+        [f"CVE-{year}-{number}" for year, number in zip(years.tolist(), numbers.tolist())],
+        cvss.tolist(),
+        _take(SEVERITY_LEVELS, severity_indexes),
+        _pick(rng, NEXUS_SUMMARIES, total),
+        _dates(rng, 3 * 365, total),
+        _dates(rng, 30, total),
+    ))
+
+    # Components: popular packages repeat at several versions
+    types = list(NEXUS_TYPE_PACKAGES)
+    type_indexes = rng.choice(len(types), size=scale, p=_normalized([NEXUS_TYPE_PACKAGES[t][0] for t in types]))
+    names = [name for component_type in types for name in NEXUS_TYPE_PACKAGES[component_type][1]]
+    name_counts = np.array([len(NEXUS_TYPE_PACKAGES[component_type][1]) for component_type in types])
+    name_offsets = np.concatenate(([0], np.cumsum(name_counts)[:-1]))
+    name_indexes = name_offsets[type_indexes] + rng.integers(0, 2 ** 31, scale) % name_counts[type_indexes]
+    variants = _hot_indexes(rng, max(1, scale // 10), scale).tolist()
+    package_names = [name if variant == 0 else f"{name}-{variant}"
+                     for name, variant in zip(_take(names, name_indexes), variants)]
+    versions = [f"{major}.{minor}.{patch}" for major, minor, patch in zip(
+        np.minimum(rng.geometric(0.4, scale), 12).tolist(), rng.integers(0, 21, scale).tolist(),
+        rng.integers(0, 11, scale).tolist())]
+    license_indexes = rng.choice(len(NEXUS_LICENSES), size=scale, p=_normalized([l[1] for l in NEXUS_LICENSES]))
+    threat_levels = _take([l[2] for l in NEXUS_LICENSES], license_indexes)
+    ages = np.clip(rng.gamma(2.0, 10.0, scale), 1, 120).astype(np.int64)
+    violation_counts = rng.binomial(3, NEXUS_VIOLATION_RATE + 0.15 * (counts > 0))
+
+    # Highest CVSS per component; components without vulnerabilities add no elements,
+    # so the segments between the starts of vulnerable components are exactly theirs
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    vulnerable = counts > 0
+    highest = np.zeros(scale)
+    if total:
+        highest[vulnerable] = np.maximum.reduceat(cvss, starts[vulnerable])
+
+    type_names = _take(types, type_indexes)
+    no_vulnerabilities: List[NexusVulnerability] = []
+    component_ids = _unique_ids(rng, scale)
+    components = list(map(
+        NexusComponent,
+        [f"{component_type}-{value}" for component_type, value in zip(type_names, component_ids)],
+        package_names,
+        versions,
+        type_names,
+        _take([l[0] for l in NEXUS_LICENSES], license_indexes),
+        (rng.random(scale) < 0.25).tolist(),
+        # Results are read-only, so components without vulnerabilities share one empty list
+        [vulnerabilities[start:start + count] if count else no_vulnerabilities
+         for start, count in zip(starts.tolist(), counts.tolist())],
+        counts.tolist(),
+        highest.tolist(),
+        violation_counts.tolist(),
+        threat_levels,
+        ages.tolist(),
+    ))
+
+    # One listed policy violation per counted component violation
+    violators = np.repeat(np.arange(scale), violation_counts)
+    violation_total = len(violators)
+    policy_violations = list(map(
+        PolicyViolation,
+        [f"policy-{value}" for value in _unique_ids(rng, violation_total)],
+        _pick(rng, NEXUS_VIOLATION_TYPES, violation_total, (0.5, 0.3, 0.1, 0.1)),
+        _pick(rng, SEVERITY_LEVELS, violation_total, FORTIFY_SEVERITY_WEIGHTS),
+        _pick(rng, ("Critical Security Policy", "License Compliance Policy", "Architecture Standards",
+                    "Component Quality Policy"), violation_total),
+        _take(package_names, violators),
+        _pick(rng, ("Component has critical security vulnerabilities", "License is not approved for commercial use",
+                    "Component violates architecture standards", "Component quality metrics below threshold"),
+              violation_total),
+        _dates(rng, 14, violation_total),
+    ))
+
+    severities = _severity_counter(severity_indexes)
+    license_counts = np.bincount(license_indexes, minlength=len(NEXUS_LICENSES)).tolist()
+    open_policy_violations = sum(1 for violation in policy_violations if violation.severity in ("Critical", "High"))
+    return {
+        "scan_id": f"nexus-{_scan_uuid(rng)}",
+        "repository_name": repository_name,
+        "application_name": f"App-{repository_name}",
+        "scan_date": _dates(rng, 1, 1)[0],
+        "status": "Completed",
+        "stage": "build",
+        "summary": {
+            "total_components": scale,
+            "components_with_vulnerabilities": int(np.count_nonzero(vulnerable)),
+            "total_vulnerabilities": total,
+            "critical_vulnerabilities": severities["Critical"],
+            "high_vulnerabilities": severities["High"],
+            "policy_violations": violation_total,
+            "license_issues": sum(1 for level in threat_levels if level in ("Medium", "High"))
+        },
+        "components": components,
+        "policy_violations": policy_violations,
+        "risk_metrics": {
+            "application_risk_score": round(float(highest.max(initial=0)) * 10, 1),
+            "policy_evaluation": "Fail" if open_policy_violations else "Warn" if violation_total else "Pass",
+            "open_policy_violations": open_policy_violations,
+            "legacy_components": int(np.count_nonzero(ages > 24))
+        },
+        "license_summary": {license[0]: count for license, count in zip(NEXUS_LICENSES, license_counts) if count},
+        "dashboard_url": f"https://nexus-iq.company.com/ui/links/application/{repository_name}/report/"
+                         f"{_scan_uuid(rng)[:8]}"
+    }
+
+
+BULK_GENERATORS: Dict[str, Callable[[str, Optional[str], int], Dict[str, Any]]] = {
+    "sonar": generate_bulk_sonar_scan_results,
+    "fortify": generate_bulk_fortify_scan_results,
+    "nexus": generate_bulk_nexus_scan_results,
+}
+
+
+@memoize(bulk_results_cache)
+def get_bulk_scan_results(tool: str, identifier: str, revision: Optional[str] = None,
+                          scale: int = 100_000) -> Dict[str, Any]:
+    """
+    Bulk scan results of one tool, or consolidated results of every tool ("all"),
+    each tool with scale findings (Sonar, Fortify) or components (Nexus).
+
+    Args:
+        tool: "sonar", "fortify", "nexus" or "all"
+        identifier: Project key, application name, repository name or project identifier
+        revision: Optional scan revision; each revision yields different, stable results
+        scale: Findings or components per tool (see validate_scale)
+
+    Returns:
+        dict: Results in the schema of the tool's get_*_scan_results_impl
+
+    Raises:
+        ValueError: For an unknown tool or invalid scale
+    """
+    scale = validate_scale(scale)
+    if tool == "all":
+        return consolidate_scan_results(identifier, {adapter.name: get_bulk_scan_results(
+            adapter.name, identifier, revision, scale) for adapter in scanners() if adapter.name in BULK_GENERATORS})
+    if tool not in BULK_GENERATORS:
+        raise ValueError(f"Unknown tool '{tool}'. Available tools: {', '.join([*BULK_GENERATORS, 'all'])}")
+    with _collection_paused():
+        # Derived summaries, indexes and ETags are released with the results once evicted
+        return DerivableDict(BULK_GENERATORS[tool](identifier, revision, scale))
@@ -0,0 +1,235 @@
+"""
+Scan Result Condenser
+Condenses scan results into a compact report that fits a token budget for LLM
+consumption: findings are deduplicated by rule and component, grouped by rule,
+ranked by severity and kept with a few representative examples, on top of an
+overview of the gate and severity counts a go / no-go decision needs
+"""
+
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from utils.json_utils import dumps
+from utils.scan_summary import SUMMARIZERS
+from utils.scanners import SEVERITY_LEVELS, get_scanner
+
+DEFAULT_TOKEN_BUDGET = 4000
+MIN_TOKEN_BUDGET = 500
+MAX_TOKEN_BUDGET = 200000
+
+# Token estimate for compact JSON: roughly four characters per token for typical tokenizers
+CHARS_PER_TOKEN = 4
+
+DEFAULT_EXAMPLES = 2
+MAX_EXAMPLES = 10
+
+# Lines listed per example component
+MAX_EXAMPLE_LINES = 5
+
+CONDENSED_TOOLS = ("sonar", "fortify", "nexus")
+
+_SEVERITY_RANK = {severity: rank for rank, severity in enumerate(SEVERITY_LEVELS)}
+_UNRANKED = len(SEVERITY_LEVELS)
+
+# A finding as (rule, component, severity, score, line, detail, extra group fields)
+Occurrence = Tuple[str, str, str, float, Optional[int], Optional[str], Dict[str, Any]]
+
+
+def _sonar_occurrences(results: Dict[str, Any]) -> Iterable[Occurrence]:
+    for issue in results["issues"]:
+        yield (f"{issue['type']}: {issue['message']}", issue["component"], issue["severity"], 0.0,
+               issue["line"], None, {"type": issue["type"]})
+
+
+def _fortify_occurrences(results: Dict[str, Any]) -> Iterable[Occurrence]:
+    for vulnerability in results["vulnerabilities"]:
+        yield (vulnerability["category"], vulnerability["file_path"], vulnerability["severity"],
+               vulnerability["impact"] * vulnerability["likelihood"], vulnerability["line_number"],
+               vulnerability["function_name"], {"cwe_id": vulnerability["cwe_id"]})
+
+
+def _nexus_occurrences(results: Dict[str, Any]) -> Iterable[Occurrence]:
+    for component in results["components"]:
+        name = f"{component['package_name']}@{component['version']}"
+        for vulnerability in component["vulnerabilities"]:
+            yield (vulnerability["cve_id"], name, vulnerability["severity"], vulnerability["cvss_score"], None,
+                   vulnerability["summary"], {"cvss_score": vulnerability["cvss_score"]})
+
+
+OCCURRENCES: Dict[str, Callable[[Dict[str, Any]], Iterable[Occurrence]]] = {
+    "sonar": _sonar_occurrences,
+    "fortify": _fortify_occurrences,
+    "nexus": _nexus_occurrences,
+}
+
+
+def group_findings(tool: str, results: Dict[str, Any], examples: int = DEFAULT_EXAMPLES) -> List[Dict[str, Any]]:
+    """
+    Group one tool's findings by rule in a single pass, deduplicating repeats of a rule
+    in the same component, and rank the groups worst first.
+
+    Args:
+        tool: sonar, fortify or nexus
+        results: The tool's scan results
+        examples: Representative components kept per group (the worst and most frequent)
+
+    Returns:
+        list: Groups with the worst severity, finding and component counts and examples
+    """
+    groups: Dict[str, Dict[str, Any]] = {}
+    for rule, component, severity, score, line, detail, extra in OCCURRENCES[tool](results):
+        rank = _SEVERITY_RANK.get(severity, _UNRANKED)
+        group = groups.get(rule)
+        if group is None:
+            group = groups[rule] = {"rank": rank, "score": score, "count": 0, "extra": extra, "components": {}}
+        elif (rank, -score) < (group["rank"], -group["score"]):
+            group["rank"], group["score"], group["extra"] = rank, score, extra
+        group["count"] += 1
+
+        seen = group["components"].get(component)
+        if seen is None:
+            seen = group["components"][component] = {"rank": rank, "severity": severity, "occurrences": 0,
+                                                     "lines": [], "detail": detail}
+        elif rank < seen["rank"]:
+            seen["rank"], seen["severity"] = rank, severity
+        seen["occurrences"] += 1
+        if line is not None and len(seen["lines"]) < MAX_EXAMPLE_LINES and line not in seen["lines"]:
+            seen["lines"].append(line)
+
+    ranked = sorted(groups.items(), key=lambda item: (item[1]["rank"], -item[1]["score"], -item[1]["count"], item[0]))
+    condensed = []
+    for rule, group in ranked:
+        components = sorted(group["components"].items(),
+                            key=lambda item: (item[1]["rank"], -item[1]["occurrences"], item[0]))
+        condensed.append({
+            "tool": tool,
+            "rule": rule,
+            "severity": SEVERITY_LEVELS[group["rank"]] if group["rank"] < _UNRANKED else None,
+            **group["extra"],
+            "findings": group["count"],
+            "components": len(components),
+            "examples": [_example(component, seen) for component, seen in components[:examples]],
+        })
+    return condensed
+
+
+def _example(component: str, seen: Dict[str, Any]) -> Dict[str, Any]:
+    example = {"component": component, "severity": seen["severity"], "occurrences": seen["occurrences"]}
+    if seen["lines"]:
+        example["lines"] = sorted(seen["lines"])
+    if seen["detail"]:
+        example["detail"] = seen["detail"]
+    return example
+
+
+def _tool_overview(tool: str, results: Dict[str, Any]) -> Dict[str, Any]:
+    """Status, counts and gate of one tool, without per-finding or per-component detail"""
+    # Uncached: condensed results are usually fresh objects that a derived cache would only pin
+    summary = SUMMARIZERS[tool](results, 0)
+    overview = {
+        "scan_date": summary["scan_date"],
+        "status": summary["status"],
+        "severity_counts": summary["severity_counts"],
+    }
+    if tool == "sonar":
+        overview["quality_gate"] = summary["quality_gate"]
+        overview["ratings"] = {name: value for name, value in summary["metrics"].items() if name.endswith("_rating")}
+        overview["coverage"] = summary["metrics"]["coverage"]
+    elif tool == "fortify":
+        overview["risk_metrics"] = summary["risk_metrics"]
+    else:
+        overview["components_with_vulnerabilities"] = summary["components_with_vulnerabilities"]
+        overview["policy_violations"] = summary["policy_violations"]
+        overview["policy_evaluation"] = summary["risk_metrics"]["policy_evaluation"]
+    return overview
+
+
+def _tool_results(tool: str, results: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    if tool != "all":
+        return {tool: results}
+    present = {}
+    for name in CONDENSED_TOOLS:
+        tool_results = results.get(get_scanner(name).result_key)
+        if tool_results is not None:
+            present[name] = tool_results
+    return present
+
+
+def _tokens(value: Any) -> int:
+    return -(-len(dumps(value)) // CHARS_PER_TOKEN)
+
+
+def _omitted(groups: List[Dict[str, Any]]) -> Dict[str, Any]:
+    severities = dict.fromkeys((severity.lower() for severity in SEVERITY_LEVELS), 0)
+    for group in groups:
+        if group["severity"] is not None:
+            severities[group["severity"].lower()] += group["findings"]
+    return {"groups": len(groups), "findings": sum(group["findings"] for group in groups),
+            "worst_severity_counts": {severity: count for severity, count in severities.items() if count}}
+
+
+def condense_results(tool: str, results: Dict[str, Any], token_budget: int = DEFAULT_TOKEN_BUDGET,
+                     examples: int = DEFAULT_EXAMPLES, fields: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Condense one tool's results, or consolidated results when tool is "all", into a report
+    whose compact JSON fits token_budget (estimated at CHARS_PER_TOKEN characters per token).
+
+    The overview (status, severity counts, quality gate and policy status) is always kept.
+    Finding groups are added worst first, each with its examples; a group that does not fit
+    is added without examples, and once even that does not fit the remaining groups are only
+    counted under "omitted".
+
+    Args:
+        tool: sonar, fortify, nexus or all
+        results: Results to condense
+        token_budget: Target size of the report in tokens
+        examples: Representative components per finding group
+        fields: Extra fields added to the report as they are, counted against the budget
+
+    Returns:
+        dict: The condensed report
+
+    Raises:
+        ValueError: If the tool, budget or example count is invalid
+    """
+    token_budget, examples = int(token_budget), int(examples)
+    if not MIN_TOKEN_BUDGET <= token_budget <= MAX_TOKEN_BUDGET:
+        raise ValueError(f"token_budget must be between {MIN_TOKEN_BUDGET} and {MAX_TOKEN_BUDGET}")
+    if not 0 <= examples <= MAX_EXAMPLES:
+        raise ValueError(f"examples must be between 0 and {MAX_EXAMPLES}")
+    if tool != "all" and tool not in OCCURRENCES:
+        raise ValueError(f"Unknown tool '{tool}'. Available tools: all, {', '.join(OCCURRENCES)}")
+    tools = _tool_results(tool, results)
+    report = {"tool": tool}
+    if tool == "all":
+        report["project_identifier"] = results["project_identifier"]
+        report["overall"] = results["summary"]
+    report["overview"] = {name: _tool_overview(name, tool_results) for name, tool_results in tools.items()}
+    report.update(fields or {})
+
+    # Worst first across tools, alternating between the tools' rankings within a severity
+    ranked = [(_SEVERITY_RANK.get(group["severity"], _UNRANKED), position, group)
+              for name, tool_results in tools.items()
+              for position, group in enumerate(group_findings(name, tool_results, examples))]
+    groups = [group for _, _, group in sorted(ranked, key=lambda entry: entry[:2])]
+    report["totals"] = {"findings": sum(group["findings"] for group in groups), "groups": len(groups)}
+    report["token_budget"] = token_budget
+    report["estimated_tokens"] = 0
+    report["findings"] = []
+
+    # Room for the report so far plus a worst-case "omitted" block and the final token count
+    used = _tokens(report) + _tokens({"omitted": _omitted(groups)}) + 2
+    kept = 0
+    for group in groups:
+        size = _tokens(group) + 1
+        if used + size > token_budget:
+            group = {**group, "examples": []}
+            size = _tokens(group) + 1
+            if used + size > token_budget:
+                break
+        report["findings"].append(group)
+        used += size
+        kept += 1
+
+    report["omitted"] = _omitted(groups[kept:])
+    report["estimated_tokens"] = _tokens(report)
+    return report
@@ -0,0 +1,133 @@
+"""
+Scan Result Models
+Slot-based dataclasses for the per-finding records of generated scan results
+(Sonar issues, Fortify vulnerabilities, Nexus components and their vulnerabilities,
+Nexus policy violations), plus single-pass aggregation helpers
+
+Models support read-only mapping access (``finding["severity"]``, ``get``, ``in``,
+``keys``) so code written against the dict form keeps working, and serialize as
+JSON objects with their fields in declaration order (orjson encodes dataclasses
+natively).
+"""
+
+from collections import Counter
+from dataclasses import dataclass, fields
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+from utils.scanners import SEVERITY_LEVELS
+
+
+class ScanModel:
+    """Read-only mapping access over a dataclass's fields."""
+    __slots__ = ()
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.__dataclass_fields__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.__dataclass_fields__
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key) if key in self.__dataclass_fields__ else default
+
+    def keys(self) -> Iterable[str]:
+        return self.__dataclass_fields__.keys()
+
+    def items(self) -> Iterator[Tuple[str, Any]]:
+        return ((name, getattr(self, name)) for name in self.__dataclass_fields__)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dict form, converting nested models as well."""
+        return {field.name: _to_plain(getattr(self, field.name)) for field in fields(self)}
+
+
+def _to_plain(value: Any) -> Any:
+    if isinstance(value, ScanModel):
+        return value.to_dict()
+    if isinstance(value, list):
+        return [_to_plain(item) for item in value]
+    return value
+
+
+@dataclass(slots=True)
+class SonarIssue(ScanModel):
+    key: str
+    type: str
+    severity: str
+    component: str
+    line: int
+    message: str
+    effort: str
+    debt: str
+    created_date: str
+
+
+@dataclass(slots=True)
+class FortifyVulnerability(ScanModel):
+    instance_id: str
+    category: str
+    severity: str
+    confidence: str
+    impact: float
+    likelihood: float
+    file_path: str
+    line_number: int
+    function_name: str
+    description: str
+    recommendation: str
+    cwe_id: int
+    owasp_category: str
+    first_detected: str
+    last_seen: str
+
+
+@dataclass(slots=True)
+class NexusVulnerability(ScanModel):
+    cve_id: str
+    cvss_score: float
+    severity: str
+    summary: str
+    published_date: str
+    modified_date: str
+
+
+@dataclass(slots=True)
+class NexusComponent(ScanModel):
+    component_id: str
+    package_name: str
+    version: str
+    type: str
+    license: str
+    direct_dependency: bool
+    vulnerabilities: List[NexusVulnerability]
+    vulnerability_count: int
+    highest_cvss: float
+    policy_violations: int
+    license_threat_level: str
+    age_months: int
+
+
+@dataclass(slots=True)
+class PolicyViolation(ScanModel):
+    violation_id: str
+    type: str
+    severity: str
+    policy_name: str
+    component: str
+    description: str
+    detected_date: str
+
+
+def severity_counts(severities: Counter) -> Dict[str, int]:
+    """
+    Build the severity count summary from a Counter of severities.
+
+    Returns:
+        dict: "total" followed by lowercase severity keys, as in the generated results
+    """
+    counts = {"total": sum(severities.values())}
+    for severity in SEVERITY_LEVELS:
+        counts[severity.lower()] = severities.get(severity, 0)
+    return counts
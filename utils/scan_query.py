@@ -0,0 +1,463 @@
+"""
+Scan Result Queries
+Filtering, field projection and cursor pagination over scan findings, backed by
+per-severity, per-type, per-component and per-CWE indexes that are built once
+per scan result, and vulnerability lookups over Nexus results backed by inverted
+CVE, license, package and severity indexes plus a CVSS-ordered index
+"""
+
+import base64
+import bisect
+import json
+from collections import defaultdict
+from typing import Dict, Any, Callable, Iterable, List, Optional, Tuple, Union
+
+from utils.cache import DerivableDict, TTLCache, derived
+from utils.scan_results import SCAN_CACHE_TTL_SECONDS
+from utils.scanners import scanners
+
+# Finding list queried for each tool
+FINDING_LISTS = {
+    "sonar": "issues",
+    "fortify": "vulnerabilities",
+    "nexus": "components",
+}
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 1000
+
+# Query parameters understood by apply_query
+QUERY_PARAMETERS = ("severity", "type", "component", "cwe", "min_cvss", "fields", "cursor", "limit")
+
+# Filters that a tool's findings cannot be evaluated against
+UNSUPPORTED_FILTERS = {
+    "sonar": ("cwe", "min_cvss"),
+    "fortify": ("min_cvss",),
+    "nexus": ("cwe",),
+}
+
+
+def _severities(tool: str, finding: Dict[str, Any]) -> Iterable[str]:
+    if tool == "nexus":
+        return {v["severity"] for v in finding["vulnerabilities"]}
+    return (finding["severity"],)
+
+
+# Index dimensions: how each tool's findings map onto severity, type, component, CWE and CVSS
+_DIMENSIONS = {
+    "sonar": {
+        "type": lambda f: f["type"],
+        "component": lambda f: f["component"],
+    },
+    "fortify": {
+        "type": lambda f: f["category"],
+        "component": lambda f: f["file_path"],
+        "cwe": lambda f: f["cwe_id"],
+    },
+    "nexus": {
+        "type": lambda f: f["type"],
+        "component": lambda f: f["package_name"],
+        "cvss": lambda f: f["highest_cvss"],
+    },
+}
+
+
+class FindingIndex:
+    """
+    Position indexes over one tool's finding list. Each index maps a normalized value
+    to the ascending list of finding positions carrying it; findings with a CVSS score
+    are additionally kept in score order for threshold lookups.
+    """
+
+    def __init__(self, tool: str, findings: List[Dict[str, Any]]):
+        self.tool = tool
+        self.findings = findings
+        self.by_severity: Dict[str, List[int]] = defaultdict(list)
+        self.by_type: Dict[str, List[int]] = defaultdict(list)
+        self.by_component: Dict[str, List[int]] = defaultdict(list)
+        self.by_cwe: Dict[int, List[int]] = defaultdict(list)
+        self.cvss_scores: List[float] = []
+        self.cvss_positions: List[int] = []
+
+        dimensions = _DIMENSIONS[tool]
+        cvss_pairs = []
+        for position, finding in enumerate(findings):
+            for severity in _severities(tool, finding):
+                self.by_severity[severity.lower()].append(position)
+            self.by_type[str(dimensions["type"](finding)).lower()].append(position)
+            self.by_component[str(dimensions["component"](finding))].append(position)
+            if "cwe" in dimensions:
+                self.by_cwe[int(dimensions["cwe"](finding))].append(position)
+            if "cvss" in dimensions:
+                cvss_pairs.append((dimensions["cvss"](finding), position))
+
+        cvss_pairs.sort()
+        self.cvss_scores = [score for score, _ in cvss_pairs]
+        self.cvss_positions = [position for _, position in cvss_pairs]
+
+    def match(self, severity: Optional[List[str]] = None, finding_type: Optional[List[str]] = None,
+              component: Optional[List[str]] = None, cwe: Optional[List[int]] = None,
+              min_cvss: Optional[float] = None) -> List[int]:
+        """
+        Return the ascending positions of findings matching every given filter.
+        Values within one filter are alternatives; component values match as
+        case-insensitive substrings of the indexed component names.
+        """
+        candidates = []
+        if severity:
+            candidates.append(self._union(self.by_severity, [value.lower() for value in severity]))
+        if finding_type:
+            candidates.append(self._union(self.by_type, [value.lower() for value in finding_type]))
+        if component:
+            needles = [value.lower() for value in component]
+            keys = [key for key in self.by_component if any(needle in key.lower() for needle in needles)]
+            candidates.append(self._union(self.by_component, keys))
+        if cwe:
+            if self.tool != "fortify":
+                raise ValueError(f"CWE filtering is not supported for {self.tool} results")
+            candidates.append(self._union(self.by_cwe, cwe))
+        if min_cvss is not None:
+            if self.tool != "nexus":
+                raise ValueError(f"CVSS filtering is not supported for {self.tool} results")
+            start = bisect.bisect_left(self.cvss_scores, min_cvss)
+            candidates.append(set(self.cvss_positions[start:]))
+
+        if not candidates:
+            return list(range(len(self.findings)))
+        candidates.sort(key=len)
+        matches = candidates[0].intersection(*candidates[1:])
+        return sorted(matches)
+
+    @staticmethod
+    def _union(index: Dict[Any, List[int]], keys: Iterable[Any]) -> set:
+        positions = set()
+        for key in keys:
+            positions.update(index.get(key, ()))
+        return positions
+
+
+# Indexes are built once per memoized result object
+_index_cache = TTLCache(maxsize=256, ttl=SCAN_CACHE_TTL_SECONDS)
+
+
+def get_finding_index(tool: str, results: Dict[str, Any]) -> FindingIndex:
+    """Return the index for a tool's results, building it on first use."""
+    return derived(_index_cache, results, tool, lambda: FindingIndex(tool, results[FINDING_LISTS[tool]]))
+
+
+def _as_list(value: Union[None, str, Iterable[Any]]) -> Optional[List[str]]:
+    if value is None or value == "":
+        return None
+    if isinstance(value, str):
+        return [part.strip() for part in value.split(",") if part.strip()]
+    return [str(part) for part in value]
+
+
+def _number(name: str, value: Any, kind: Callable[[Any], Any] = float) -> Any:
+    # Query parameters arrive as strings; name the offending one when it does not parse
+    if value is None or value == "":
+        return None
+    try:
+        return kind(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} must be {'an integer' if kind is int else 'a number'}, got {value!r}")
+
+
+def _limit(value: Any) -> int:
+    limit = _number("limit", value, int)
+    limit = DEFAULT_PAGE_SIZE if limit is None else limit
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        raise ValueError(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+    return limit
+
+
+def encode_cursor(scan_id: str, position: int) -> str:
+    payload = json.dumps({"scan": scan_id, "after": position}, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(payload).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, scan_id: str) -> int:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        position = int(payload["after"])
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if payload.get("scan") != scan_id:
+        raise ValueError("Cursor belongs to a different scan")
+    return position
+
+
+def query_findings(tool: str, results: Dict[str, Any], severity=None, finding_type=None, component=None,
+                   cwe=None, min_cvss: Optional[float] = None, fields=None, cursor: Optional[str] = None,
+                   limit: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Filter, project and paginate one tool's findings.
+
+    Args:
+        tool: Tool name (sonar, fortify or nexus)
+        results: The tool's scan results
+        severity: Severities to keep (list or comma-separated string)
+        finding_type: Issue types, Fortify categories or Nexus component types to keep
+        component: Component, file path or package name substrings to keep
+        cwe: CWE ids to keep (Fortify only)
+        min_cvss: Minimum highest CVSS score (Nexus only)
+        fields: Fields to keep on each finding (default: all)
+        cursor: Cursor returned by a previous page
+        limit: Page size (default DEFAULT_PAGE_SIZE, at most MAX_PAGE_SIZE)
+
+    Returns:
+        dict: Page items and pagination metadata (total matches and next cursor)
+    """
+    limit = _limit(limit)
+    cwe_values = _as_list(cwe)
+    cwe_ids = [_number("cwe", value, int) for value in cwe_values] if cwe_values else None
+    min_cvss = _number("min_cvss", min_cvss)
+
+    index = get_finding_index(tool, results)
+    matches = index.match(severity=_as_list(severity), finding_type=_as_list(finding_type),
+                          component=_as_list(component), cwe=cwe_ids, min_cvss=min_cvss)
+
+    start = 0
+    if cursor:
+        start = bisect.bisect_right(matches, decode_cursor(cursor, results["scan_id"]))
+    page = matches[start:start + limit]
+
+    projection = _as_list(fields)
+    findings = index.findings
+    if projection:
+        items = [{field: findings[position][field] for field in projection if field in findings[position]}
+                 for position in page]
+    else:
+        items = [findings[position] for position in page]
+
+    has_more = start + limit < len(matches)
+    return {
+        "items": items,
+        "total_matches": len(matches),
+        "returned": len(items),
+        "next_cursor": encode_cursor(results["scan_id"], page[-1]) if has_more else None,
+    }
+
+
+def has_query(params: Dict[str, Any]) -> bool:
+    """Whether any query parameter is set."""
+    return any(params.get(name) not in (None, "") for name in QUERY_PARAMETERS)
+
+
+def apply_query(tool: str, results: Dict[str, Any], params: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Return a copy of a tool's results (or of consolidated results when tool is "all")
+    whose finding list is replaced by the filtered page, with pagination metadata
+    under "page". The cached results themselves are never modified.
+
+    Args:
+        tool: Tool name, or "all" for consolidated results
+        results: Results to query
+        params: Query parameters, see QUERY_PARAMETERS ("type" holds the finding type)
+    """
+    if tool == "all":
+        if params.get("cursor"):
+            raise ValueError("cursor is only supported on single-tool endpoints")
+        filtered = DerivableDict(results)
+        for adapter in scanners():
+            name, key = adapter.name, adapter.result_key
+            # Tools without queryable findings are passed through unfiltered
+            if key not in results or name not in FINDING_LISTS:
+                continue
+            if any(params.get(filter_name) not in (None, "") for filter_name in UNSUPPORTED_FILTERS[name]):
+                # A filter the tool cannot evaluate matches none of its findings
+                page = {"total_matches": 0, "returned": 0, "next_cursor": None}
+                filtered[key] = DerivableDict({**results[key], FINDING_LISTS[name]: [], "page": page})
+            else:
+                filtered[key] = apply_query(name, results[key], params)
+        return filtered
+
+    page = query_findings(tool, results,
+                          severity=params.get("severity"),
+                          finding_type=params.get("type"),
+                          component=params.get("component"),
+                          cwe=params.get("cwe"),
+                          min_cvss=params.get("min_cvss"),
+                          fields=params.get("fields"),
+                          cursor=params.get("cursor"),
+                          limit=params.get("limit"))
+    items = page.pop("items")
+    return DerivableDict({**results, FINDING_LISTS[tool]: items, "page": page})
+
+
+# Parameters of Nexus vulnerability lookups
+NEXUS_QUERY_PARAMETERS = ("cve", "license", "package", "severity", "min_cvss", "max_cvss", "cursor", "limit")
+
+
+class NexusIndex:
+    """
+    Inverted indexes over Nexus results, so vulnerability lookups never walk every
+    component. Every vulnerability is numbered in component order (its reference), and
+    references are kept in ascending order throughout:
+
+    - by_cve / by_severity: CVE id / severity -> vulnerability references
+    - by_license / by_package: license / package name -> component positions
+    - cvss_scores / cvss_refs: every reference in ascending CVSS order, for range lookups
+    - owners / offsets: the component position of each reference, and the first
+      reference of each component
+    """
+
+    def __init__(self, components: List[Any]):
+        self.components = components
+        self.by_cve: Dict[str, List[int]] = defaultdict(list)
+        self.by_severity: Dict[str, List[int]] = defaultdict(list)
+        self.by_license: Dict[str, List[int]] = defaultdict(list)
+        self.by_package: Dict[str, List[int]] = defaultdict(list)
+        self.owners: List[int] = []
+        self.offsets: List[int] = []
+
+        cvss_pairs = []
+        ref = 0
+        for position, component in enumerate(components):
+            self.offsets.append(ref)
+            self.by_license[component["license"].lower()].append(position)
+            self.by_package[component["package_name"].lower()].append(position)
+            for vulnerability in component["vulnerabilities"]:
+                self.by_cve[vulnerability["cve_id"].upper()].append(ref)
+                self.by_severity[vulnerability["severity"].lower()].append(ref)
+                cvss_pairs.append((vulnerability["cvss_score"], ref))
+                self.owners.append(position)
+                ref += 1
+        self.offsets.append(ref)
+
+        cvss_pairs.sort()
+        self.cvss_scores = [score for score, _ in cvss_pairs]
+        self.cvss_refs = [ref for _, ref in cvss_pairs]
+
+    def match(self, cve: Optional[List[str]] = None, license: Optional[List[str]] = None,
+              package: Optional[List[str]] = None, severity: Optional[List[str]] = None,
+              min_cvss: Optional[float] = None, max_cvss: Optional[float] = None
+              ) -> Tuple[List[int], Optional[List[int]]]:
+        """
+        Find matching components and vulnerabilities. Values within one filter are
+        alternatives and match exactly (case-insensitively).
+
+        Returns:
+            tuple: Ascending positions of the matching components, and the ascending
+            references of the matching vulnerabilities, or None when no vulnerability
+            filter (cve, severity, CVSS) is given: then every vulnerability of a matching
+            component matches, and license and package lookups also find components
+            without vulnerabilities
+        """
+        vulnerability_sets = []
+        if cve:
+            vulnerability_sets.append(self._lookup(self.by_cve, [value.upper() for value in cve]))
+        if severity:
+            vulnerability_sets.append(self._lookup(self.by_severity, [value.lower() for value in severity]))
+        if min_cvss is not None or max_cvss is not None:
+            start = bisect.bisect_left(self.cvss_scores, min_cvss) if min_cvss is not None else 0
+            end = bisect.bisect_right(self.cvss_scores, max_cvss) if max_cvss is not None else len(self.cvss_scores)
+            vulnerability_sets.append(sorted(self.cvss_refs[start:end]))
+
+        component_sets = []
+        if license:
+            component_sets.append(self._lookup(self.by_license, [value.lower() for value in license]))
+        if package:
+            component_sets.append(self._lookup(self.by_package, [value.lower() for value in package]))
+        components = self._intersect(component_sets) if component_sets else None
+
+        if not vulnerability_sets:
+            return (components if components is not None else list(range(len(self.components)))), None
+
+        refs = self._intersect(vulnerability_sets)
+        if components is not None:
+            allowed = set(components)
+            owners = self.owners
+            refs = [ref for ref in refs if owners[ref] in allowed]
+        return sorted(set(map(self.owners.__getitem__, refs))), refs
+
+    def vulnerability_count(self, components: List[int]) -> int:
+        """Number of vulnerabilities of the given components."""
+        offsets = self.offsets
+        return sum(offsets[position + 1] - offsets[position] for position in components)
+
+    @staticmethod
+    def _lookup(index: Dict[str, List[int]], keys: List[str]) -> List[int]:
+        if len(keys) == 1:
+            return index.get(keys[0], [])
+        merged = set()
+        for key in keys:
+            merged.update(index.get(key, ()))
+        return sorted(merged)
+
+    @staticmethod
+    def _intersect(candidates: List[List[int]]) -> List[int]:
+        # Each candidate list is ascending
+        if len(candidates) == 1:
+            return candidates[0]
+        candidates = sorted(candidates, key=len)
+        return sorted(set(candidates[0]).intersection(*candidates[1:]))
+
+
+def get_nexus_index(results: Dict[str, Any]) -> NexusIndex:
+    """Return the inverted indexes for Nexus results, building them on first use."""
+    return derived(_index_cache, results, "nexus-inverted", lambda: NexusIndex(results["components"]))
+
+
+def query_nexus_findings(results: Dict[str, Any], cve=None, license=None, package=None, severity=None,
+                         min_cvss: Optional[float] = None, max_cvss: Optional[float] = None,
+                         cursor: Optional[str] = None, limit: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Look up Nexus vulnerabilities and the components they affect, e.g. every component
+    affected by a CVE, every vulnerability with CVSS >= 9 or every GPL-licensed component.
+
+    Args:
+        results: Nexus scan results
+        cve: CVE ids (list or comma-separated string)
+        license: License names
+        package: Exact package names
+        severity: Vulnerability severities
+        min_cvss: Minimum CVSS score (inclusive)
+        max_cvss: Maximum CVSS score (inclusive)
+        cursor: Cursor returned by a previous page
+        limit: Components per page (default DEFAULT_PAGE_SIZE, at most MAX_PAGE_SIZE)
+
+    Returns:
+        dict: "components" (each without its full vulnerability list but with the
+        matching "vulnerabilities"), match totals and the next cursor
+    """
+    limit = _limit(limit)
+    min_cvss = _number("min_cvss", min_cvss)
+    max_cvss = _number("max_cvss", max_cvss)
+
+    index = get_nexus_index(results)
+    positions, refs = index.match(cve=_as_list(cve), license=_as_list(license), package=_as_list(package),
+                                  severity=_as_list(severity), min_cvss=min_cvss, max_cvss=max_cvss)
+
+    start = 0
+    if cursor:
+        start = bisect.bisect_right(positions, decode_cursor(cursor, results["scan_id"]))
+    page = positions[start:start + limit]
+
+    components = []
+    low = 0
+    for position in page:
+        component = index.components[position]
+        entry = {name: value for name, value in component.items() if name != "vulnerabilities"}
+        if refs is None:
+            entry["vulnerabilities"] = list(component["vulnerabilities"])
+        else:
+            # A component's references form one contiguous run of the ascending list
+            first = index.offsets[position]
+            low = bisect.bisect_left(refs, first, low)
+            high = bisect.bisect_left(refs, index.offsets[position + 1], low)
+            entry["vulnerabilities"] = [component["vulnerabilities"][ref - first] for ref in refs[low:high]]
+        components.append(entry)
+
+    has_more = start + limit < len(positions)
+    return {
+        "scan_id": results["scan_id"],
+        "repository_name": results["repository_name"],
+        "scan_date": results["scan_date"],
+        "components": components,
+        "total_components": len(positions),
+        "total_vulnerabilities": index.vulnerability_count(positions) if refs is None else len(refs),
+        "returned": len(components),
+        "next_cursor": encode_cursor(results["scan_id"], page[-1]) if has_more else None,
+    }
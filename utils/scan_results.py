@@ -1,71 +1,123 @@
 #!/usr/bin/env python3
 """
 Security Scan Results MCP Server
-Provides methods to collect dummy scan results from Sonar, Fortify, and Nexus
+Provides methods to collect dummy scan results from Sonar, Fortify, and Nexus,
+registered as scanner adapters (see utils.scanners)
+
+Results are generated from a random generator seeded with the tool name, the
+project identifier and an optional scan revision, so the same inputs always
+produce the same results. Generated results are memoized in a bounded LRU
+cache with a TTL and are shared between callers, so treat them as read-only.
+They are DerivableDicts, so caches of values derived from them release those
+values when the results are evicted.
 """
 
+import hashlib
 import random
 import uuid
+from collections import Counter
 from datetime import datetime, timedelta
-from typing import Dict, Any
+from typing import Dict, Any, Iterator, List, Optional
 
+from utils.cache import DerivableDict, TTLCache, memoize
+from utils.scan_models import (FortifyVulnerability, NexusComponent, NexusVulnerability, PolicyViolation,
+                               SonarIssue, severity_counts)
+from utils.scanners import Finding, ScannerAdapter, get_scan_executor, get_scanner, register_scanner, scanners
 
-def generate_random_severity():
+# Memoization settings for generated scan results
+SCAN_CACHE_MAXSIZE = 256
+SCAN_CACHE_TTL_SECONDS = 300
+
+scan_results_cache = TTLCache(maxsize=SCAN_CACHE_MAXSIZE, ttl=SCAN_CACHE_TTL_SECONDS)
+
+
+def scan_seed(tool: str, identifier: str, revision: Optional[str] = None) -> int:
+    """Derive a stable seed from the tool name, project identifier and scan revision"""
+    digest = hashlib.sha256(f"{tool}\0{identifier}\0{revision or ''}".encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big")
+
+
+def scan_base_date() -> datetime:
+    """Reference date that generated dates count back from (start of the current day)"""
+    return datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def generate_random_id(rng=random) -> str:
+    """Generate a random UUID4 hex string from the given generator"""
+    return uuid.UUID(int=rng.getrandbits(128), version=4).hex
+
+
+def generate_random_severity(rng=random):
     """Generate random severity level"""
-    return random.choice(["Critical", "High", "Medium", "Low", "Info"])
+    return rng.choice(["Critical", "High", "Medium", "Low", "Info"])
 
 
-def generate_random_status():
+def generate_random_status(rng=random):
     """Generate random scan status"""
-    return random.choice(["Completed", "In Progress", "Failed", "Queued"])
+    return rng.choice(["Completed", "In Progress", "Failed", "Queued"])
 
 
-def generate_random_date(days_back=30):
+def generate_random_date(days_back=30, rng=random, base_date: Optional[datetime] = None):
     """Generate random date within last N days"""
-    base_date = datetime.now()
-    random_days = random.randint(0, days_back)
+    base_date = base_date or datetime.now()
+    random_days = rng.randint(0, days_back)
     return (base_date - timedelta(days=random_days)).isoformat()
 
 
-def get_sonar_scan_results_impl(project_key: str = "default-project") -> Dict[str, Any]:
+SONAR_ISSUE_TYPES = [
+    "Code Smell", "Bug", "Vulnerability", "Security Hotspot",
+    "Maintainability Issue", "Reliability Issue"
+]
+
+
+def generate_sonar_issue(rng, base_date: datetime) -> SonarIssue:
+    """Generate a single SonarQube issue"""
+    return SonarIssue(
+        key=f"sonar-{generate_random_id(rng)[:8]}",
+        type=rng.choice(SONAR_ISSUE_TYPES),
+        severity=generate_random_severity(rng),
+        component=f"src/main/java/com/example/{rng.choice(['Controller', 'Service', 'Repository', 'Model'])}.java",
+        line=rng.randint(1, 500),
+        message=rng.choice([
+            "Potential SQL injection vulnerability",
+            "Unused import should be removed",
+            "Method complexity is too high",
+            "Hardcoded credentials detected",
+            "Potential XSS vulnerability",
+            "Memory leak possible",
+            "Dead code should be removed"
+        ]),
+        effort=f"{rng.randint(5, 120)}min",
+        debt=f"{rng.randint(1, 8)}h",
+        created_date=generate_random_date(7, rng, base_date)
+    )
+
+
+def generate_sonar_scan_results(project_key: str, revision: Optional[str] = None) -> Dict[str, Any]:
     """
-    Internal implementation for SonarQube scan results.
+    Generate SonarQube scan results seeded from the project key and scan revision.
     """
+    rng = random.Random(scan_seed("sonar", project_key, revision))
+    base_date = scan_base_date()
+
     # Generate random metrics
-    lines_of_code = random.randint(1000, 100000)
-    coverage = round(random.uniform(40, 95), 1)
+    lines_of_code = rng.randint(1000, 100000)
+    coverage = round(rng.uniform(40, 95), 1)
 
-    # Generate random issues
+    # Generate random issues, counting severities and vulnerabilities as we go
     issues = []
-    issue_types = [
-        "Code Smell", "Bug", "Vulnerability", "Security Hotspot",
-        "Maintainability Issue", "Reliability Issue"
-    ]
-
-    for _ in range(random.randint(5, 25)):
-        issues.append({
-            "key": f"sonar-{uuid.uuid4().hex[:8]}",
-            "type": random.choice(issue_types),
-            "severity": generate_random_severity(),
-            "component": f"src/main/java/com/example/{random.choice(['Controller', 'Service', 'Repository', 'Model'])}.java",
-            "line": random.randint(1, 500),
-            "message": random.choice([
-                "Potential SQL injection vulnerability",
-                "Unused import should be removed",
-                "Method complexity is too high",
-                "Hardcoded credentials detected",
-                "Potential XSS vulnerability",
-                "Memory leak possible",
-                "Dead code should be removed"
-            ]),
-            "effort": f"{random.randint(5, 120)}min",
-            "debt": f"{random.randint(1, 8)}h",
-            "created_date": generate_random_date(7)
-        })
+    severities = Counter()
+    vulnerability_issues = 0
+    for _ in range(rng.randint(5, 25)):
+        issue = generate_sonar_issue(rng, base_date)
+        issues.append(issue)
+        severities[issue.severity] += 1
+        if issue.type == "Vulnerability":
+            vulnerability_issues += 1
 
     # Generate quality gates
     quality_gate = {
-        "status": random.choice(["PASSED", "FAILED", "WARNING"]),
+        "status": rng.choice(["PASSED", "FAILED", "WARNING"]),
         "conditions": [
             {
                 "metric": "coverage",
@@ -78,285 +130,388 @@ def get_sonar_scan_results_impl(project_key: str = "default-project") -> Dict[st
                 "metric": "new_vulnerabilities",
                 "operator": "GT",
                 "threshold": "0",
-                "actual_value": str(len([i for i in issues if i["type"] == "Vulnerability"])),
-                "status": random.choice(["PASSED", "FAILED"])
+                "actual_value": str(vulnerability_issues),
+                "status": rng.choice(["PASSED", "FAILED"])
             }
         ]
     }
 
     return {
-        "scan_id": f"sonar-{uuid.uuid4().hex}",
+        "scan_id": f"sonar-{generate_random_id(rng)}",
         "project_key": project_key,
         "project_name": f"Project {project_key.title()}",
-        "scan_date": generate_random_date(1),
-        "status": generate_random_status(),
+        "scan_date": generate_random_date(1, rng, base_date),
+        "status": generate_random_status(rng),
         "metrics": {
             "lines_of_code": lines_of_code,
             "coverage": coverage,
-            "duplicated_lines_density": round(random.uniform(0, 15), 1),
-            "maintainability_rating": random.choice(["A", "B", "C", "D", "E"]),
-            "reliability_rating": random.choice(["A", "B", "C", "D", "E"]),
-            "security_rating": random.choice(["A", "B", "C", "D", "E"]),
-            "technical_debt": f"{random.randint(1, 50)}h"
+            "duplicated_lines_density": round(rng.uniform(0, 15), 1),
+            "maintainability_rating": rng.choice(["A", "B", "C", "D", "E"]),
+            "reliability_rating": rng.choice(["A", "B", "C", "D", "E"]),
+            "security_rating": rng.choice(["A", "B", "C", "D", "E"]),
+            "technical_debt": f"{rng.randint(1, 50)}h"
         },
         "issues": issues,
-        "issue_counts": {
-            "total": len(issues),
-            "critical": len([i for i in issues if i["severity"] == "Critical"]),
-            "high": len([i for i in issues if i["severity"] == "High"]),
-            "medium": len([i for i in issues if i["severity"] == "Medium"]),
-            "low": len([i for i in issues if i["severity"] == "Low"]),
-            "info": len([i for i in issues if i["severity"] == "Info"])
-        },
+        "issue_counts": severity_counts(severities),
         "quality_gate": quality_gate,
         "dashboard_url": f"https://sonarqube.company.com/dashboard?id={project_key}"
     }
 
 
-def get_fortify_scan_results_impl(application_name: str = "default-app") -> Dict[str, Any]:
+@memoize(scan_results_cache)
+def get_sonar_scan_results_impl(project_key: str = "default-project", revision: Optional[str] = None) -> Dict[str, Any]:
     """
-    Internal implementation for Fortify scan results.
+    Internal implementation for SonarQube scan results.
     """
-    # Generate random vulnerabilities
+    return DerivableDict(generate_sonar_scan_results(project_key, revision))
+
+
+FORTIFY_CATEGORIES = [
+    "Cross-Site Scripting", "SQL Injection", "Path Manipulation",
+    "Command Injection", "LDAP Injection", "XML Injection",
+    "Buffer Overflow", "Resource Injection", "Privacy Violation",
+    "Weak Cryptographic Hash", "Insecure Randomness", "Trust Boundary Violation"
+]
+
+
+def generate_fortify_vulnerability(rng, base_date: datetime) -> FortifyVulnerability:
+    """Generate a single Fortify vulnerability"""
+    return FortifyVulnerability(
+        instance_id=f"fortify-{generate_random_id(rng)[:8]}",
+        category=rng.choice(FORTIFY_CATEGORIES),
+        severity=generate_random_severity(rng),
+        confidence=rng.choice(["High", "Medium", "Low"]),
+        impact=round(rng.uniform(1, 5), 1),
+        likelihood=round(rng.uniform(1, 5), 1),
+        file_path=f"src/main/java/com/example/{rng.choice(['web', 'service', 'dao', 'util'])}/{rng.choice(['UserController', 'AuthService', 'DatabaseDAO', 'ValidationUtil'])}.java",
+        line_number=rng.randint(1, 500),
+        function_name=rng.choice(
+            ["authenticate", "processInput", "executeQuery", "validateUser", "encryptData"]),
+        description=rng.choice([
+            "User input is not properly validated before being used in SQL query",
+            "Data from user input is not encoded before output to web page",
+            "File path constructed from user input without proper validation",
+            "Cryptographic hash function is weak and vulnerable to attacks",
+            "Random number generator is not cryptographically secure"
+        ]),
+        recommendation="Implement proper input validation and output encoding",
+        cwe_id=rng.choice([79, 89, 22, 78, 90, 91, 120, 134, 311, 330]),
+        owasp_category=rng.choice(["A03:2021", "A02:2021", "A01:2021", "A04:2021", "A06:2021"]),
+        first_detected=generate_random_date(30, rng, base_date),
+        last_seen=generate_random_date(3, rng, base_date)
+    )
+
+
+def generate_fortify_scan_results(application_name: str, revision: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Generate Fortify scan results seeded from the application name and scan revision.
+    """
+    rng = random.Random(scan_seed("fortify", application_name, revision))
+    base_date = scan_base_date()
+
+    # Generate random vulnerabilities, counting severities and categories as we go
     vulnerabilities = []
-    vulnerability_categories = [
-        "Cross-Site Scripting", "SQL Injection", "Path Manipulation",
-        "Command Injection", "LDAP Injection", "XML Injection",
-        "Buffer Overflow", "Resource Injection", "Privacy Violation",
-        "Weak Cryptographic Hash", "Insecure Randomness", "Trust Boundary Violation"
-    ]
-
-    for _ in range(random.randint(3, 20)):
-        vulnerabilities.append({
-            "instance_id": f"fortify-{uuid.uuid4().hex[:8]}",
-            "category": random.choice(vulnerability_categories),
-            "severity": generate_random_severity(),
-            "confidence": random.choice(["High", "Medium", "Low"]),
-            "impact": round(random.uniform(1, 5), 1),
-            "likelihood": round(random.uniform(1, 5), 1),
-            "file_path": f"src/main/java/com/example/{random.choice(['web', 'service', 'dao', 'util'])}/{random.choice(['UserController', 'AuthService', 'DatabaseDAO', 'ValidationUtil'])}.java",
-            "line_number": random.randint(1, 500),
-            "function_name": random.choice(
-                ["authenticate", "processInput", "executeQuery", "validateUser", "encryptData"]),
-            "description": random.choice([
-                "User input is not properly validated before being used in SQL query",
-                "Data from user input is not encoded before output to web page",
-                "File path constructed from user input without proper validation",
-                "Cryptographic hash function is weak and vulnerable to attacks",
-                "Random number generator is not cryptographically secure"
-            ]),
-            "recommendation": "Implement proper input validation and output encoding",
-            "cwe_id": random.choice([79, 89, 22, 78, 90, 91, 120, 134, 311, 330]),
-            "owasp_category": random.choice(["A03:2021", "A02:2021", "A01:2021", "A04:2021", "A06:2021"]),
-            "first_detected": generate_random_date(30),
-            "last_seen": generate_random_date(3)
-        })
+    severities = Counter()
+    categories = Counter()
+    for _ in range(rng.randint(3, 20)):
+        vulnerability = generate_fortify_vulnerability(rng, base_date)
+        vulnerabilities.append(vulnerability)
+        severities[vulnerability.severity] += 1
+        categories[vulnerability.category] += 1
 
     # Generate scan statistics
-    total_files_scanned = random.randint(100, 1000)
-    scan_duration = random.randint(300, 3600)  # seconds
+    total_files_scanned = rng.randint(100, 1000)
+    scan_duration = rng.randint(300, 3600)  # seconds
 
     return {
-        "scan_id": f"fortify-{uuid.uuid4().hex}",
+        "scan_id": f"fortify-{generate_random_id(rng)}",
         "application_name": application_name,
-        "version": f"v{random.randint(1, 10)}.{random.randint(0, 9)}.{random.randint(0, 9)}",
-        "scan_date": generate_random_date(1),
-        "status": generate_random_status(),
+        "version": f"v{rng.randint(1, 10)}.{rng.randint(0, 9)}.{rng.randint(0, 9)}",
+        "scan_date": generate_random_date(1, rng, base_date),
+        "status": generate_random_status(rng),
         "scan_statistics": {
             "total_files_scanned": total_files_scanned,
-            "lines_of_code": random.randint(50000, 500000),
+            "lines_of_code": rng.randint(50000, 500000),
             "scan_duration_seconds": scan_duration,
             "scan_duration_formatted": f"{scan_duration // 60}m {scan_duration % 60}s",
-            "fortify_version": f"22.{random.randint(1, 2)}.{random.randint(0, 3)}"
+            "fortify_version": f"22.{rng.randint(1, 2)}.{rng.randint(0, 3)}"
         },
         "vulnerabilities": vulnerabilities,
-        "vulnerability_counts": {
-            "total": len(vulnerabilities),
-            "critical": len([v for v in vulnerabilities if v["severity"] == "Critical"]),
-            "high": len([v for v in vulnerabilities if v["severity"] == "High"]),
-            "medium": len([v for v in vulnerabilities if v["severity"] == "Medium"]),
-            "low": len([v for v in vulnerabilities if v["severity"] == "Low"]),
-            "info": len([v for v in vulnerabilities if v["severity"] == "Info"])
-        },
-        "category_breakdown": {
-            category: len([v for v in vulnerabilities if v["category"] == category])
-            for category in set(v["category"] for v in vulnerabilities)
-        },
+        "vulnerability_counts": severity_counts(severities),
+        "category_breakdown": dict(categories),
         "risk_metrics": {
-            "fortify_priority_order": round(random.uniform(1, 5), 2),
-            "business_criticality": random.choice(["High", "Medium", "Low"]),
-            "overall_risk_score": round(random.uniform(1, 10), 1)
+            "fortify_priority_order": round(rng.uniform(1, 5), 2),
+            "business_criticality": rng.choice(["High", "Medium", "Low"]),
+            "overall_risk_score": round(rng.uniform(1, 10), 1)
         },
-        "dashboard_url": f"https://fortify.company.com/ssc/html/ssc/index.jsp#!/version/{random.randint(1000, 9999)}/fix"
+        "dashboard_url": f"https://fortify.company.com/ssc/html/ssc/index.jsp#!/version/{rng.randint(1000, 9999)}/fix"
     }
 
 
-def get_nexus_scan_results_impl(repository_name: str = "default-repo") -> Dict[str, Any]:
+@memoize(scan_results_cache)
+def get_fortify_scan_results_impl(application_name: str = "default-app", revision: Optional[str] = None) -> Dict[str, Any]:
     """
-    Internal implementation for Nexus IQ scan results.
+    Internal implementation for Fortify scan results.
+    """
+    return DerivableDict(generate_fortify_scan_results(application_name, revision))
+
+
+NEXUS_COMPONENT_TYPES = ["maven", "npm", "pypi", "nuget", "docker"]
+NEXUS_VIOLATION_TYPES = ["Security", "License", "Architecture", "Quality"]
+
+
+def generate_nexus_vulnerability(rng, base_date: datetime) -> NexusVulnerability:
+    """Generate a single vulnerability of a Nexus IQ component"""
+    return NexusVulnerability(
+        cve_id=f"CVE-{rng.randint(2020, 2024)}-{rng.randint(1000, 9999)}",
+        cvss_score=round(rng.uniform(1, 10), 1),
+        severity=generate_random_severity(rng),
+        summary=rng.choice([
+            "Remote code execution vulnerability",
+            "Cross-site scripting vulnerability",
+            "Denial of service vulnerability",
+            "Information disclosure vulnerability",
+            "Authentication bypass"
+        ]),
+        published_date=generate_random_date(365, rng, base_date),
+        modified_date=generate_random_date(30, rng, base_date)
+    )
+
+
+def generate_nexus_component(rng, base_date: datetime) -> NexusComponent:
+    """Generate a single Nexus IQ component with its vulnerabilities"""
+    component_type = rng.choice(NEXUS_COMPONENT_TYPES)
+    if component_type == "maven":
+        component_name = f"org.apache.{rng.choice(['commons', 'http', 'logging'])}"
+        package_name = f"{component_name}:{rng.choice(['commons-lang3', 'httpclient', 'log4j-core'])}"
+    elif component_type == "npm":
+        package_name = rng.choice(['lodash', 'express', 'react', 'axios', 'moment'])
+    elif component_type == "pypi":
+        package_name = rng.choice(['requests', 'django', 'flask', 'numpy', 'pandas'])
+    elif component_type == "nuget":
+        package_name = rng.choice(['Newtonsoft.Json', 'Microsoft.AspNetCore', 'Serilog'])
+    else:  # docker
+        package_name = rng.choice(['alpine', 'ubuntu', 'nginx', 'node', 'python'])
+
+    version = f"{rng.randint(1, 5)}.{rng.randint(0, 20)}.{rng.randint(0, 10)}"
+
+    # Generate vulnerabilities for this component
+    vulnerabilities = [generate_nexus_vulnerability(rng, base_date) for _ in range(rng.randint(0, 5))]
+
+    return NexusComponent(
+        component_id=f"{component_type}-{generate_random_id(rng)[:8]}",
+        package_name=package_name,
+        version=version,
+        type=component_type,
+        license=rng.choice([
+            "Apache-2.0", "MIT", "GPL-3.0", "BSD-3-Clause",
+            "ISC", "LGPL-2.1", "MPL-2.0", "Unlicense", "EPL-1.0"
+        ]),
+        direct_dependency=rng.choice([True, False]),
+        vulnerabilities=vulnerabilities,
+        vulnerability_count=len(vulnerabilities),
+        highest_cvss=max(v.cvss_score for v in vulnerabilities) if vulnerabilities else 0,
+        policy_violations=rng.randint(0, 3),
+        license_threat_level=rng.choice(["None", "Low", "Medium", "High"]),
+        age_months=rng.randint(1, 60)
+    )
+
+
+def generate_policy_violation(rng, base_date: datetime, components: List[NexusComponent]) -> PolicyViolation:
+    """Generate a single Nexus IQ policy violation against one of the components"""
+    return PolicyViolation(
+        violation_id=f"policy-{generate_random_id(rng)[:8]}",
+        type=rng.choice(NEXUS_VIOLATION_TYPES),
+        severity=generate_random_severity(rng),
+        policy_name=rng.choice([
+            "Critical Security Policy", "License Compliance Policy",
+            "Architecture Standards", "Component Quality Policy"
+        ]),
+        component=rng.choice(components).package_name if components else "unknown",
+        description=rng.choice([
+            "Component has critical security vulnerabilities",
+            "License is not approved for commercial use",
+            "Component violates architecture standards",
+            "Component quality metrics below threshold"
+        ]),
+        detected_date=generate_random_date(14, rng, base_date)
+    )
+
+
+def generate_nexus_scan_results(repository_name: str, revision: Optional[str] = None) -> Dict[str, Any]:
     """
-    # Generate random components with vulnerabilities
+    Generate Nexus IQ scan results seeded from the repository name and scan revision.
+    """
+    rng = random.Random(scan_seed("nexus", repository_name, revision))
+    base_date = scan_base_date()
+
+    # Generate random components with vulnerabilities, aggregating in the same pass
     components = []
-    component_types = ["maven", "npm", "pypi", "nuget", "docker"]
-
-    for _ in range(random.randint(5, 30)):
-        component_type = random.choice(component_types)
-        if component_type == "maven":
-            component_name = f"org.apache.{random.choice(['commons', 'http', 'logging'])}"
-            package_name = f"{component_name}:{random.choice(['commons-lang3', 'httpclient', 'log4j-core'])}"
-        elif component_type == "npm":
-            package_name = random.choice(['lodash', 'express', 'react', 'axios', 'moment'])
-        elif component_type == "pypi":
-            package_name = random.choice(['requests', 'django', 'flask', 'numpy', 'pandas'])
-        elif component_type == "nuget":
-            package_name = random.choice(['Newtonsoft.Json', 'Microsoft.AspNetCore', 'Serilog'])
-        else:  # docker
-            package_name = random.choice(['alpine', 'ubuntu', 'nginx', 'node', 'python'])
-
-        version = f"{random.randint(1, 5)}.{random.randint(0, 20)}.{random.randint(0, 10)}"
-
-        # Generate vulnerabilities for this component
-        vulnerabilities = []
-        for _ in range(random.randint(0, 5)):
-            vulnerabilities.append({
-                "cve_id": f"CVE-{random.randint(2020, 2024)}-{random.randint(1000, 9999)}",
-                "cvss_score": round(random.uniform(1, 10), 1),
-                "severity": generate_random_severity(),
-                "summary": random.choice([
-                    "Remote code execution vulnerability",
-                    "Cross-site scripting vulnerability",
-                    "Denial of service vulnerability",
-                    "Information disclosure vulnerability",
-                    "Authentication bypass"
-                ]),
-                "published_date": generate_random_date(365),
-                "modified_date": generate_random_date(30)
-            })
-
-        components.append({
-            "component_id": f"{component_type}-{uuid.uuid4().hex[:8]}",
-            "package_name": package_name,
-            "version": version,
-            "type": component_type,
-            "license": random.choice([
-                "Apache-2.0", "MIT", "GPL-3.0", "BSD-3-Clause",
-                "ISC", "LGPL-2.1", "MPL-2.0", "Unlicense", "EPL-1.0"
-            ]),
-            "direct_dependency": random.choice([True, False]),
-            "vulnerabilities": vulnerabilities,
-            "vulnerability_count": len(vulnerabilities),
-            "highest_cvss": max([v["cvss_score"] for v in vulnerabilities]) if vulnerabilities else 0,
-            "policy_violations": random.randint(0, 3),
-            "license_threat_level": random.choice(["None", "Low", "Medium", "High"]),
-            "age_months": random.randint(1, 60)
-        })
+    severities = Counter()
+    licenses = Counter()
+    vulnerable_components = 0
+    total_vulnerabilities = 0
+    license_issues = 0
+    legacy_components = 0
+    for _ in range(rng.randint(5, 30)):
+        component = generate_nexus_component(rng, base_date)
+        components.append(component)
+        licenses[component.license] += 1
+        if component.vulnerability_count:
+            vulnerable_components += 1
+            total_vulnerabilities += component.vulnerability_count
+            severities.update(v.severity for v in component.vulnerabilities)
+        if component.license_threat_level in ("Medium", "High"):
+            license_issues += 1
+        if component.age_months > 24:
+            legacy_components += 1
 
     # Generate policy violations
     policy_violations = []
-    violation_types = ["Security", "License", "Architecture", "Quality"]
-
-    for _ in range(random.randint(0, 10)):
-        policy_violations.append({
-            "violation_id": f"policy-{uuid.uuid4().hex[:8]}",
-            "type": random.choice(violation_types),
-            "severity": generate_random_severity(),
-            "policy_name": random.choice([
-                "Critical Security Policy", "License Compliance Policy",
-                "Architecture Standards", "Component Quality Policy"
-            ]),
-            "component": random.choice(components)["package_name"] if components else "unknown",
-            "description": random.choice([
-                "Component has critical security vulnerabilities",
-                "License is not approved for commercial use",
-                "Component violates architecture standards",
-                "Component quality metrics below threshold"
-            ]),
-            "detected_date": generate_random_date(14)
-        })
+    open_policy_violations = 0
+    for _ in range(rng.randint(0, 10)):
+        violation = generate_policy_violation(rng, base_date, components)
+        policy_violations.append(violation)
+        if violation.severity in ("Critical", "High"):
+            open_policy_violations += 1
 
     return {
-        "scan_id": f"nexus-{uuid.uuid4().hex}",
+        "scan_id": f"nexus-{generate_random_id(rng)}",
         "repository_name": repository_name,
         "application_name": f"App-{repository_name}",
-        "scan_date": generate_random_date(1),
-        "status": generate_random_status(),
-        "stage": random.choice(["develop", "build", "stage-release", "release", "operate"]),
+        "scan_date": generate_random_date(1, rng, base_date),
+        "status": generate_random_status(rng),
+        "stage": rng.choice(["develop", "build", "stage-release", "release", "operate"]),
         "summary": {
             "total_components": len(components),
-            "components_with_vulnerabilities": len([c for c in components if c["vulnerability_count"] > 0]),
-            "total_vulnerabilities": sum(c["vulnerability_count"] for c in components),
-            "critical_vulnerabilities": len(
-                [c for comp in components for c in comp["vulnerabilities"] if c["severity"] == "Critical"]),
-            "high_vulnerabilities": len(
-                [c for comp in components for c in comp["vulnerabilities"] if c["severity"] == "High"]),
+            "components_with_vulnerabilities": vulnerable_components,
+            "total_vulnerabilities": total_vulnerabilities,
+            "critical_vulnerabilities": severities["Critical"],
+            "high_vulnerabilities": severities["High"],
             "policy_violations": len(policy_violations),
-            "license_issues": len([c for c in components if c["license_threat_level"] in ["Medium", "High"]])
+            "license_issues": license_issues
         },
         "components": components,
         "policy_violations": policy_violations,
         "risk_metrics": {
-            "application_risk_score": round(random.uniform(1, 100), 1),
-            "policy_evaluation": random.choice(["Pass", "Warn", "Fail"]),
-            "open_policy_violations": len([p for p in policy_violations if p["severity"] in ["Critical", "High"]]),
-            "legacy_components": len([c for c in components if c["age_months"] > 24])
+            "application_risk_score": round(rng.uniform(1, 100), 1),
+            "policy_evaluation": rng.choice(["Pass", "Warn", "Fail"]),
+            "open_policy_violations": open_policy_violations,
+            "legacy_components": legacy_components
         },
-        "license_summary": {
-            license: len([c for c in components if c["license"] == license])
-            for license in set(c["license"] for c in components)
-        },
-        "dashboard_url": f"https://nexus-iq.company.com/ui/links/application/{repository_name}/report/{uuid.uuid4().hex[:8]}"
+        "license_summary": dict(licenses),
+        "dashboard_url": f"https://nexus-iq.company.com/ui/links/application/{repository_name}/report/{generate_random_id(rng)[:8]}"
     }
 
 
-def get_all_scan_results(project_identifier: str = "default-project") -> Dict[str, Any]:
+@memoize(scan_results_cache)
+def get_nexus_scan_results_impl(repository_name: str = "default-repo", revision: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Internal implementation for Nexus IQ scan results.
+    """
+    return DerivableDict(generate_nexus_scan_results(repository_name, revision))
+
+
+def normalize_sonar_results(results: Dict[str, Any]) -> Iterator[Finding]:
+    for issue in results["issues"]:
+        yield Finding("sonar", issue.key, issue.severity, issue.type, issue.component, issue.line, issue.message)
+
+
+def normalize_fortify_results(results: Dict[str, Any]) -> Iterator[Finding]:
+    for vulnerability in results["vulnerabilities"]:
+        yield Finding("fortify", vulnerability.instance_id, vulnerability.severity, vulnerability.category,
+                      vulnerability.file_path, vulnerability.line_number, vulnerability.description)
+
+
+def normalize_nexus_results(results: Dict[str, Any]) -> Iterator[Finding]:
+    for component in results["components"]:
+        for vulnerability in component.vulnerabilities:
+            yield Finding("nexus", vulnerability.cve_id, vulnerability.severity, component.type,
+                          f"{component.package_name}@{component.version}", None,
+                          vulnerability.summary, vulnerability.cvss_score)
+
+
+def fingerprint_nexus_finding(finding: Finding) -> str:
+    # A CVE identifies a Nexus finding; upgrading the component to another version fixes it
+    return hashlib.sha1(f"nexus\0{finding.component}\0{finding.finding_id}".encode("utf-8")).hexdigest()
+
+
+def _counts_from_summary(total: int, critical: int) -> Dict[str, int]:
+    # The generated results carry pre-computed totals, so consolidation needs no finding scan
+    return {"total": total, "critical": critical}
+
+
+register_scanner(ScannerAdapter(
+    "sonar", get_sonar_scan_results_impl, normalize_sonar_results,
+    lambda results: _counts_from_summary(results["issue_counts"]["total"], results["issue_counts"]["critical"]),
+    streamed_lists=("issues",)))
+register_scanner(ScannerAdapter(
+    "fortify", get_fortify_scan_results_impl, normalize_fortify_results,
+    lambda results: _counts_from_summary(results["vulnerability_counts"]["total"],
+                                         results["vulnerability_counts"]["critical"]),
+    streamed_lists=("vulnerabilities",)))
+register_scanner(ScannerAdapter(
+    "nexus", get_nexus_scan_results_impl, normalize_nexus_results,
+    lambda results: _counts_from_summary(results["summary"]["total_vulnerabilities"],
+                                         results["summary"]["critical_vulnerabilities"]),
+    fingerprint=fingerprint_nexus_finding, streamed_lists=("components", "policy_violations")))
+
+
+@memoize(scan_results_cache)
+def get_all_scan_results(project_identifier: str = "default-project", revision: Optional[str] = None) -> Dict[str, Any]:
     """
-    Collect scan results from all three security tools (Sonar, Fortify, Nexus) for a given project.
+    Collect scan results from every registered scanner (Sonar, Fortify, Nexus, ...) for a given project.
 
     Args:
         project_identifier: Common project identifier used across all tools
+        revision: Optional scan revision; each revision yields a different, stable set of results
 
     Returns:
         Dictionary containing consolidated scan results from all tools
     """
-    import concurrent.futures
-
-    # Call the internal implementation functions in parallel
-    with concurrent.futures.ThreadPoolExecutor(max_workers=3) as executor:
-        # Submit all three scan functions to run in parallel
-        sonar_future = executor.submit(get_sonar_scan_results_impl, project_identifier)
-        fortify_future = executor.submit(get_fortify_scan_results_impl, project_identifier)
-        nexus_future = executor.submit(get_nexus_scan_results_impl, project_identifier)
-
-        # Wait for all results to complete
-        sonar_results = sonar_future.result()
-        fortify_results = fortify_future.result()
-        nexus_results = nexus_future.result()
-
-    # Calculate consolidated metrics
-    total_issues = (
-            sonar_results["issue_counts"]["total"] +
-            fortify_results["vulnerability_counts"]["total"] +
-            nexus_results["summary"]["total_vulnerabilities"]
-    )
+    # Fetch from all scanners in parallel on the shared executor
+    executor = get_scan_executor()
+    futures = {adapter.name: executor.submit(adapter.fetch, project_identifier, revision)
+               for adapter in scanners()}
+    return consolidate_scan_results(project_identifier, {name: future.result() for name, future in futures.items()})
 
-    critical_issues = (
-            sonar_results["issue_counts"]["critical"] +
-            fortify_results["vulnerability_counts"]["critical"] +
-            nexus_results["summary"]["critical_vulnerabilities"]
-    )
 
-    return {
+def consolidate_scan_results(project_identifier: str,
+                             tool_results: Dict[str, Optional[Dict[str, Any]]]) -> Dict[str, Any]:
+    """
+    Combine per-tool scan results into the consolidated result, using each scanner
+    adapter's aggregate hook. Tools whose results are missing (None) are left out of
+    the totals and of the result.
+
+    Args:
+        project_identifier: Common project identifier used across all tools
+        tool_results: Results keyed by scanner name
+
+    Returns:
+        Dictionary containing consolidated scan results
+    """
+    total_issues = 0
+    critical_issues = 0
+    present = {}
+    for name, results in tool_results.items():
+        if results is None:
+            continue
+        adapter = get_scanner(name)
+        counts = adapter.aggregate(results)
+        total_issues += counts["total"]
+        critical_issues += counts["critical"]
+        present[adapter.result_key] = results
+
+    return DerivableDict({
         "project_identifier": project_identifier,
-        "consolidated_scan_date": datetime.now().isoformat(),
+        "consolidated_scan_date": max((value["scan_date"] for value in present.values()), default=None),
         "summary": {
             "total_issues": total_issues,
             "critical_issues": critical_issues,
-            "tools_scanned": 3,
+            "tools_scanned": len(present),
             "overall_risk_level": "Critical" if critical_issues > 5 else "High" if critical_issues > 0 else "Medium"
         },
-        "sonar_results": sonar_results,
-        "fortify_results": fortify_results,
-        "nexus_results": nexus_results,
+        **present,
         "recommendations": [
             "Address critical security vulnerabilities identified by Fortify",
             "Improve code coverage to meet quality gate requirements",
@@ -364,4 +519,4 @@ def get_all_scan_results(project_identifier: str = "default-project") -> Dict[st
             "Review and remediate policy violations",
             "Implement secure coding practices to prevent future issues"
         ]
-    }
+    })
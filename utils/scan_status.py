@@ -0,0 +1,272 @@
+"""
+Scan Status Tracking
+Live status of scans, with blocking waits for status changes. Generated results report
+a fixed status, so a scan first seen "Queued" or "In Progress" progresses on a timeline
+seeded from the scan (queued, then in progress, then completed) that starts when the scan
+is first seen. That moment is recorded in the scan store, so every process serving the
+scan agrees on its status. Waiters sleep on a condition variable until the next status
+change is due instead of polling.
+"""
+
+import heapq
+import logging
+import os
+import random
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from utils.cache import DerivableDict, TTLCache, derived
+from utils.scan_results import SCAN_CACHE_TTL_SECONDS, scan_seed
+from utils.scan_store import ScanStore, get_scan_store
+from utils.scanners import get_scanner, scanners
+
+logger = logging.getLogger(__name__)
+
+PENDING_STATUSES = ("Queued", "In Progress")
+TERMINAL_STATUSES = ("Completed", "Failed")
+COMPLETED_STATUS = "Completed"
+
+# Seconds a pending scan stays queued and then in progress, drawn per scan from these ranges
+QUEUED_SECONDS = (5.0, 20.0)
+RUNNING_SECONDS = (10.0, 60.0)
+
+# Multiplies the simulated durations; 0 completes pending scans as soon as they are seen
+STATUS_TIME_SCALE = float(os.environ.get("SCAN_STATUS_TIME_SCALE", "1"))
+
+# Longest single wait accepted by wait()
+MAX_WAIT_SECONDS = 300.0
+
+# Scan timelines kept per process. An evicted timeline is rebuilt from the first-seen
+# status in the scan store on the scan's next lookup.
+TIMELINE_CACHE_MAXSIZE = int(os.environ.get("SCAN_STATUS_TIMELINES", "4096"))
+
+# Upcoming status changes queued for listeners. Changes beyond this are not announced to
+# listeners; waiters still wake for them, as they sleep until the next change is due.
+MAX_SCHEDULED_TRANSITIONS = 4096
+
+# Called as listener(record) with the status record of every scan whose status changes
+StatusListener = Callable[[Dict[str, Any]], None]
+
+
+def _iso(epoch: Optional[float]) -> Optional[str]:
+    return datetime.fromtimestamp(epoch).isoformat() if epoch is not None else None
+
+
+class ScanStatusTracker:
+    """
+    Tracks the live status of scans and wakes waiters when it changes.
+
+    Args:
+        store: Scan store holding the status each scan was first seen with (default: the
+            process-wide store)
+        time_scale: Multiplier of the simulated queued and running durations
+    """
+
+    def __init__(self, store: Optional[ScanStore] = None, time_scale: float = STATUS_TIME_SCALE):
+        self._store = store
+        self.time_scale = time_scale
+        self._changed = threading.Condition()
+        # (tool, identifier, revision) -> (first status, first seen, transition times)
+        self._timelines = TTLCache(maxsize=TIMELINE_CACHE_MAXSIZE, ttl=SCAN_CACHE_TTL_SECONDS)
+        self._listeners: List[StatusListener] = []
+        self._schedule: List[Tuple[float, Tuple[str, str, Optional[str]]]] = []
+        self._scheduled: Set[Tuple[float, Tuple[str, str, Optional[str]]]] = set()
+        self._scheduler: Optional[threading.Thread] = None
+        # Results with their status replaced by the live one, per result object and status
+        self._overlays = TTLCache(maxsize=1024, ttl=SCAN_CACHE_TTL_SECONDS)
+
+    @property
+    def store(self) -> ScanStore:
+        return self._store or get_scan_store()
+
+    def add_listener(self, listener: StatusListener):
+        """Call listener with the record of every status change of a scan seen by this tracker."""
+        with self._changed:
+            self._listeners.append(listener)
+
+    def _transitions(self, tool: str, identifier: str, revision: Optional[str], status: str,
+                     first_seen: float) -> Tuple[float, ...]:
+        # Epoch seconds the scan starts running and completes; none once it is terminal
+        if status not in PENDING_STATUSES:
+            return ()
+        rng = random.Random(scan_seed(f"{tool}-status", identifier, revision))
+        queued = rng.uniform(*QUEUED_SECONDS) * self.time_scale if status == "Queued" else 0.0
+        running = rng.uniform(*RUNNING_SECONDS) * self.time_scale
+        return first_seen + queued, first_seen + queued + running
+
+    def observe(self, tool: str, identifier: str, revision: Optional[str], status: str) -> Dict[str, Any]:
+        """
+        Register the status a scan's results report, if the scan is not tracked yet, and
+        return its live status record.
+        """
+        key = (tool, identifier, revision)
+        if self._timelines.get(key) is None:
+            first_status, first_seen = self.store.observe_status(identifier, tool, revision, status, time.time())
+            transitions = self._transitions(tool, identifier, revision, first_status, first_seen)
+            with self._changed:
+                if self._timelines.get(key) is None:
+                    self._timelines.set(key, (first_status, first_seen, transitions))
+                    now = time.time()
+                    for transition in transitions:
+                        entry = (transition, key)
+                        # A rebuilt timeline has the same transitions; queue each one once
+                        if (transition > now and entry not in self._scheduled
+                                and len(self._schedule) < MAX_SCHEDULED_TRANSITIONS):
+                            heapq.heappush(self._schedule, entry)
+                            self._scheduled.add(entry)
+                    if self._schedule and (self._scheduler is None or not self._scheduler.is_alive()):
+                        self._scheduler = threading.Thread(target=self._run_schedule, name="scan-status",
+                                                           daemon=True)
+                        self._scheduler.start()
+                    self._changed.notify_all()
+        return self.record(tool, identifier, revision)
+
+    def record(self, tool: str, identifier: str, revision: Optional[str], now: Optional[float] = None
+               ) -> Dict[str, Any]:
+        """
+        Live status record of a scan, fetching its results (usually from the result cache)
+        when the scan is not tracked yet.
+        """
+        key = (tool, identifier, revision)
+        timeline = self._timelines.get(key)
+        if timeline is None:
+            return self.observe(tool, identifier, revision, get_scanner(tool).fetch(identifier, revision)["status"])
+        first_status, first_seen, transitions = timeline
+        now = time.time() if now is None else now
+        status, changed_at = first_status, first_seen
+        for next_status, transition in zip(("In Progress", COMPLETED_STATUS), transitions):
+            if transition > now:
+                break
+            status, changed_at = next_status, transition
+        pending = [transition for transition in transitions if transition > now]
+        return {
+            "tool": tool,
+            "project_identifier": identifier,
+            "revision": revision,
+            "status": status,
+            "changed_at": _iso(changed_at),
+            "expected_completion": _iso(transitions[-1]) if pending else None,
+            "next_change": pending[0] if pending else None,
+        }
+
+    def project_status(self, identifier: str, revision: Optional[str] = None,
+                       tools: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """
+        Live status of a project's scans.
+
+        Args:
+            identifier: Project identifier
+            revision: Scan revision, None for the latest scans
+            tools: Tool names (default: every registered scanner)
+
+        Returns:
+            dict: Per-tool status records, "complete" (every scan finished) and a "state"
+            token that changes whenever any of the statuses changes
+        """
+        names = list(tools) if tools is not None else [adapter.name for adapter in scanners()]
+        now = time.time()
+        records = {name: self.record(name, identifier, revision, now) for name in names}
+        next_changes = [record.pop("next_change") for record in records.values()]
+        return {
+            "project_identifier": identifier,
+            "revision": revision,
+            "tools": records,
+            "complete": all(record["status"] in TERMINAL_STATUSES for record in records.values()),
+            "state": "|".join(f"{name}:{record['status']}" for name, record in records.items()),
+            "next_change": min((change for change in next_changes if change is not None), default=None),
+        }
+
+    def wait(self, identifier: str, revision: Optional[str] = None, tools: Optional[Iterable[str]] = None,
+             until: str = "complete", since: Optional[str] = None, timeout: float = 60.0) -> Dict[str, Any]:
+        """
+        Block until a project's scans are complete (until="complete") or their statuses differ
+        from the ``since`` state token (until="change"; default: the state when called), or
+        until the timeout passes.
+
+        Returns:
+            dict: The project status (see project_status) plus "timed_out"
+        """
+        if until not in ("complete", "change"):
+            raise ValueError("until must be 'complete' or 'change'")
+        timeout = float(timeout)
+        if not 0 <= timeout <= MAX_WAIT_SECONDS:
+            raise ValueError(f"timeout must be between 0 and {MAX_WAIT_SECONDS} seconds")
+        tools = list(tools) if tools is not None else None
+        deadline = time.monotonic() + timeout
+        status = self.project_status(identifier, revision, tools)
+        since = status["state"] if since is None else since
+        while True:
+            done = status["complete"] if until == "complete" else status["state"] != since
+            remaining = deadline - time.monotonic()
+            if done or remaining <= 0:
+                break
+            delay = remaining
+            if status["next_change"] is not None:
+                delay = min(delay, max(status["next_change"] - time.time(), 0.0) + 0.01)
+            with self._changed:
+                self._changed.wait(delay)
+            status = self.project_status(identifier, revision, tools)
+        status["timed_out"] = not done
+        status.pop("next_change")
+        return status
+
+    def apply(self, tool: str, identifier: str, revision: Optional[str], results: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Results with their "status" set to the scan's live status (tool "all": the status of
+        every contained tool's results). Returns the same object while the status is unchanged,
+        and one shared copy per status otherwise, so caches keyed on the results stay effective.
+        """
+        if tool == "all":
+            overlaid = {}
+            for adapter in scanners():
+                tool_results = results.get(adapter.result_key)
+                if tool_results is not None:
+                    updated = self.apply(adapter.name, identifier, revision, tool_results)
+                    if updated is not tool_results:
+                        overlaid[adapter.result_key] = updated
+            if not overlaid:
+                return results
+            key = tuple((name, id(value)) for name, value in overlaid.items())
+            return derived(self._overlays, results, key, lambda: DerivableDict({**results, **overlaid}))
+        status = self.observe(tool, identifier, revision, results["status"])["status"]
+        if status == results["status"]:
+            return results
+        return derived(self._overlays, results, status, lambda: DerivableDict({**results, "status": status}))
+
+    def _run_schedule(self):
+        while True:
+            with self._changed:
+                if not self._schedule:
+                    self._scheduler = None
+                    return
+                due, key = self._schedule[0]
+                delay = due - time.time()
+                if delay > 0:
+                    self._changed.wait(delay)
+                    continue
+                self._scheduled.discard(heapq.heappop(self._schedule))
+                listeners = list(self._listeners)
+                self._changed.notify_all()
+            record = self.record(*key)
+            record.pop("next_change")
+            for listener in listeners:
+                try:
+                    listener(record)
+                except Exception as e:
+                    logger.warning(f"Scan status listener failed for {key}: {e}")
+
+
+_tracker: Optional[ScanStatusTracker] = None
+_tracker_lock = threading.Lock()
+
+
+def get_status_tracker() -> ScanStatusTracker:
+    """Return the process-wide tracker, creating it on first use."""
+    global _tracker
+    if _tracker is None:
+        with _tracker_lock:
+            if _tracker is None:
+                _tracker = ScanStatusTracker()
+    return _tracker
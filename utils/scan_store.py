@@ -0,0 +1,403 @@
+"""
+Scan Result Store
+Persists every recorded scan in SQLite with its findings keyed by a stable
+fingerprint (see ScannerAdapter.fingerprint), so new / fixed / unchanged findings
+between two scans and per-severity trends across scans are computed by the
+database instead of by comparing full result payloads
+"""
+
+import os
+import sqlite3
+import threading
+from contextlib import closing
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from utils.cache import TTLCache, derived
+from utils.scanners import SEVERITY_LEVELS, get_scanner, scanners
+
+SCAN_STORE_PATH = os.environ.get(
+    "SCAN_STORE_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "scan_store.sqlite3"))
+
+# Findings listed per category in a delta response (counts always cover all of them)
+DEFAULT_DELTA_LIMIT = 50
+MAX_DELTA_LIMIT = 1000
+
+# Scans listed in a trend response
+DEFAULT_TREND_LIMIT = 10
+
+# Results already recorded by this process, remembered so repeat requests skip the database
+RECORDED_CACHE_MAXSIZE = 256
+RECORDED_CACHE_TTL_SECONDS = 300
+
+# Revision under which the latest scan (no revision) is recorded; the column is part of
+# a unique key, and NULLs never conflict in SQLite
+LATEST_REVISION = ""
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scans (
+    scan_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    project_identifier TEXT NOT NULL,
+    tool TEXT NOT NULL,
+    revision TEXT NOT NULL,
+    scan_date TEXT,
+    recorded_at TEXT NOT NULL,
+    UNIQUE (project_identifier, tool, revision)
+);
+CREATE TABLE IF NOT EXISTS findings (
+    scan_id INTEGER NOT NULL REFERENCES scans (scan_id) ON DELETE CASCADE,
+    fingerprint TEXT NOT NULL,
+    finding_id TEXT,
+    severity TEXT NOT NULL,
+    category TEXT,
+    component TEXT,
+    line INTEGER,
+    title TEXT,
+    cvss REAL,
+    occurrences INTEGER NOT NULL DEFAULT 1,
+    PRIMARY KEY (scan_id, fingerprint)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS findings_scan_severity ON findings (scan_id, severity);
+CREATE TABLE IF NOT EXISTS scan_status (
+    project_identifier TEXT NOT NULL,
+    tool TEXT NOT NULL,
+    revision TEXT NOT NULL,
+    status TEXT NOT NULL,
+    first_seen REAL NOT NULL,
+    PRIMARY KEY (project_identifier, tool, revision)
+) WITHOUT ROWID;
+"""
+
+FINDING_COLUMNS = ("fingerprint", "finding_id", "severity", "category", "component", "line", "title", "cvss",
+                   "occurrences")
+
+class ScanStore:
+    """
+    SQLite-backed store of recorded scans. Safe to share between threads (each thread
+    uses its own connection) and between processes (WAL journal; recording the same
+    scan twice is a no-op).
+
+    Args:
+        path: Database file, created with its directory on first use (":memory:" is
+            not supported, since every thread opens its own connection)
+    """
+
+    def __init__(self, path: str = SCAN_STORE_PATH):
+        self.path = path
+        self._local = threading.local()
+        self._recorded = TTLCache(maxsize=RECORDED_CACHE_MAXSIZE, ttl=RECORDED_CACHE_TTL_SECONDS)
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with closing(self._connect()) as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, timeout=30.0)
+        connection.row_factory = sqlite3.Row
+        connection.execute("PRAGMA foreign_keys=ON")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = self._local.connection = self._connect()
+        return connection
+
+    def record_scan(self, project_identifier: str, tool: str, revision: Optional[str],
+                    results: Dict[str, Any]) -> int:
+        """
+        Record one tool's scan results with their fingerprinted findings, unless that
+        scan (project, tool, revision) is already recorded.
+
+        Args:
+            project_identifier: Identifier the results were requested with
+            tool: Registered scanner name
+            revision: Scan revision, None for the latest scan
+            results: The tool's scan results
+
+        Returns:
+            int: The scan's id
+        """
+        return derived(self._recorded, results, (project_identifier, tool, revision),
+                       lambda: self._insert_scan(project_identifier, tool, revision, results))
+
+    def _insert_scan(self, project_identifier: str, tool: str, revision: Optional[str],
+                     results: Dict[str, Any]) -> int:
+        key = (project_identifier, tool, revision or LATEST_REVISION)
+        existing = self._scan_id(*key)
+        if existing is not None:
+            return existing
+
+        adapter = get_scanner(tool)
+        findings: Dict[str, List[Any]] = {}
+        for finding in adapter.normalize(results):
+            fingerprint = adapter.fingerprint(finding)
+            if fingerprint in findings:
+                findings[fingerprint][-1] += 1
+            else:
+                findings[fingerprint] = [fingerprint, finding.finding_id, finding.severity, finding.category,
+                                         finding.component, finding.line, finding.title, finding.cvss, 1]
+
+        connection = self.connection
+        with connection:
+            cursor = connection.execute(
+                "INSERT OR IGNORE INTO scans (project_identifier, tool, revision, scan_date, recorded_at) "
+                "VALUES (?, ?, ?, ?, ?)", (*key, results.get("scan_date"), datetime.now().isoformat()))
+            if not cursor.rowcount:
+                # Recorded concurrently by another thread or process
+                return self._scan_id(*key)
+            scan_id = cursor.lastrowid
+            connection.executemany(
+                f"INSERT INTO findings (scan_id, {', '.join(FINDING_COLUMNS)}) "
+                f"VALUES (?, {', '.join('?' * len(FINDING_COLUMNS))})",
+                ((scan_id, *row) for row in findings.values()))
+        return scan_id
+
+    def record_consolidated(self, project_identifier: str, revision: Optional[str],
+                            results: Dict[str, Any]) -> Dict[str, int]:
+        """
+        Record every tool's results contained in consolidated results.
+
+        Returns:
+            dict: Scan ids keyed by tool
+        """
+        return {adapter.name: self.record_scan(project_identifier, adapter.name, revision, results[adapter.result_key])
+                for adapter in scanners() if results.get(adapter.result_key) is not None}
+
+    def record_tool_scans(self, tool: str, project_identifier: str, revision: Optional[str]) -> Dict[str, int]:
+        """
+        Fetch (usually from the result cache) and record a project's scan for one tool,
+        or for every registered tool when tool is "all".
+
+        Returns:
+            dict: Scan ids keyed by tool
+
+        Raises:
+            ValueError: If the tool is unknown
+        """
+        adapters = scanners() if tool == "all" else [get_scanner(tool)]
+        return {adapter.name: self.record_scan(project_identifier, adapter.name, revision,
+                                               adapter.fetch(project_identifier, revision))
+                for adapter in adapters}
+
+    def _scan_id(self, project_identifier: str, tool: str, revision: str) -> Optional[int]:
+        row = self.connection.execute(
+            "SELECT scan_id FROM scans WHERE project_identifier = ? AND tool = ? AND revision = ?",
+            (project_identifier, tool, revision)).fetchone()
+        return row["scan_id"] if row else None
+
+    def observe_status(self, project_identifier: str, tool: str, revision: Optional[str], status: str,
+                       seen_at: float) -> Tuple[str, float]:
+        """
+        Record the status a scan was first seen with, unless one is already recorded
+        (by this or another process).
+
+        Args:
+            project_identifier: Identifier the scan was requested with
+            tool: Registered scanner name
+            revision: Scan revision, None for the latest scan
+            status: Status the scan reports
+            seen_at: Epoch seconds the status was seen
+
+        Returns:
+            tuple: The first recorded status and the epoch seconds it was seen
+        """
+        key = (project_identifier, tool, revision or LATEST_REVISION)
+        connection = self.connection
+        with connection:
+            connection.execute("INSERT OR IGNORE INTO scan_status (project_identifier, tool, revision, status, "
+                               "first_seen) VALUES (?, ?, ?, ?, ?)", (*key, status, seen_at))
+        row = connection.execute("SELECT status, first_seen FROM scan_status WHERE project_identifier = ? "
+                                 "AND tool = ? AND revision = ?", key).fetchone()
+        return row["status"], row["first_seen"]
+
+    def latest_scan_id(self, project_identifier: str) -> int:
+        """Id of the project's most recently recorded scan of any tool (0 when none is recorded)."""
+        row = self.connection.execute("SELECT MAX(scan_id) AS scan_id FROM scans WHERE project_identifier = ?",
+                                      (project_identifier,)).fetchone()
+        return row["scan_id"] or 0
+
+    def previous_scan_id(self, scan_id: int) -> Optional[int]:
+        """The scan of the same project and tool recorded most recently before the given one."""
+        row = self.connection.execute(
+            "SELECT previous.scan_id FROM scans AS current "
+            "JOIN scans AS previous ON previous.project_identifier = current.project_identifier "
+            "AND previous.tool = current.tool AND previous.scan_id < current.scan_id "
+            "WHERE current.scan_id = ? ORDER BY previous.scan_id DESC LIMIT 1", (scan_id,)).fetchone()
+        return row["scan_id"] if row else None
+
+    def scan_info(self, scan_id: int) -> Dict[str, Any]:
+        row = self.connection.execute(
+            "SELECT scan_id, project_identifier, tool, revision, scan_date, recorded_at FROM scans "
+            "WHERE scan_id = ?", (scan_id,)).fetchone()
+        info = dict(row)
+        info["revision"] = info["revision"] or None
+        return info
+
+    def delta(self, head_scan_ids: Iterable[int], base_scan_ids: Iterable[int],
+              limit: int = DEFAULT_DELTA_LIMIT) -> Dict[str, Any]:
+        """
+        Compare two sets of scans (one scan per tool each) by finding fingerprint.
+
+        Args:
+            head_scan_ids: Scans to report on
+            base_scan_ids: Scans to compare against
+            limit: Findings listed for each of "new" and "fixed", worst first
+
+        Returns:
+            dict: "counts" of new, fixed and unchanged findings, the same counts per
+            severity under "by_severity", and the "new" and "fixed" findings themselves
+        """
+        if not 0 <= limit <= MAX_DELTA_LIMIT:
+            raise ValueError(f"limit must be between 0 and {MAX_DELTA_LIMIT}")
+        head, base = list(head_scan_ids), list(base_scan_ids)
+        severity_rank = " ".join(f"WHEN '{severity}' THEN {rank}" for rank, severity in enumerate(SEVERITY_LEVELS))
+
+        def side(scans: List[int], against: List[int], negate: bool) -> Tuple[str, List[int]]:
+            # Findings of scans whose fingerprint is (or, negated, is not) found in the other scans
+            condition = (f"{'NOT ' if negate else ''}EXISTS (SELECT 1 FROM findings AS other "
+                         f"WHERE other.scan_id IN ({', '.join('?' * len(against))}) "
+                         f"AND other.fingerprint = finding.fingerprint)")
+            return (f"FROM findings AS finding JOIN scans USING (scan_id) WHERE finding.scan_id IN ({', '.join('?' * len(scans))}) "
+                    f"AND {condition}", scans + against)
+
+        counts = {"new": 0, "fixed": 0, "unchanged": 0}
+        by_severity = {name: dict.fromkeys((severity.lower() for severity in SEVERITY_LEVELS), 0) for name in counts}
+        listed = {}
+        for name, (clause, params) in (("new", side(head, base, True)),
+                                       ("fixed", side(base, head, True)),
+                                       ("unchanged", side(head, base, False))):
+            for row in self.connection.execute(f"SELECT finding.severity, SUM(finding.occurrences) AS n {clause} "
+                                               f"GROUP BY finding.severity", params):
+                by_severity[name][row["severity"].lower()] = row["n"]
+                counts[name] += row["n"]
+            if name != "unchanged":
+                rows = self.connection.execute(
+                    f"SELECT scans.tool, {', '.join('finding.' + column for column in FINDING_COLUMNS)} "
+                    f"{clause} "
+                    f"ORDER BY CASE finding.severity {severity_rank} ELSE {len(SEVERITY_LEVELS)} END, "
+                    f"finding.cvss DESC, finding.fingerprint LIMIT ?", params + [limit])
+                listed[name] = [dict(row) for row in rows]
+
+        return {"counts": counts, "by_severity": by_severity, **listed}
+
+    def trend(self, project_identifier: str, tools: Iterable[str],
+              limit: int = DEFAULT_TREND_LIMIT) -> List[Dict[str, Any]]:
+        """
+        Per-severity finding counts of a project's most recently recorded revisions,
+        oldest first, each with its change against the revision before it.
+
+        Args:
+            project_identifier: Identifier the scans were recorded with
+            tools: Tools whose findings are counted together
+            limit: Number of revisions returned
+
+        Returns:
+            list: One entry per revision with "revision", "recorded_at", "tools",
+            "severity_counts" and "change"
+        """
+        if limit < 1:
+            raise ValueError("limit must be at least 1")
+        tools = list(tools)
+        rows = self.connection.execute(
+            f"WITH recent AS ("
+            f"  SELECT revision, MIN(scan_id) AS first_scan, MIN(recorded_at) AS recorded_at, "
+            f"         GROUP_CONCAT(tool) AS tools "
+            f"  FROM scans WHERE project_identifier = ? AND tool IN ({', '.join('?' * len(tools))}) "
+            f"  GROUP BY revision ORDER BY first_scan DESC LIMIT ?) "
+            f"SELECT recent.revision, recent.first_scan, recent.recorded_at, recent.tools, "
+            f"       findings.severity, SUM(findings.occurrences) AS n "
+            f"FROM recent JOIN scans ON scans.project_identifier = ? AND scans.revision = recent.revision "
+            f"     AND scans.tool IN ({', '.join('?' * len(tools))}) "
+            f"LEFT JOIN findings ON findings.scan_id = scans.scan_id "
+            f"GROUP BY recent.revision, findings.severity ORDER BY recent.first_scan",
+            [project_identifier, *tools, limit, project_identifier, *tools])
+
+        entries: Dict[str, Dict[str, Any]] = {}
+        for row in rows:
+            entry = entries.get(row["revision"])
+            if entry is None:
+                entry = entries[row["revision"]] = {
+                    "revision": row["revision"] or None,
+                    "recorded_at": row["recorded_at"],
+                    "tools": sorted(row["tools"].split(",")),
+                    "severity_counts": {"total": 0, **dict.fromkeys(
+                        (severity.lower() for severity in SEVERITY_LEVELS), 0)},
+                }
+            if row["severity"] is not None:
+                entry["severity_counts"][row["severity"].lower()] = row["n"]
+                entry["severity_counts"]["total"] += row["n"]
+
+        trend = list(entries.values())
+        previous = None
+        for entry in trend:
+            counts = entry["severity_counts"]
+            entry["change"] = {key: counts[key] - previous[key] for key in counts} if previous else None
+            previous = counts
+        return trend
+
+    def compare_scans(self, project_identifier: str, tool: str = "all", revision: Optional[str] = None,
+                      base_revision: Optional[str] = None, limit: int = DEFAULT_DELTA_LIMIT) -> Dict[str, Any]:
+        """
+        Delta of a project's scan against a base scan, recording both scans first.
+
+        Args:
+            project_identifier: Project identifier
+            tool: Tool name, or "all" for every registered tool
+            revision: Scan revision to report on (default: latest)
+            base_revision: Revision to compare against; "" means the latest scan, and None
+                the scan recorded before the reported one
+            limit: Findings listed for each of "new" and "fixed"
+
+        Raises:
+            ValueError: If the tool is unknown, the limit is out of range or no base scan is recorded
+        """
+        # Validated before recording, so an invalid request leaves the store untouched
+        if not 0 <= limit <= MAX_DELTA_LIMIT:
+            raise ValueError(f"limit must be between 0 and {MAX_DELTA_LIMIT}")
+        head = self.record_tool_scans(tool, project_identifier, revision)
+        if base_revision is not None:
+            base = self.record_tool_scans(tool, project_identifier, base_revision or None)
+        else:
+            base = {name: self.previous_scan_id(scan_id) for name, scan_id in head.items()}
+            missing = [name for name, scan_id in base.items() if scan_id is None]
+            if missing:
+                raise ValueError(f"No earlier {', '.join(missing)} scan of '{project_identifier}' is recorded; "
+                                 f"pass base_revision to compare against a specific revision")
+        return {
+            "project_identifier": project_identifier,
+            "tool": tool,
+            "revision": revision,
+            "base_revisions": {name: self.scan_info(scan_id)["revision"] for name, scan_id in base.items()},
+            **self.delta(head.values(), base.values(), limit),
+        }
+
+    def project_trend(self, project_identifier: str, tool: str = "all",
+                      limit: int = DEFAULT_TREND_LIMIT) -> Dict[str, Any]:
+        """
+        Trend of a project's recorded scans for one tool, or all tools combined.
+
+        Raises:
+            ValueError: If the tool is unknown
+        """
+        tools = [adapter.name for adapter in scanners()] if tool == "all" else [get_scanner(tool).name]
+        return {"project_identifier": project_identifier, "tool": tool,
+                "scans": self.trend(project_identifier, tools, limit)}
+
+
+_store: Optional[ScanStore] = None
+_store_lock = threading.Lock()
+
+
+def get_scan_store() -> ScanStore:
+    """Return the process-wide store at SCAN_STORE_PATH, opening it on first use."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = ScanStore()
+    return _store
@@ -0,0 +1,110 @@
+"""
+Scan Result Streaming
+Splits scan results into NDJSON records (scan metadata followed by one record per
+issue, vulnerability or component) and reassembles them on the client side, and
+collects the per-project records of batch streams
+"""
+
+from typing import Dict, Any, Iterable, Iterator, Optional
+
+from utils.scanners import get_scanner, scanners
+
+
+def iter_scan_records(tool: str, results: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """
+    Yield the records for a single tool's scan results.
+
+    The first record ("scan") carries every field except the streamed lists, which
+    are sent as empty lists; each list item then follows as its own record.
+    """
+    list_fields = get_scanner(tool).streamed_lists
+    metadata = {key: ([] if key in list_fields else value) for key, value in results.items()}
+    yield {"record": "scan", "tool": tool, "data": metadata}
+    for field in list_fields:
+        for item in results.get(field, []):
+            yield {"record": "item", "tool": tool, "field": field, "data": item}
+
+
+def iter_all_scan_records(results: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """Yield the records for consolidated results from all tools."""
+    adapters = scanners()
+    result_keys = {adapter.result_key for adapter in adapters}
+    consolidated = {key: value for key, value in results.items() if key not in result_keys}
+    yield {"record": "consolidated", "data": consolidated}
+    for adapter in adapters:
+        if adapter.result_key in results:
+            yield from iter_scan_records(adapter.name, results[adapter.result_key])
+
+
+def assemble_scan_records(records: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Rebuild a result dictionary from streamed records.
+
+    Returns the single tool's results, or the consolidated results when the stream
+    started with a "consolidated" record. A trailing "end" record is required, so a
+    truncated stream raises ValueError rather than returning partial results.
+    """
+    consolidated = None
+    scans: Dict[str, Dict[str, Any]] = {}
+    complete = False
+
+    for record in records:
+        kind = record.get("record")
+        if kind == "consolidated":
+            consolidated = dict(record["data"])
+        elif kind == "scan":
+            scans[record["tool"]] = dict(record["data"])
+        elif kind == "item":
+            scans[record["tool"]][record["field"]].append(record["data"])
+        elif kind == "end":
+            complete = True
+        elif kind == "error":
+            raise ValueError(record.get("data", {}).get("error", "Stream reported an error"))
+
+    if not complete:
+        raise ValueError("Scan result stream ended before its end record")
+
+    if consolidated is not None:
+        for adapter in scanners():
+            if adapter.name in scans:
+                consolidated[adapter.result_key] = scans[adapter.name]
+        return consolidated
+    if len(scans) != 1:
+        raise ValueError("Scan result stream did not contain exactly one scan")
+    return next(iter(scans.values()))
+
+
+def batch_key(project_identifier: str, revision: Optional[str] = None) -> str:
+    """Key of a project's entry in assembled batch results"""
+    return f"{project_identifier}@{revision}" if revision else project_identifier
+
+
+def assemble_batch_records(records: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Collect the records of a batch stream: one "project" or "project_error" record per
+    project, in completion order, followed by an "end" record.
+
+    Returns:
+        dict: "projects" and "errors" keyed by batch_key, in completion order
+
+    Raises:
+        ValueError: If the stream reports an error or ends before its end record
+    """
+    projects: Dict[str, Any] = {}
+    errors: Dict[str, str] = {}
+    complete = False
+
+    for record in records:
+        kind = record.get("record")
+        if kind == "project":
+            projects[batch_key(record["project_identifier"], record.get("revision"))] = record["data"]
+        elif kind == "project_error":
+            errors[batch_key(record["project_identifier"], record.get("revision"))] = record["error"]
+        elif kind == "end":
+            complete = True
+        elif kind == "error":
+            raise ValueError(record.get("data", {}).get("error", "Stream reported an error"))
+
+    if not complete:
+        raise ValueError("Batch stream ended before its end record")
+    return {"projects": projects, "errors": errors}
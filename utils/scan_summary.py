@@ -0,0 +1,204 @@
+"""
+Scan Result Summaries
+Aggregate-only views of scan results: per-severity, per-type and per-component
+counts, the top-N worst findings and quality gate / risk status, each computed
+in a single pass over the finding lists
+"""
+
+import heapq
+from collections import Counter, deque
+from typing import Dict, Any, List
+
+from utils.cache import TTLCache, derived
+from utils.scan_results import SCAN_CACHE_TTL_SECONDS
+from utils.scanners import SEVERITY_LEVELS, scanners
+
+DEFAULT_TOP_N = 5
+MAX_TOP_N = 50
+
+_SEVERITY_RANK = {severity: rank for rank, severity in enumerate(SEVERITY_LEVELS)}
+
+# Summaries are computed once per memoized result object and top_n
+_summary_cache = TTLCache(maxsize=512, ttl=SCAN_CACHE_TTL_SECONDS)
+
+
+def _severity_counts(counter: Counter) -> Dict[str, int]:
+    counts = {severity.lower(): counter.get(severity, 0) for severity in SEVERITY_LEVELS}
+    counts["total"] = sum(counter.values())
+    return counts
+
+
+def _bounded_top(entries, top_n: int) -> List[Dict[str, Any]]:
+    """
+    Select the top_n entries with the smallest (rank, -score, position) keys. The entries
+    iterable is always consumed completely, since it also feeds the aggregate counters.
+    """
+    if top_n <= 0:
+        deque(entries, maxlen=0)
+        return []
+    return [entry[-1] for entry in heapq.nsmallest(top_n, entries, key=lambda entry: entry[:3])]
+
+
+def summarize_sonar(results: Dict[str, Any], top_n: int = DEFAULT_TOP_N) -> Dict[str, Any]:
+    severities, types, components = Counter(), Counter(), Counter()
+
+    def entries():
+        for position, issue in enumerate(results["issues"]):
+            severities[issue["severity"]] += 1
+            types[issue["type"]] += 1
+            components[issue["component"]] += 1
+            yield (_SEVERITY_RANK.get(issue["severity"], len(SEVERITY_LEVELS)), 0, position, {
+                "key": issue["key"],
+                "severity": issue["severity"],
+                "type": issue["type"],
+                "component": issue["component"],
+                "line": issue["line"],
+                "message": issue["message"],
+            })
+
+    worst = _bounded_top(entries(), top_n)
+    return {
+        "tool": "sonar",
+        "scan_id": results["scan_id"],
+        "project_key": results["project_key"],
+        "scan_date": results["scan_date"],
+        "status": results["status"],
+        "severity_counts": _severity_counts(severities),
+        "type_counts": dict(types.most_common()),
+        "component_counts": dict(components.most_common()),
+        "worst_findings": worst,
+        "quality_gate": {
+            "status": results["quality_gate"]["status"],
+            "failed_conditions": [c["metric"] for c in results["quality_gate"]["conditions"]
+                                  if c["status"] == "FAILED"],
+        },
+        "metrics": results["metrics"],
+    }
+
+
+def summarize_fortify(results: Dict[str, Any], top_n: int = DEFAULT_TOP_N) -> Dict[str, Any]:
+    severities, categories, files, cwes = Counter(), Counter(), Counter(), Counter()
+
+    def entries():
+        for position, vulnerability in enumerate(results["vulnerabilities"]):
+            severities[vulnerability["severity"]] += 1
+            categories[vulnerability["category"]] += 1
+            files[vulnerability["file_path"]] += 1
+            cwes[f"CWE-{vulnerability['cwe_id']}"] += 1
+            risk = vulnerability["impact"] * vulnerability["likelihood"]
+            yield (_SEVERITY_RANK.get(vulnerability["severity"], len(SEVERITY_LEVELS)), -risk, position, {
+                "instance_id": vulnerability["instance_id"],
+                "severity": vulnerability["severity"],
+                "category": vulnerability["category"],
+                "file_path": vulnerability["file_path"],
+                "line_number": vulnerability["line_number"],
+                "cwe_id": vulnerability["cwe_id"],
+                "confidence": vulnerability["confidence"],
+            })
+
+    worst = _bounded_top(entries(), top_n)
+    return {
+        "tool": "fortify",
+        "scan_id": results["scan_id"],
+        "application_name": results["application_name"],
+        "scan_date": results["scan_date"],
+        "status": results["status"],
+        "severity_counts": _severity_counts(severities),
+        "type_counts": dict(categories.most_common()),
+        "component_counts": dict(files.most_common()),
+        "cwe_counts": dict(cwes.most_common()),
+        "worst_findings": worst,
+        "risk_metrics": results["risk_metrics"],
+    }
+
+
+def summarize_nexus(results: Dict[str, Any], top_n: int = DEFAULT_TOP_N) -> Dict[str, Any]:
+    severities, types, components, licenses = Counter(), Counter(), Counter(), Counter()
+    vulnerable_components = 0
+
+    def entries():
+        nonlocal vulnerable_components
+        for position, component in enumerate(results["components"]):
+            types[component["type"]] += 1
+            licenses[component["license"]] += 1
+            worst_rank = len(SEVERITY_LEVELS)
+            for vulnerability in component["vulnerabilities"]:
+                severities[vulnerability["severity"]] += 1
+                worst_rank = min(worst_rank, _SEVERITY_RANK.get(vulnerability["severity"], len(SEVERITY_LEVELS)))
+            if component["vulnerability_count"]:
+                vulnerable_components += 1
+                components[component["package_name"]] += component["vulnerability_count"]
+            yield (worst_rank, -component["highest_cvss"], position, {
+                "component_id": component["component_id"],
+                "package_name": component["package_name"],
+                "version": component["version"],
+                "highest_cvss": component["highest_cvss"],
+                "vulnerability_count": component["vulnerability_count"],
+                "worst_severity": SEVERITY_LEVELS[worst_rank] if worst_rank < len(SEVERITY_LEVELS) else None,
+            })
+
+    worst = [item for item in _bounded_top(entries(), top_n) if item["vulnerability_count"]]
+    return {
+        "tool": "nexus",
+        "scan_id": results["scan_id"],
+        "repository_name": results["repository_name"],
+        "scan_date": results["scan_date"],
+        "status": results["status"],
+        "severity_counts": _severity_counts(severities),
+        "type_counts": dict(types.most_common()),
+        "component_counts": dict(components.most_common()),
+        "license_counts": dict(licenses.most_common()),
+        "components_total": len(results["components"]),
+        "components_with_vulnerabilities": vulnerable_components,
+        "policy_violations": len(results["policy_violations"]),
+        "worst_findings": worst,
+        "risk_metrics": results["risk_metrics"],
+    }
+
+
+SUMMARIZERS = {
+    "sonar": summarize_sonar,
+    "fortify": summarize_fortify,
+    "nexus": summarize_nexus,
+}
+
+
+def summarize_all(results: Dict[str, Any], top_n: int = DEFAULT_TOP_N) -> Dict[str, Any]:
+    """Summarize consolidated results: overall counts and risk plus each tool's summary."""
+    tools = {adapter.name: summarize_scan(adapter.name, results[adapter.result_key], top_n)
+             for adapter in scanners() if adapter.name in SUMMARIZERS and adapter.result_key in results}
+    overall = {name: sum(summary["severity_counts"][name] for summary in tools.values())
+               for name in [severity.lower() for severity in SEVERITY_LEVELS] + ["total"]}
+    return {
+        "project_identifier": results["project_identifier"],
+        "consolidated_scan_date": results["consolidated_scan_date"],
+        "summary": results["summary"],
+        "severity_counts": overall,
+        "scan_status": {tool: summary["status"] for tool, summary in tools.items()},
+        "quality_gate": tools["sonar"]["quality_gate"] if "sonar" in tools else None,
+        "policy_evaluation": tools["nexus"]["risk_metrics"]["policy_evaluation"] if "nexus" in tools else None,
+        "tools": tools,
+        "recommendations": results["recommendations"],
+    }
+
+
+def summarize_scan(tool: str, results: Dict[str, Any], top_n: int = DEFAULT_TOP_N) -> Dict[str, Any]:
+    """
+    Summarize one tool's results, or consolidated results when tool is "all".
+
+    Args:
+        tool: sonar, fortify, nexus or all
+        results: Results to summarize
+        top_n: Number of worst findings to include per tool
+
+    Returns:
+        dict: Aggregates only; no finding bodies beyond the top-N worst items
+    """
+    top_n = int(top_n)
+    if not 0 <= top_n <= MAX_TOP_N:
+        raise ValueError(f"top_n must be between 0 and {MAX_TOP_N}")
+    if tool == "all":
+        return derived(_summary_cache, results, ("all", top_n), lambda: summarize_all(results, top_n))
+    if tool not in SUMMARIZERS:
+        raise ValueError(f"Unknown tool '{tool}'. Available tools: all, {', '.join(SUMMARIZERS)}")
+    return derived(_summary_cache, results, (tool, top_n), lambda: SUMMARIZERS[tool](results, top_n))
@@ -0,0 +1,140 @@
+"""
+Scanner Adapter Registry
+Each scanner (Sonar, Fortify, Nexus, ...) is described by an adapter with fetch,
+normalize and aggregate hooks. Consolidation runs generically over the registered
+adapters, so adding a scanner means registering an adapter rather than editing
+the collection or consolidation code.
+"""
+
+import hashlib
+import os
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional
+
+SEVERITY_LEVELS = ("Critical", "High", "Medium", "Low", "Info")
+
+# Upper bound on concurrent scanner fetches across the whole process
+SCAN_EXECUTOR_MAX_WORKERS = min(16, (os.cpu_count() or 1) + 4)
+
+
+class Finding(NamedTuple):
+    """A scanner finding normalized to the fields shared by every tool"""
+    tool: str
+    finding_id: str
+    severity: str
+    category: str
+    component: str
+    line: Optional[int] = None
+    title: Optional[str] = None
+    cvss: Optional[float] = None
+
+
+def count_severities(findings: Iterable[Finding]) -> Dict[str, int]:
+    """Count normalized findings per severity level (lowercase keys) plus a "total"."""
+    counts = dict.fromkeys((severity.lower() for severity in SEVERITY_LEVELS), 0)
+    total = 0
+    for finding in findings:
+        key = finding.severity.lower()
+        counts[key] = counts.get(key, 0) + 1
+        total += 1
+    counts["total"] = total
+    return counts
+
+
+def default_fingerprint(finding: Finding) -> str:
+    """
+    Stable identity of a finding across scans: the tool, category, component, line and
+    title, but not the tool's own finding id, which is issued anew for every scan.
+    """
+    parts = (finding.tool, finding.category, finding.component, str(finding.line or ""), finding.title or "")
+    return hashlib.sha1("\0".join(parts).encode("utf-8")).hexdigest()
+
+
+class ScannerAdapter:
+    """
+    Describes how to collect and interpret one scanner's results.
+
+    Args:
+        name: Tool name, e.g. "sonar"
+        fetch: Callable (identifier, revision) returning the scanner's results
+        normalize: Callable (results) yielding the results' Finding objects
+        aggregate: Callable (results) returning severity counts in the format of
+            count_severities. Defaults to counting the normalized findings; scanners
+            whose results already carry counts should read them instead.
+        result_key: Key of the scanner's results in consolidated results (default "<name>_results")
+        fingerprint: Callable (finding) returning a key that identifies the same finding
+            in different scans (default default_fingerprint)
+        streamed_lists: List fields of the results sent item by item in NDJSON streams
+    """
+
+    def __init__(self, name: str, fetch: Callable[[str, Optional[str]], Dict[str, Any]],
+                 normalize: Callable[[Dict[str, Any]], Iterable[Finding]],
+                 aggregate: Optional[Callable[[Dict[str, Any]], Dict[str, int]]] = None,
+                 result_key: Optional[str] = None,
+                 fingerprint: Optional[Callable[[Finding], str]] = None,
+                 streamed_lists: Iterable[str] = ()):
+        self.name = name
+        self.fetch = fetch
+        self.normalize = normalize
+        self.aggregate = aggregate or (lambda results: count_severities(normalize(results)))
+        self.result_key = result_key or f"{name}_results"
+        self.fingerprint = fingerprint or default_fingerprint
+        self.streamed_lists = tuple(streamed_lists)
+
+
+_registry: Dict[str, ScannerAdapter] = {}
+
+
+def register_scanner(adapter: ScannerAdapter) -> ScannerAdapter:
+    """Register (or replace) a scanner adapter; returns the adapter."""
+    _registry[adapter.name] = adapter
+    return adapter
+
+
+def unregister_scanner(name: str):
+    _registry.pop(name, None)
+
+
+def get_scanner(name: str) -> ScannerAdapter:
+    """
+    Look up a registered scanner.
+
+    Raises:
+        ValueError: If no scanner with that name is registered
+    """
+    try:
+        return _registry[name]
+    except KeyError:
+        raise ValueError(f"Unknown scanner '{name}'. Available scanners: {', '.join(_registry)}")
+
+
+def scanners() -> List[ScannerAdapter]:
+    """Registered adapters, in registration order."""
+    return list(_registry.values())
+
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_scan_executor() -> Executor:
+    """
+    Return the process-wide executor that runs scanner fetches, creating it on first use.
+
+    Work submitted here must not itself wait on other work submitted here, or a saturated
+    pool can deadlock.
+    """
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=SCAN_EXECUTOR_MAX_WORKERS,
+                                               thread_name_prefix="scanner")
+    return _executor
+
+
+def normalized_findings(tool_results: Dict[str, Dict[str, Any]]) -> Iterable[Finding]:
+    """Yield the normalized findings of every tool's results, keyed by tool name."""
+    for name, results in tool_results.items():
+        yield from get_scanner(name).normalize(results)
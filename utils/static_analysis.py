@@ -0,0 +1,420 @@
+"""
+Local Static Analysis
+Scans a repository checkout (e.g. one cloned by GitUtils) for hardcoded secrets,
+dangerous calls and overly complex functions, and reports the findings in the
+schema of get_sonar_scan_results_impl
+
+Every file is scanned in a single pass: one compiled alternation of the rules'
+trigger literals finds all candidate positions, and each candidate is verified by
+its rule's pattern anchored at that position. Files are spread across a process
+pool, and the matches of each file are cached by git blob SHA, so rescanning an
+updated repository only reads and scans the files that changed.
+"""
+
+import hashlib
+import logging
+import math
+import os
+import re
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from git import InvalidGitRepositoryError, NoSuchPathError, Repo
+
+from utils.cache import TTLCache
+from utils.git_utils import GitUtils
+from utils.scan_models import SonarIssue, severity_counts
+from utils.scanners import SEVERITY_LEVELS
+
+logger = logging.getLogger(__name__)
+
+# Bump when rules change, so cached matches of unchanged blobs are not reused
+RULESET_VERSION = 1
+
+# Files larger than this are not analyzed (generated or vendored code, data files)
+MAX_FILE_BYTES = 1024 * 1024
+
+# Functions whose cyclomatic complexity exceeds this are reported
+MAX_FUNCTION_COMPLEXITY = 15
+
+# Below this many files to scan, a process pool costs more than it saves
+PARALLEL_MIN_FILES = 64
+ANALYSIS_MAX_WORKERS = os.cpu_count() or 1
+
+# Per-blob matches, keyed by ruleset version and git blob SHA
+BLOB_CACHE_MAXSIZE = 200_000
+blob_cache = TTLCache(maxsize=BLOB_CACHE_MAXSIZE, ttl=None)
+
+
+class Rule(NamedTuple):
+    """
+    A pattern rule: matches become issues of this type, severity and message.
+
+    Every match starts with one of the rule's trigger literals; the pattern is then
+    verified anchored at the trigger's position. Triggers must not follow a word
+    character or "." unless word_start is False.
+    """
+    key: str
+    type: str
+    severity: str
+    message: str
+    effort_minutes: int
+    triggers: Tuple[str, ...]
+    pattern: str
+    word_start: bool = True
+
+
+def _cases(*words: str) -> Tuple[str, ...]:
+    # lower, Capitalized and UPPER spellings of trigger words
+    return tuple(variant for word in words for variant in (word, word[0].upper() + word[1:], word.upper()))
+
+
+RULES = [
+    # Hardcoded secrets
+    Rule("secrets:aws-access-key", "Vulnerability", "Critical",
+         "AWS access key ID is hardcoded", 30, ("AKIA", "ASIA"), r"(?:AKIA|ASIA)[0-9A-Z]{16}\b"),
+    Rule("secrets:private-key", "Vulnerability", "Critical",
+         "Private key is committed to the repository", 30, ("-----BEGIN",),
+         r"-----BEGIN (?:RSA |EC |DSA |OPENSSH |PGP )?PRIVATE KEY(?: BLOCK)?-----", word_start=False),
+    Rule("secrets:github-token", "Vulnerability", "Critical",
+         "GitHub token is hardcoded", 30, ("ghp_", "gho_", "ghu_", "ghs_", "ghr_"), r"gh[pousr]_[A-Za-z0-9]{36,}\b"),
+    Rule("secrets:slack-token", "Vulnerability", "Critical",
+         "Slack token is hardcoded", 30, ("xoxa-", "xoxb-", "xoxp-", "xoxr-", "xoxs-"), r"xox[abprs]-[A-Za-z0-9-]{10,}"),
+    Rule("secrets:password", "Vulnerability", "High",
+         "Hardcoded credentials detected", 30,
+         _cases("password", "passwd", "pwd", "secret", "api_key", "apikey", "apiKey", "access_token", "accessToken",
+                "auth_token", "authToken"),
+         r"(?i:password|passwd|pwd|secret|api_?key|access_?token|auth_?token)\b[\"']?\s*[:=]\s*"
+         r"[\"'][^\"'\s]{4,}[\"']", word_start=False),
+    # Dangerous calls
+    Rule("injection:eval", "Vulnerability", "High",
+         "Dynamic code execution with eval() or exec()", 20, ("eval", "exec"), r"(?:eval|exec)\s*\("),
+    Rule("injection:os-command", "Vulnerability", "High",
+         "OS command built at runtime may allow command injection", 20,
+         ("os.system", "os.popen", "Runtime.getRuntime", "child_process.exec"),
+         r"os\.(?:system|popen)\s*\(|Runtime\.getRuntime\(\)\.exec\s*\(|child_process\.exec(?:Sync)?\s*\("),
+    Rule("injection:shell-true", "Security Hotspot", "High",
+         "Subprocess call runs through the shell", 15, ("shell",), r"shell\s*=\s*True\b"),
+    Rule("deserialization:unsafe", "Vulnerability", "High",
+         "Deserialization of untrusted data", 20,
+         ("pickle.load", "cPickle.load", "marshal.load", "shelve.open", "yaml.load"),
+         r"(?:pickle|cPickle|marshal)\.loads?\s*\(|shelve\.open\s*\(|yaml\.load\s*\((?![^)]*Loader)"),
+    Rule("xss:inner-html", "Vulnerability", "Medium",
+         "Potential XSS vulnerability", 15, (".innerHTML", ".outerHTML", "document.write"),
+         r"\.(?:innerHTML|outerHTML)\s*=(?!=)|document\.write\s*\(", word_start=False),
+    Rule("crypto:weak-hash", "Security Hotspot", "Medium",
+         "Weak hash algorithm (MD5/SHA-1) used", 10, ("hashlib.md5", "hashlib.sha1", "MessageDigest", "createHash"),
+         r"hashlib\.(?:md5|sha1)\s*\(|MessageDigest\.getInstance\(\s*\"(?:MD5|SHA-?1)\"|"
+         r"createHash\(\s*['\"](?:md5|sha1)['\"]"),
+    Rule("tls:verify-disabled", "Vulnerability", "High",
+         "TLS certificate verification is disabled", 10, ("verify", "rejectUnauthorized", "InsecureSkipVerify"),
+         r"verify\s*=\s*False\b|rejectUnauthorized\s*:\s*false\b|InsecureSkipVerify\s*:\s*true\b"),
+]
+
+# Complexity is measured in the same pass, from function starts and decision points
+COMPLEXITY_RULE = Rule("complexity:function", "Code Smell", "Medium",
+                       "Method complexity is too high", 0, (), "")
+_FUNCTION = -1
+_BRANCH = -2
+_JAVA_MODIFIERS = ("public", "private", "protected", "static", "final", "synchronized", "abstract")
+_MARKERS = [
+    # (target, triggers, pattern); function patterns capture the function name
+    (_FUNCTION, ("def",), r"def[ \t]+(?P<name>\w+)"),
+    (_FUNCTION, ("function",), r"function[ \t]*\*?[ \t]*(?P<name>\w+)[ \t]*\("),
+    (_FUNCTION, ("func",), r"func[ \t]+(?:\([^)\n]*\)[ \t]*)?(?P<name>\w+)"),
+    (_FUNCTION, _JAVA_MODIFIERS,
+     rf"(?:(?:{'|'.join(_JAVA_MODIFIERS)})[ \t]+)+[\w<>\[\], ]+?[ \t]+(?P<name>\w+)[ \t]*\([^;{{]*\)[^;{{]*\{{"),
+    (_BRANCH, ("if", "elif", "for", "foreach", "while", "case", "catch", "except"),
+     r"(?:if|elif|for|foreach|while|case|catch|except)\b"),
+    (_BRANCH, ("&&", "||", "??"), r"&&|\|\||\?\?"),
+]
+
+
+def _trie_pattern(words) -> str:
+    """
+    An alternation of literal words factored into a trie, e.g. "if|in" as "i(?:f|n)",
+    which the regular expression engine matches far faster than a flat alternation.
+    Longer words win over their prefixes, as optional continuations are greedy.
+    """
+    trie: Dict[str, Any] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = True
+
+    def build(node: Dict[str, Any]) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie)
+
+
+def _build_matcher():
+    # Every trigger literal maps to the verifiers of the rules and markers it starts
+    targets: Dict[str, List[Tuple[int, Any, bool]]] = {}
+    for index, rule in enumerate(RULES):
+        verifier = re.compile(rule.pattern)
+        for trigger in rule.triggers:
+            targets.setdefault(trigger, []).append((index, verifier, rule.word_start))
+    for target, triggers, pattern in _MARKERS:
+        verifier = re.compile(pattern)
+        for trigger in triggers:
+            targets.setdefault(trigger, []).append((target, verifier, True))
+    return re.compile(_trie_pattern(targets)), targets
+
+
+# One literal trie finds every candidate position in a single pass over the text
+_TRIGGERS, _TARGETS = _build_matcher()
+
+
+class FileScan(NamedTuple):
+    """Result of scanning one file: its line count and (rule index, line, detail) matches"""
+    lines: int
+    matches: List[Tuple[int, int, str]]
+
+
+def scan_text(text: str) -> FileScan:
+    """
+    Scan one file's text in a single pass of the trigger matcher, verifying each
+    candidate anchored at its position.
+
+    Returns:
+        FileScan: Line count and matches; complexity matches use the index len(RULES)
+        and carry "name:complexity" as detail
+    """
+    matches = []
+    seen = set()
+    line = 1
+    position = 0
+    skip_until = 0
+    function: Optional[Tuple[str, int]] = None
+    complexity = 0
+    complexity_rule = len(RULES)
+
+    def close_function():
+        if function is not None and complexity > MAX_FUNCTION_COMPLEXITY:
+            matches.append((complexity_rule, function[1], f"{function[0]}:{complexity}"))
+
+    for trigger in _TRIGGERS.finditer(text):
+        start = trigger.start()
+        if start < skip_until:
+            continue
+        word_preceded = start > 0 and (text[start - 1].isalnum() or text[start - 1] in "_.")
+        for target, verifier, word_start in _TARGETS[trigger.group()]:
+            if word_start and word_preceded:
+                continue
+            match = verifier.match(text, start)
+            if match is None:
+                continue
+            line += text.count("\n", position, start)
+            position = start
+            skip_until = match.end()
+            if target == _BRANCH:
+                complexity += 1
+            elif target == _FUNCTION:
+                close_function()
+                function, complexity = (match.group("name"), line), 1
+            elif (target, line) not in seen:
+                seen.add((target, line))
+                matches.append((target, line, ""))
+            break
+    close_function()
+    return FileScan(text.count("\n") + (1 if text and not text.endswith("\n") else 0), matches)
+
+
+def scan_file(path: str) -> FileScan:
+    """Read and scan one file; binary and oversized files yield no matches. Runs in pool workers."""
+    try:
+        if os.path.getsize(path) > MAX_FILE_BYTES:
+            return FileScan(0, [])
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return FileScan(0, [])
+    if b"\0" in data[:8192]:
+        return FileScan(0, [])
+    return scan_text(data.decode("utf-8", errors="replace"))
+
+
+def git_blob_sha(path: str) -> str:
+    """The git blob SHA-1 of a file's current contents."""
+    with open(path, "rb") as f:
+        data = f.read()
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+
+def _blob_shas(repo_path: str, files: List[str]) -> Tuple[Dict[str, str], Optional[str]]:
+    """
+    Blob SHAs of the given files, read from the git index for tracked, unmodified files
+    and computed from the contents otherwise.
+
+    Returns:
+        tuple: SHAs keyed by relative path, and the HEAD commit (None outside git)
+    """
+    indexed: Dict[str, str] = {}
+    revision = None
+    try:
+        repo = Repo(repo_path)
+        revision = repo.head.commit.hexsha if repo.head.is_valid() else None
+        for entry in repo.git.ls_files("-s", "-z").split("\0"):
+            if entry:
+                meta, path = entry.split("\t", 1)
+                indexed[path] = meta.split()[1]
+        for path in repo.git.diff("--name-only", "-z").split("\0"):
+            indexed.pop(path, None)
+    except (InvalidGitRepositoryError, NoSuchPathError):
+        pass
+
+    shas = {}
+    for path in files:
+        # git paths use forward slashes on every platform
+        sha = indexed.get(path.replace(os.sep, "/"))
+        shas[path] = sha if sha is not None else git_blob_sha(os.path.join(repo_path, path))
+    return shas, revision
+
+
+def _issue(rule: Rule, path: str, line: int, detail: str, created_date: str) -> SonarIssue:
+    message, effort = rule.message, rule.effort_minutes
+    if rule is COMPLEXITY_RULE:
+        name, complexity = detail.rsplit(":", 1)
+        message = (f"{rule.message}: refactor '{name}' to reduce its complexity from {complexity} "
+                   f"to the {MAX_FUNCTION_COMPLEXITY} allowed")
+        effort = 5 + 2 * (int(complexity) - MAX_FUNCTION_COMPLEXITY)
+    key = hashlib.sha1(f"{rule.key}\0{path}\0{line}\0{detail}".encode("utf-8")).hexdigest()
+    return SonarIssue(
+        key=f"sonar-{key[:8]}",
+        type=rule.type,
+        severity=rule.severity,
+        component=path,
+        line=line,
+        message=message,
+        effort=f"{effort}min",
+        debt=f"{math.ceil(effort / 60)}h",
+        created_date=created_date,
+    )
+
+
+def _rating(value: float, thresholds: Tuple[float, ...]) -> str:
+    # A for values up to the first threshold, then B, C, D, and E beyond the last
+    for rating, threshold in zip("ABCD", thresholds):
+        if value <= threshold:
+            return rating
+    return "E"
+
+
+def analyze_repository(repo_path: str, project_key: Optional[str] = None,
+                       max_workers: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Statically analyze a repository checkout.
+
+    Args:
+        repo_path: Path to the repository (e.g. returned by GitUtils.clone_repository)
+        project_key: Project key reported in the results (default: the directory name)
+        max_workers: Process pool size (default ANALYSIS_MAX_WORKERS)
+
+    Returns:
+        dict: Results in the schema of get_sonar_scan_results_impl, plus "analysis"
+        with the revision, file and cache counts and elapsed time
+    """
+    started = time.perf_counter()
+    if not os.path.isdir(repo_path):
+        raise ValueError(f"Repository path '{repo_path}' does not exist")
+    project_key = project_key or os.path.basename(os.path.abspath(repo_path))
+
+    files = sorted(GitUtils().get_file_list_helper(repo_path))
+    shas, revision = _blob_shas(repo_path, files)
+
+    scans: Dict[str, FileScan] = {}
+    pending: Dict[str, List[str]] = {}
+    for path in files:
+        cached = blob_cache.get((RULESET_VERSION, shas[path]))
+        if cached is not None:
+            scans[path] = cached
+        else:
+            # Identical blobs at several paths are scanned once
+            pending.setdefault(shas[path], []).append(path)
+
+    todo = [(sha, os.path.join(repo_path, paths[0])) for sha, paths in pending.items()]
+    workers = min(max_workers or ANALYSIS_MAX_WORKERS, len(todo))
+    if workers > 1 and len(todo) >= PARALLEL_MIN_FILES:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(scan_file, [path for _, path in todo],
+                                   chunksize=max(1, len(todo) // (workers * 4)))
+            scanned = list(zip(todo, results))
+    else:
+        scanned = [((sha, path), scan_file(path)) for sha, path in todo]
+    for (sha, _), file_scan in scanned:
+        blob_cache.set((RULESET_VERSION, sha), file_scan)
+        for path in pending[sha]:
+            scans[path] = file_scan
+
+    scan_date = datetime.now().isoformat()
+    rules = RULES + [COMPLEXITY_RULE]
+    issues = []
+    for path in files:
+        component = path.replace(os.sep, "/")
+        for rule_index, line, detail in scans[path].matches:
+            issues.append(_issue(rules[rule_index], component, line, detail, scan_date))
+
+    severities = Counter(issue.severity for issue in issues)
+    vulnerabilities = [issue for issue in issues if issue.type == "Vulnerability"]
+    debt_minutes = sum(int(issue.effort[:-len("min")]) for issue in issues)
+    lines_of_code = sum(file_scan.lines for file_scan in scans.values())
+    # Security rating as in SonarQube: E for a Critical vulnerability down to A for none
+    worst_vulnerability = min((SEVERITY_LEVELS.index(issue.severity) for issue in vulnerabilities), default=None)
+    security_rating = "EDCBA"[worst_vulnerability] if worst_vulnerability is not None else "A"
+    new_vulnerabilities_status = "FAILED" if vulnerabilities else "PASSED"
+    cache_hits = len(files) - sum(len(paths) for paths in pending.values())
+    # Outside git, identify the scan by its contents
+    scan_revision = revision or hashlib.sha1("".join(sorted(shas.values())).encode("ascii")).hexdigest()
+
+    logger.info(f"Analyzed {project_key}: {len(files)} files, {len(todo)} scanned, {cache_hits} from cache, "
+                f"{len(issues)} issues")
+    return {
+        "scan_id": f"sonar-local-{scan_revision[:12]}",
+        "project_key": project_key,
+        "project_name": f"Project {project_key.title()}",
+        "scan_date": scan_date,
+        "status": "Completed",
+        "metrics": {
+            "lines_of_code": lines_of_code,
+            # Not measured by static analysis
+            "coverage": None,
+            "duplicated_lines_density": None,
+            "maintainability_rating": _rating(debt_minutes / max(1, lines_of_code * 30), (0.05, 0.1, 0.2, 0.5)),
+            "reliability_rating": "A",
+            "security_rating": security_rating,
+            "technical_debt": f"{math.ceil(debt_minutes / 60)}h"
+        },
+        "issues": issues,
+        "issue_counts": severity_counts(severities),
+        "quality_gate": {
+            "status": new_vulnerabilities_status,
+            "conditions": [
+                {
+                    "metric": "new_vulnerabilities",
+                    "operator": "GT",
+                    "threshold": "0",
+                    "actual_value": str(len(vulnerabilities)),
+                    "status": new_vulnerabilities_status
+                }
+            ]
+        },
+        "dashboard_url": None,
+        "analysis": {
+            "engine": "local",
+            "ruleset_version": RULESET_VERSION,
+            "revision": revision,
+            "files": len(files),
+            "files_scanned": len(todo),
+            "cache_hits": cache_hits,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+        },
+    }